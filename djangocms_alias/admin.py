@@ -3,11 +3,13 @@ from __future__ import annotations
 from collections.abc import Iterable
 
 from cms.admin.utils import GrouperModelAdmin
+from cms.utils.i18n import get_default_language
 from cms.utils.permissions import get_model_permission_codename
 from cms.utils.urlutils import admin_reverse
 from django import forms
 from django.contrib import admin, messages
 from django.contrib.admin.utils import unquote
+from django.contrib.sites.shortcuts import get_current_site
 from django.db import models
 from django.http import (
     Http404,
@@ -26,8 +28,10 @@ from .constants import (
     LIST_ALIAS_URL_NAME,
     USAGE_ALIAS_URL_NAME,
 )
+from .copying import copy_alias_translations, detach_alias
 from .filters import CategoryFilter, SiteFilter, UsedFilter
 from .models import Alias, AliasContent, Category
+from .search import filter_aliases
 from .utils import (
     emit_content_change,
     emit_content_delete,
@@ -73,6 +77,7 @@ class AliasAdmin(GrouperModelAdmin):
     search_fields = ["content__name", "static_code"]
     autocomplete_fields = ["category", "site"]
     extra_grouping_fields = ("language",)
+    actions = ["copy_default_language", "detach_aliases"]
     EMPTY_CONTENT_VALUE = mark_safe(_("<i>Missing language</i>"))
 
     def get_actions_list(self) -> list:
@@ -81,8 +86,7 @@ class AliasAdmin(GrouperModelAdmin):
 
     def get_queryset(self, request: HttpRequest) -> models.QuerySet:
         qs = super().get_queryset(request)
-        # Annotate each Alias with a boolean indicating if related cmsplugins exist
-        return qs.annotate(cmsplugins_count=models.Count("cms_plugins"))
+        return qs.with_display_names()
 
     def get_list_display(self, request: HttpRequest) -> Iterable[str]:
         list_display = super().get_list_display(request)
@@ -93,6 +97,13 @@ class AliasAdmin(GrouperModelAdmin):
             list_display.insert(-1, "get_modified_date")
         return list_display
 
+    def get_search_results(self, request: HttpRequest, queryset: models.QuerySet, search_term: str) -> tuple:
+        """Looks up names and static codes in the search token index instead
+        of scanning the alias contents."""
+        if not search_term:
+            return queryset, False
+        return filter_aliases(queryset, search_term, self.get_language()), False
+
     @admin.display(description=_("Name"), ordering=models.functions.Lower("contents__name"))
     def content_name(self, obj: Alias) -> str:
         return (
@@ -102,16 +113,68 @@ class AliasAdmin(GrouperModelAdmin):
             or self.EMPTY_CONTENT_VALUE
         )
 
-    @admin.display(description=_("Used"), boolean=True, ordering="cmsplugins_count")
+    @admin.display(description=_("Used"), boolean=True, ordering="usage_count")
     def used(self, obj: Alias) -> bool | None:
-        if obj.static_code and obj.cmsplugins_count == 0:
+        if obj.static_code and not obj.is_in_use:
             return None
-        return obj.cmsplugins_count > 0
+        return obj.is_in_use
 
     @admin.display(description=_("Static"), boolean=True)
     def static(self, obj: Alias) -> bool:
         return bool(obj.static_code)
 
+    @admin.action(description=_("Copy the default language content"), permissions=["add"])
+    def copy_default_language(self, request: HttpRequest, queryset: models.QuerySet) -> None:
+        """Copies the default language content of the selected aliases to the
+        language currently shown if they have no content in it yet."""
+        language = get_default_language(site_id=get_current_site(request).pk)
+        target_language = self.get_language()
+        if language == target_language:
+            self.message_user(request, _("The default language is shown."), level=messages.WARNING)
+            return
+        progress = list(copy_alias_translations(queryset, language, target_language, user=request.user))
+        checked, created = progress[-1] if progress else (0, 0)
+        self.message_user(
+            request,
+            _("Copied {created} of {checked} aliases from {language} to {target_language}.").format(
+                created=created, checked=checked, language=language, target_language=target_language
+            ),
+            level=messages.SUCCESS,
+        )
+
+    @admin.action(description=_("Replace the alias plugins by their content"), permissions=["detach"])
+    def detach_aliases(self, request: HttpRequest, queryset: models.QuerySet) -> None:
+        """Detaches all alias plugins showing the selected aliases and deletes
+        the aliases which are not used anymore."""
+        detached, skipped, deleted = 0, 0, 0
+        for alias in queryset.order_by("pk"):
+            pk = alias.pk
+            progress = list(detach_alias(alias, user=request.user))
+            if progress:
+                detached += progress[-1][2]
+                skipped += progress[-1][3]
+            deleted += not Alias.objects.filter(pk=pk).exists()
+        self.message_user(
+            request,
+            _("Replaced {detached} alias plugins, deleted {deleted} aliases.").format(
+                detached=detached, deleted=deleted
+            ),
+            level=messages.SUCCESS,
+        )
+        if skipped:
+            self.message_user(
+                request,
+                _(
+                    "Skipped {skipped} placeholders of published, archived or locked versions. "
+                    "Their alias plugins were kept."
+                ).format(skipped=skipped),
+                level=messages.WARNING,
+            )
+
+    def has_detach_permission(self, request: HttpRequest) -> bool:
+        # Changes pages and aliases everywhere, like deleting aliases in use
+        return request.user.is_superuser
+
     def has_delete_permission(self, request: HttpRequest, obj: Alias = None) -> bool:
         # Alias can be deleted by users who can add aliases,
         # if that alias is not referenced anywhere.
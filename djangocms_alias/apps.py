@@ -6,3 +6,6 @@ class AliasConfig(AppConfig):
     name = "djangocms_alias"
     verbose_name = _("django CMS Alias")
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from . import handlers  # noqa: F401
@@ -0,0 +1,333 @@
+import hashlib
+import json
+import time
+from functools import cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from .models import Alias, AliasContent
+
+CACHE_KEY_PREFIX = "djangocms_alias"
+DIRECTORY_GENERATION_KEY = f"{CACHE_KEY_PREFIX}:directory:generation"
+DEPENDENCY_GENERATION_KEY = f"{CACHE_KEY_PREFIX}:dependencies:generation"
+SELECT2_GENERATION_KEY = f"{CACHE_KEY_PREFIX}:select2:generation"
+CATEGORY_CHOICES_GENERATION_KEY = f"{CACHE_KEY_PREFIX}:categories:generation"
+DECLARATIONS_GENERATION_KEY = f"{CACHE_KEY_PREFIX}:declarations:generation"
+
+
+def get_cache():
+    return caches[getattr(settings, "DJANGOCMS_ALIAS_CACHE", "default")]
+
+
+def get_cache_timeout() -> int | None:
+    return getattr(settings, "DJANGOCMS_ALIAS_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def is_directory_cache_enabled() -> bool:
+    return getattr(settings, "DJANGOCMS_ALIAS_DIRECTORY_CACHE_ENABLED", True)
+
+
+def _get_generation(key: str) -> int:
+    """Cache keys contain a generation counter which is shared by all app
+    servers: bumping it invalidates all keys of the previous generation."""
+    cache = get_cache()
+    generation = cache.get(key)
+    if generation is None:
+        # Start from the current time so that a lost counter never
+        # revives keys of an earlier generation
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key, 0)
+    return generation
+
+
+def _bump_generation(key: str) -> None:
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def _serialize(obj) -> tuple | None:
+    if obj is None:
+        return None
+    return tuple(getattr(obj, field.attname) for field in obj._meta.concrete_fields)
+
+
+def _deserialize(model, values):
+    if values is None:
+        return None
+    field_names = [field.attname for field in model._meta.concrete_fields]
+    return model.from_db(DEFAULT_DB_ALIAS, field_names, values)
+
+
+@cache
+def _get_schema_fingerprint(*models) -> str:
+    """Returns a fingerprint of the concrete fields of the models. Serialized
+    field values are positional: keys containing the fingerprint are not read
+    once a field is added, removed or reordered (e.g. by an upgrade)."""
+    fields = [[field.attname for field in model._meta.concrete_fields] for model in models]
+    return hashlib.sha256(json.dumps(fields).encode()).hexdigest()[:12]
+
+
+def _get_directory_key(generation, language, show_draft_content, static_code, site_id) -> str:
+    from cms.models import Placeholder
+
+    mode = "draft" if show_draft_content else "live"
+    schema = _get_schema_fingerprint(Alias, AliasContent, Placeholder)
+    return f"{CACHE_KEY_PREFIX}:directory:{generation}:{schema}:{language}:{mode}:{site_id or '-'}:{static_code}"
+
+
+def get_directory_generation() -> int | None:
+    """Returns the current generation of the static alias directory or None if
+    the directory is disabled. Read it before querying the database, so that
+    entries computed from outdated data are never stored for a newer generation."""
+    if not is_directory_cache_enabled():
+        return None
+    return _get_generation(DIRECTORY_GENERATION_KEY)
+
+
+def get_static_aliases(generation, keys, language, show_draft_content) -> dict:
+    """
+    Looks up ``(static_code, site_id)`` keys in the static alias directory.
+    Returns a dict mapping each cached key to its alias (or None if the alias
+    does not exist). The content cache of the returned aliases is filled for
+    ``language`` and the content's placeholder is attached.
+    """
+    if not keys or generation is None:
+        return {}
+    from cms.models import Placeholder
+
+    cache_keys = {
+        _get_directory_key(generation, language, show_draft_content, static_code, site_id): (static_code, site_id)
+        for static_code, site_id in keys
+    }
+    aliases = {}
+    for cache_key, (alias_values, content_values, placeholder_values) in get_cache().get_many(cache_keys).items():
+        alias = _deserialize(Alias, alias_values)
+        if alias is not None:
+            content = _deserialize(AliasContent, content_values)
+            alias._content_cache[language] = content
+            if content is not None:
+                content.alias = alias
+                placeholder = _deserialize(Placeholder, placeholder_values)
+                if placeholder is not None:
+                    placeholder.source = content
+                    content.__dict__["placeholder"] = placeholder
+        aliases[cache_keys[cache_key]] = alias
+    return aliases
+
+
+def set_static_aliases(generation, aliases, language, show_draft_content) -> None:
+    """Stores a dict mapping ``(static_code, site_id)`` keys to aliases (or None)
+    as returned by :func:`get_static_aliases` in the static alias directory."""
+    if not aliases or generation is None:
+        return
+    entries = {}
+    for (static_code, site_id), alias in aliases.items():
+        content = alias._content_cache.get(language) if alias else None
+        placeholder = content.__dict__.get("placeholder") if content else None
+        entries[_get_directory_key(generation, language, show_draft_content, static_code, site_id)] = (
+            _serialize(alias),
+            _serialize(content),
+            _serialize(placeholder),
+        )
+    get_cache().set_many(entries, timeout=get_cache_timeout())
+
+
+def invalidate_static_alias_directory() -> None:
+    _bump_generation(DIRECTORY_GENERATION_KEY)
+
+
+def is_fragment_cache_enabled() -> bool:
+    return getattr(settings, "DJANGOCMS_ALIAS_FRAGMENT_CACHE_ENABLED", True)
+
+
+def _get_fragment_version_key(alias_id) -> str:
+    return f"{CACHE_KEY_PREFIX}:fragment:version:{alias_id}"
+
+
+def get_fragment_keys(alias_ids, language, site_id, template) -> dict:
+    """
+    Returns a dict mapping the alias ids to the cache keys of their rendered
+    published content. Each key contains the alias' content version token,
+    which is bumped by :func:`invalidate_alias_fragments`.
+    """
+    version_keys = {_get_fragment_version_key(alias_id): alias_id for alias_id in alias_ids}
+    versions = get_cache().get_many(version_keys)
+    keys = {}
+    for version_key, alias_id in version_keys.items():
+        version = versions.get(version_key) or _get_generation(version_key)
+        keys[alias_id] = f"{CACHE_KEY_PREFIX}:fragment:{alias_id}:{version}:{language}:{site_id}:{template}"
+    return keys
+
+
+def invalidate_alias_fragments(alias_ids) -> None:
+    for alias_id in set(alias_ids):
+        _bump_generation(_get_fragment_version_key(alias_id))
+
+
+def get_fragment_last_modified(alias_id, language, template, etag) -> int:
+    """
+    Returns the time (a timestamp in seconds) since which the published
+    content of an alias has the ETag. It is the time the ETag was first
+    seen, so it only moves forward, also when a plugin is deleted or a
+    version is unpublished or reverted. A new ETag is always at least a
+    second later than the previous one. A lost cache entry restarts from
+    the current time.
+    """
+    cache = get_cache()
+    key = f"{CACHE_KEY_PREFIX}:fragment:modified:{alias_id}:{language}:{template}"
+    entry = cache.get(key)
+    if entry is not None and entry[0] == etag:
+        return entry[1]
+    last_modified = int(time.time())
+    if entry is not None:
+        last_modified = max(last_modified, entry[1] + 1)
+    cache.set(key, (etag, last_modified), timeout=get_cache_timeout())
+    return last_modified
+
+
+def _get_dependency_graph_key(generation) -> str:
+    return f"{CACHE_KEY_PREFIX}:dependencies:{generation}"
+
+
+def get_dependency_graph_generation() -> int:
+    """Returns the current generation of the alias dependency graph."""
+    return _get_generation(DEPENDENCY_GENERATION_KEY)
+
+
+def get_dependency_graph_cache(generation):
+    """Returns the alias dependency graph cached for the generation (or None)."""
+    return get_cache().get(_get_dependency_graph_key(generation))
+
+
+def set_dependency_graph_cache(generation, graph) -> None:
+    get_cache().set(_get_dependency_graph_key(generation), graph, timeout=get_cache_timeout())
+
+
+def invalidate_dependency_graph() -> None:
+    _bump_generation(DEPENDENCY_GENERATION_KEY)
+
+
+def _get_category_choices_key(generation, language) -> str:
+    return f"{CACHE_KEY_PREFIX}:categories:{generation}:{language}"
+
+
+def get_category_choices_cache(language) -> tuple:
+    """Returns the current generation of the category filter choices and the
+    choices cached for it in ``language`` (or None)."""
+    generation = _get_generation(CATEGORY_CHOICES_GENERATION_KEY)
+    return generation, get_cache().get(_get_category_choices_key(generation, language))
+
+
+def set_category_choices_cache(generation, language, choices) -> None:
+    get_cache().set(_get_category_choices_key(generation, language), choices, timeout=get_cache_timeout())
+
+
+def invalidate_category_choices() -> None:
+    _bump_generation(CATEGORY_CHOICES_GENERATION_KEY)
+
+
+def _get_declarations_key(generation, template) -> str:
+    digest = hashlib.sha256(template.encode()).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:declarations:{generation}:{digest}"
+
+
+def get_declarations_cache(template) -> tuple:
+    """Returns the current generation of the static alias declaration
+    registry and the registry entry of ``template`` (or None)."""
+    generation = _get_generation(DECLARATIONS_GENERATION_KEY)
+    return generation, get_cache().get(_get_declarations_key(generation, template))
+
+
+def set_declarations_cache(generation, template, entry) -> None:
+    get_cache().set(_get_declarations_key(generation, template), entry, timeout=get_cache_timeout())
+
+
+def invalidate_declarations() -> None:
+    _bump_generation(DECLARATIONS_GENERATION_KEY)
+
+
+def is_plugin_snapshot_enabled() -> bool:
+    return getattr(settings, "DJANGOCMS_ALIAS_PLUGIN_SNAPSHOTS_ENABLED", True)
+
+
+def _get_plugin_snapshot_version_key(placeholder_id) -> str:
+    return f"{CACHE_KEY_PREFIX}:plugins:version:{placeholder_id}"
+
+
+def get_plugin_snapshot_keys(placeholder_ids, language) -> dict:
+    """
+    Returns a dict mapping the placeholder ids to the cache keys of the plugin
+    snapshots of their published content. Each key contains the placeholder's
+    plugin version token, which is bumped by :func:`invalidate_plugin_snapshots`.
+    Read the keys before querying the database.
+    """
+    version_keys = {
+        _get_plugin_snapshot_version_key(placeholder_id): placeholder_id for placeholder_id in placeholder_ids
+    }
+    versions = get_cache().get_many(version_keys)
+    keys = {}
+    for version_key, placeholder_id in version_keys.items():
+        version = versions.get(version_key) or _get_generation(version_key)
+        keys[placeholder_id] = f"{CACHE_KEY_PREFIX}:plugins:{placeholder_id}:{version}:{language}"
+    return keys
+
+
+def serialize_plugins(plugins) -> tuple:
+    """Returns a compact snapshot of downcast plugins (ordered by position)
+    holding the plugin type and the field values of each plugin."""
+    return tuple((plugin.plugin_type, plugin.pk, _serialize(plugin)) for plugin in plugins)
+
+
+def deserialize_plugins(snapshot) -> list | None:
+    """
+    Builds the downcast plugin instances from a snapshot created by
+    :func:`serialize_plugins` without querying the database. Plugins which are
+    not installed anymore are skipped together with their descendants. Returns
+    None if the snapshot is missing or does not match the plugin models.
+    """
+    if snapshot is None:
+        return None
+    from cms.plugin_pool import plugin_pool
+
+    plugins = []
+    skipped = set()
+    for plugin_type, pk, values in snapshot:
+        try:
+            model = plugin_pool.get_plugin(plugin_type).model
+        except KeyError:
+            skipped.add(pk)
+            continue
+        if len(values) != len(model._meta.concrete_fields):
+            # The plugin model changed since the snapshot was taken
+            return None
+        plugin = _deserialize(model, values)
+        if plugin.parent_id in skipped:
+            skipped.add(pk)
+            continue
+        plugins.append(plugin)
+    return plugins
+
+
+def invalidate_plugin_snapshots(placeholder_ids) -> None:
+    for placeholder_id in set(placeholder_ids):
+        _bump_generation(_get_plugin_snapshot_version_key(placeholder_id))
+
+
+def get_select2_cache_timeout() -> int:
+    return getattr(settings, "DJANGOCMS_ALIAS_SELECT2_CACHE_TIMEOUT", 60)
+
+
+def get_select2_cache_key(*parts) -> str:
+    """Returns the cache key of a select2 response identified by ``parts``.
+    The key contains the select2 generation bumped by :func:`invalidate_select2_results`."""
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:select2:{_get_generation(SELECT2_GENERATION_KEY)}:{digest}"
+
+
+def invalidate_select2_results() -> None:
+    _bump_generation(SELECT2_GENERATION_KEY)
@@ -16,6 +16,13 @@ except (ImportError, LookupError):
     AliasContentConfig = None
 
 
+def get_grouper_selector_option_label(alias, language):
+    # The versioning grouper selector prefetches the latest contents of the aliases
+    for content in getattr(alias, "_prefetched_objects_cache", {}).get("contents", ()):
+        alias._content_cache.setdefault(content.language, content)
+    return alias.get_name(language)
+
+
 class AliasCMSConfig(CMSAppConfig):
     cms_enabled = True
     cms_toolbar_enabled_models = [(AliasContent, render_alias_content, "alias")]
@@ -50,7 +57,7 @@ class AliasCMSConfig(CMSAppConfig):
                     extra_grouping_fields=["language"],
                     version_list_filter_lookups={"language": get_language_tuple},
                     copy_function=copy_alias_content,
-                    grouper_selector_option_label=lambda obj, lang: obj.get_name(lang),
+                    grouper_selector_option_label=get_grouper_selector_option_label,
                     grouper_admin_mixin="__default__",
                 ),
             ]
@@ -1,6 +1,11 @@
 from cms.plugin_base import CMSPluginBase, PluginMenuItem
 from cms.plugin_pool import plugin_pool
-from cms.toolbar.utils import get_object_edit_url, get_plugin_toolbar_info, get_plugin_tree
+from cms.toolbar.utils import (
+    get_object_edit_url,
+    get_plugin_toolbar_info,
+    get_plugin_tree,
+    get_toolbar_from_request,
+)
 from cms.utils import get_language_from_request
 from cms.utils.permissions import (
     get_model_permission_codename,
@@ -13,6 +18,7 @@ from django.http import HttpResponseBadRequest
 from django.shortcuts import get_object_or_404
 from django.template.response import TemplateResponse
 from django.urls import path
+from django.utils.translation import get_language
 from django.utils.translation import (
     gettext_lazy as _,
 )
@@ -25,6 +31,7 @@ from .constants import CREATE_ALIAS_URL_NAME, DETACH_ALIAS_PLUGIN_URL_NAME
 from .forms import AliasPluginForm, BaseCreateAliasForm, CreateAliasForm
 from .models import Alias as AliasModel
 from .models import AliasContent, AliasPlugin
+from .resolver import prefetch_alias_contents, prefetch_alias_plugins
 
 __all__ = [
     "Alias",
@@ -56,6 +63,50 @@ class Alias(CMSPluginBase):
 
     autocomplete_fields = ["alias"]
 
+    def render(self, context, instance, placeholder):
+        request = context.get("request")
+        if request is not None:
+            self.prefetch_aliases(request, instance._state.fields_cache.get("placeholder"))
+        return super().render(context, instance, placeholder)
+
+    @classmethod
+    def prefetch_aliases(cls, request, placeholder):
+        """
+        Loads the aliases of all alias plugins in a placeholder together with
+        their content, the content's placeholder and its plugins in a constant
+        number of queries. Runs once per placeholder, language and draft mode
+        when its first alias plugin is rendered.
+        """
+        if placeholder is None:
+            return
+        toolbar = get_toolbar_from_request(request)
+        show_draft_content = toolbar.edit_mode_active or toolbar.preview_mode_active
+        language = get_language()
+        prefetched = placeholder.__dict__.setdefault("_alias_plugins_prefetched", set())
+        if (language, show_draft_content) in prefetched:
+            return
+        prefetched.add((language, show_draft_content))
+
+        plugins = [
+            plugin for plugin in getattr(placeholder, "_all_plugins_cache", []) if isinstance(plugin, AliasPlugin)
+        ]
+        if not plugins:
+            return
+
+        # Share one alias instance between all plugins pointing to it
+        aliases = AliasModel.objects.all()
+        if show_draft_content:
+            # The structure board lists the plugins by alias name
+            aliases = aliases.with_display_names(language)
+        aliases = aliases.in_bulk({plugin.alias_id for plugin in plugins})
+        fragment_templates = {}
+        for plugin in plugins:
+            if plugin.alias_id in aliases:
+                plugin.alias = aliases[plugin.alias_id]
+                fragment_templates.setdefault(plugin.alias_id, []).append(f"plugin-{plugin.template}")
+        prefetch_alias_contents(aliases.values(), language, show_draft_content)
+        prefetch_alias_plugins(request, aliases.values(), language, show_draft_content, fragment_templates)
+
     def get_render_template(self, context, instance, placeholder):
         if isinstance(instance.placeholder.source, AliasContent) and instance.is_recursive():
             return "djangocms_alias/alias_recursive.html"
@@ -200,6 +251,9 @@ class Alias(CMSPluginBase):
     def get_form(self, request, obj=None, **kwargs):
         form = super().get_form(request, obj, **kwargs)
         form.base_fields["site"].initial = get_current_site(request)
+        # The form class is created for each request: Pass the target
+        # placeholder on to reject alias cycles
+        form.target_placeholder = obj.placeholder if obj else self._cms_initial_attributes.get("placeholder")
         return form
 
     def get_plugin_urls(self):
@@ -229,6 +283,11 @@ class Alias(CMSPluginBase):
                 views.CategorySelect2View.as_view(),
                 name=constants.CATEGORY_SELECT2_URL_NAME,
             ),
+            path(
+                "render-metrics/",
+                views.render_metrics_view,
+                name=constants.RENDER_METRICS_URL_NAME,
+            ),
         ]
 
     def create_alias_view(self, request):
@@ -387,6 +446,6 @@ class Alias(CMSPluginBase):
             "title": title,
             "original": title,
             "show_back_btn": request.GET.get("back"),
-            **get_alias_usage_context(alias),
+            **get_alias_usage_context(alias, transitive=True),
         }
         return TemplateResponse(request, "djangocms_alias/alias_usage.html", context)
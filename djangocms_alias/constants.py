@@ -11,6 +11,9 @@ LIST_ALIAS_URL_NAME = f"{PLUGIN_URL_NAME_PREFIX}_alias_changelist"
 CHANGE_ALIAS_URL_NAME = f"{PLUGIN_URL_NAME_PREFIX}_alias_change"
 DELETE_ALIAS_URL_NAME = f"{PLUGIN_URL_NAME_PREFIX}_alias_delete"
 CATEGORY_SELECT2_URL_NAME = f"{PLUGIN_URL_NAME_PREFIX}_category_list_select2"
+ALIAS_FRAGMENT_URL_NAME = f"{PLUGIN_URL_NAME_PREFIX}_fragment"
+STATIC_ALIAS_FRAGMENT_URL_NAME = f"{PLUGIN_URL_NAME_PREFIX}_static_fragment"
+RENDER_METRICS_URL_NAME = f"{PLUGIN_URL_NAME_PREFIX}_render_metrics"
 # Static Alias
 DEFAULT_STATIC_ALIAS_CATEGORY_NAME = "Static Alias"
 
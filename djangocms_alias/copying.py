@@ -0,0 +1,433 @@
+import copy
+from collections import defaultdict, namedtuple
+from itertools import groupby
+
+from cms.models import CMSPlugin, Placeholder
+from cms.utils.plugins import copy_plugins_to_placeholder, get_bound_plugins
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, router, transaction
+from django.db.models import Case, F, Max, When, prefetch_related_objects
+from django.db.models.base import ModelState
+
+from .cache import invalidate_select2_results, invalidate_static_alias_directory
+from .dependencies import update_dependencies
+from .handlers import invalidate_aliases, invalidate_placeholders
+from .models import Alias, AliasContent, AliasPlugin, copy_alias_content
+from .search import update_alias_tokens
+from .utils import is_versioning_enabled
+
+__all__ = [
+    "copy_alias_contents",
+    "copy_alias_translations",
+    "detach_alias",
+]
+
+
+def _insert_plugin_rows(plugins, using) -> None:
+    """
+    Inserts the plugin model rows of the copied plugins - one statement per
+    table. Their ``cmsplugin`` rows already exist.
+
+    ``bulk_create()`` does not support multi-table inheritance, which all
+    plugin models use. The rows are therefore inserted like the ORM inserts
+    them, field values prepared by ``pre_save()`` (e.g. ``auto_now`` fields)
+    and ``get_db_prep_save()``.
+    """
+    by_model = defaultdict(list)
+    for plugin in plugins:
+        by_model[type(plugin)._meta.concrete_model].append(plugin)
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        for model, model_plugins in by_model.items():
+            # Multi-table inheritance: fill the tables of parent plugin models first
+            for table_model in [*reversed(model._meta.get_parent_list()), model]:
+                if table_model is CMSPlugin:
+                    continue
+                fields = [field for field in table_model._meta.local_concrete_fields if not field.generated]
+                sql = "INSERT INTO {} ({}) VALUES ({})".format(
+                    connection.ops.quote_name(table_model._meta.db_table),
+                    ", ".join(connection.ops.quote_name(field.column) for field in fields),
+                    ", ".join(["%s"] * len(fields)),
+                )
+                cursor.executemany(
+                    sql,
+                    [
+                        [field.get_db_prep_save(field.pre_save(plugin, add=True), connection) for field in fields]
+                        for plugin in model_plugins
+                    ],
+                )
+    for plugin in plugins:
+        plugin._state.adding = False
+
+
+PluginTree = namedtuple("PluginTree", ["plugins", "placeholder_id", "language", "parent_id", "offset"])
+
+
+def _copy_plugin_trees(trees, using) -> list:
+    """
+    Copies the plugins of each ``PluginTree`` - the bound plugins of one
+    placeholder ordered by position - to its placeholder, language (``None``
+    keeps the language of each plugin) and parent plugin, moving their
+    positions by its offset. The ``cmsplugin`` rows are bulk-created one tree
+    level at a time (parents need their ids before their children), the
+    plugin model rows one table at a time. Returns the pairs of new and
+    original plugins.
+    """
+    children = defaultdict(list)
+    for index, tree in enumerate(trees):
+        plugin_ids = {plugin.pk for plugin in tree.plugins}
+        for plugin in tree.plugins:
+            # Children of missing plugins become root plugins, see copy_plugins_to_placeholder
+            children[index, plugin.parent_id if plugin.parent_id in plugin_ids else None].append(plugin)
+
+    new_plugins = {}
+    level = [(index, plugin) for index in range(len(trees)) for plugin in children[index, None]]
+    while level:
+        bases = []
+        for index, plugin in level:
+            tree = trees[index]
+            parent = new_plugins.get((index, plugin.parent_id))
+            bases.append(
+                CMSPlugin(
+                    placeholder_id=tree.placeholder_id,
+                    parent_id=parent.pk if parent else tree.parent_id,
+                    position=plugin.position + tree.offset,
+                    language=tree.language or plugin.language,
+                    plugin_type=plugin.plugin_type,
+                    creation_date=plugin.creation_date,
+                )
+            )
+        CMSPlugin.objects.using(using).bulk_create(bases)
+        for (index, plugin), base in zip(level, bases, strict=True):
+            if type(plugin) is CMSPlugin:
+                new_plugins[index, plugin.pk] = base
+                continue
+            new_plugin = copy.copy(plugin)
+            new_plugin._state = ModelState()
+            new_plugin._state.db = using
+            for field in CMSPlugin._meta.concrete_fields:
+                setattr(new_plugin, field.attname, getattr(base, field.attname))
+            for table_model in [type(plugin)._meta.concrete_model, *type(plugin)._meta.get_parent_list()]:
+                for parent_link in table_model._meta.parents.values():
+                    if parent_link:
+                        setattr(new_plugin, parent_link.attname, base.pk)
+            new_plugins[index, plugin.pk] = new_plugin
+        level = [(index, child) for index, plugin in level for child in children[index, plugin.pk]]
+
+    tree_pairs = [
+        [(new_plugins[index, plugin.pk], plugin) for plugin in tree.plugins if type(plugin) is not CMSPlugin]
+        for index, tree in enumerate(trees)
+    ]
+    plugin_pairs = [pair for pairs in tree_pairs for pair in pairs]
+    _insert_plugin_rows([new_plugin for new_plugin, _plugin in plugin_pairs], using)
+
+    # Relations and nested plugin references (e.g. of text plugins) are
+    # copied by the plugin models - skip plugins without own implementation
+    for new_plugin, plugin in plugin_pairs:
+        if type(new_plugin).copy_relations is not CMSPlugin.copy_relations:
+            new_plugin.copy_relations(plugin)
+    for pairs in tree_pairs:
+        for new_plugin, plugin in pairs:
+            if type(new_plugin).post_copy is not CMSPlugin.post_copy:
+                new_plugin.post_copy(plugin, pairs)
+
+    # No signals were sent for the new alias plugins
+    alias_ids = {new_plugin.alias_id for new_plugin, _plugin in plugin_pairs if isinstance(new_plugin, AliasPlugin)}
+    if alias_ids:
+        Alias.objects.using(using).filter(pk__in=alias_ids).update_usage_counts()
+        update_dependencies({new_plugin.placeholder_id for new_plugin, _plugin in plugin_pairs})
+    return plugin_pairs
+
+
+def _copy_plugins(placeholder_map, using, language=None, target_language=None) -> list:
+    """
+    Copies the plugins of the placeholders in ``placeholder_map`` (mapping
+    original to new placeholder ids) - only those in ``language`` if given,
+    moved to ``target_language`` if given - with their positions and tree
+    structure. Returns the pairs of new and original plugins.
+    """
+    plugins = CMSPlugin.objects.using(using).filter(placeholder__in=placeholder_map)
+    if language:
+        plugins = plugins.filter(language=language)
+    by_placeholder = defaultdict(list)
+    for plugin in get_bound_plugins(list(plugins.order_by("position"))):
+        by_placeholder[plugin.placeholder_id].append(plugin)
+    return _copy_plugin_trees(
+        [
+            PluginTree(plugins, placeholder_map[placeholder_id], target_language, None, 0)
+            for placeholder_id, plugins in by_placeholder.items()
+        ],
+        using,
+    )
+
+
+def _invalidate_copied_contents(alias_ids) -> None:
+    # No signals were sent for the new contents
+    invalidate_static_alias_directory()
+    invalidate_select2_results()
+    invalidate_aliases(alias_ids)
+
+
+def copy_alias_contents(original_contents) -> list:
+    """
+    Copies alias contents with their placeholders and plugins, keeping the
+    plugin tree structure and positions. Contents, placeholders and
+    ``cmsplugin`` rows are bulk-created, plugin model rows are inserted with
+    one statement per table, so that the number of queries depends on the
+    depth of the plugin trees and the number of plugin models - not on the
+    number of contents or plugins. Returns the new contents in the order of
+    ``original_contents``.
+
+    Like ``bulk_create``, no model signals are sent and ``save()`` of the
+    plugin models is not called. The usage counts and dependency edges of
+    copied alias plugins and the caches are updated.
+    """
+    original_contents = list(original_contents)
+    if not original_contents:
+        return []
+    using = router.db_for_write(AliasContent)
+    if not connections[using].features.can_return_rows_from_bulk_insert:
+        return [copy_alias_content(content) for content in original_contents]
+
+    with transaction.atomic(using=using):
+        prefetch_related_objects(original_contents, "alias", "placeholders")
+        new_contents = [
+            AliasContent(
+                **{
+                    field.attname: getattr(content, field.attname)
+                    for field in AliasContent._meta.concrete_fields
+                    if not field.primary_key
+                }
+            )
+            for content in original_contents
+        ]
+        AliasContent.admin_manager.using(using).bulk_create(new_contents)
+
+        content_type = ContentType.objects.get_for_model(AliasContent)
+        placeholder_pairs = []
+        for content, new_content in zip(original_contents, new_contents, strict=True):
+            slot = content.get_placeholder_slot()
+            placeholders = list(content.placeholders.all())
+            if slot not in {placeholder.slot for placeholder in placeholders}:
+                # Every content gets the placeholder of its slot, see AliasContent.save
+                placeholders.append(Placeholder(slot=slot))
+            for placeholder in placeholders:
+                new_placeholder = Placeholder(
+                    slot=placeholder.slot,
+                    default_width=placeholder.default_width,
+                    content_type=content_type,
+                    object_id=new_content.pk,
+                )
+                placeholder_pairs.append((placeholder, new_placeholder))
+                if placeholder.slot == slot:
+                    new_content.__dict__["placeholder"] = new_placeholder
+        Placeholder.objects.using(using).bulk_create(
+            new_placeholder for _placeholder, new_placeholder in placeholder_pairs
+        )
+
+        _copy_plugins(
+            {
+                placeholder.pk: new_placeholder.pk
+                for placeholder, new_placeholder in placeholder_pairs
+                if placeholder.pk
+            },
+            using,
+        )
+
+    _invalidate_copied_contents({content.alias_id for content in new_contents})
+    return new_contents
+
+
+def _copy_translations(alias_ids, language, target_language, user, using) -> list:
+    translated = AliasContent.admin_manager.filter(alias__in=alias_ids, language=target_language).values("alias")
+    contents = list(
+        AliasContent.admin_manager.latest_content()
+        .filter(alias__in=alias_ids, language=language)
+        .exclude(alias__in=translated)
+        .with_placeholder()
+    )
+    if not contents:
+        return []
+
+    bulk = connections[using].features.can_return_rows_from_bulk_insert
+    if is_versioning_enabled() or not bulk:
+        # Each content needs its own draft version, so it cannot be bulk-created
+        new_contents = [
+            AliasContent.objects.with_user(user).create(
+                alias=content.alias, name=content.name, language=target_language
+            )
+            for content in contents
+        ]
+    else:
+        new_contents = AliasContent.admin_manager.using(using).bulk_create(
+            AliasContent(alias=content.alias, name=content.name, language=target_language) for content in contents
+        )
+        placeholders = AliasContent.admin_manager.filter(
+            pk__in=[content.pk for content in new_contents]
+        ).create_missing_placeholders()
+        placeholders = {placeholder.object_id: placeholder for placeholder in placeholders}
+        for new_content in new_contents:
+            new_content.__dict__["placeholder"] = placeholders[new_content.pk]
+
+    if bulk:
+        _copy_plugins(
+            {
+                content.placeholder.pk: new_content.placeholder.pk
+                for content, new_content in zip(contents, new_contents, strict=True)
+                if content.placeholder
+            },
+            using,
+            language=language,
+            target_language=target_language,
+        )
+    else:
+        for content, new_content in zip(contents, new_contents, strict=True):
+            if not content.placeholder:
+                continue
+            copy_plugins_to_placeholder(
+                content.placeholder.get_plugins_list(language), new_content.placeholder, language=target_language
+            )
+    return new_contents
+
+
+def copy_alias_translations(aliases, language, target_language, user=None, batch_size=100):
+    """
+    Copies the latest content of each alias in ``language`` with its plugins
+    to a new content in ``target_language``. Aliases which already have a
+    content in ``target_language`` (or none in ``language``) are skipped, so
+    that running the copy again resumes an interrupted one. Each batch of
+    aliases is copied in its own transaction. With versioning, ``user``
+    creates the draft versions of the new contents.
+
+    This is a generator: it yields the number of aliases checked and of
+    contents created so far after each batch.
+    """
+    if is_versioning_enabled() and user is None:
+        raise ValueError("Versioning is enabled: a user is needed to create the draft versions")
+    using = router.db_for_write(AliasContent)
+    alias_ids = list(aliases.order_by("pk").values_list("pk", flat=True))
+    created = 0
+    for start in range(0, len(alias_ids), batch_size):
+        batch = alias_ids[start : start + batch_size]
+        with transaction.atomic(using=using):
+            new_contents = _copy_translations(batch, language, target_language, user, using)
+            # The search tokens of bulk-created contents are not updated by signals
+            update_alias_tokens({content.alias_id for content in new_contents})
+        if new_contents:
+            _invalidate_copied_contents({content.alias_id for content in new_contents})
+        created += len(new_contents)
+        yield start + len(batch), created
+
+
+def _detach_plugins(alias_plugins, source_plugins, using) -> None:
+    """Replaces the alias plugins (of one placeholder and language, ordered
+    by position) by copies of the source plugins."""
+    placeholder_id, language = alias_plugins[0].placeholder_id, alias_plugins[0].language
+    plugins = CMSPlugin.objects.using(using).filter(placeholder=placeholder_id, language=language)
+    positions = [plugin.position for plugin in alias_plugins]
+    # Keep gaps between the source plugins, the copies move by the same offset
+    size = source_plugins[-1].position - source_plugins[0].position + 1 if source_plugins else 0
+    AliasPlugin.objects.using(using).filter(pk__in=[plugin.pk for plugin in alias_plugins]).delete()
+
+    # Positions are unique: Move the following plugins out of the way first,
+    # then back to their new positions behind the copies
+    far = (plugins.aggregate(Max("position"))["position__max"] or 0) + len(positions) * size + 1
+    plugins.filter(position__gt=positions[0]).update(position=F("position") + far)
+    plugins.filter(position__gt=far).update(
+        position=Case(
+            *(
+                When(position__gt=position + far, then=F("position") - far + (index + 1) * (size - 1))
+                for index, position in reversed(list(enumerate(positions)))
+            )
+        )
+    )
+    if source_plugins:
+        _copy_plugin_trees(
+            [
+                PluginTree(
+                    source_plugins,
+                    placeholder_id,
+                    language,
+                    plugin.parent_id,
+                    plugin.position + index * (size - 1) - source_plugins[0].position,
+                )
+                for index, plugin in enumerate(alias_plugins)
+            ],
+            using,
+        )
+
+
+def _is_detachable(placeholder, user=None) -> bool:
+    """Returns whether the plugins of the placeholder may be replaced: with
+    djangocms-versioning, placeholders of versioned content only if the version
+    is a draft which is not locked (or is locked by ``user``)."""
+    if not apps.is_installed("djangocms_versioning"):
+        return True
+    from djangocms_versioning.constants import DRAFT
+    from djangocms_versioning.models import Version
+
+    try:
+        version = Version.objects.get_for_content(placeholder.source)
+    except KeyError:
+        # Not versioned
+        return True
+    except Version.DoesNotExist:
+        return False
+    return version.state == DRAFT and version.locked_by_id in (None, getattr(user, "pk", None))
+
+
+def detach_alias(alias, delete_alias=True, user=None):
+    """
+    Replaces all alias plugins showing ``alias`` by copies of the plugins of
+    its latest content in their language, as the "Detach" button of a single
+    alias plugin does. The plugins of each placeholder are replaced in one
+    transaction, so that running the detach again after an interruption
+    continues with the placeholders still using the alias. Finally the alias
+    is deleted if ``delete_alias`` is set and nothing uses it anymore.
+
+    With djangocms-versioning, only placeholders of draft versions are changed,
+    like in the structure board: placeholders of published, unpublished or
+    archived versions and of drafts locked by another user than ``user`` are
+    skipped and keep the alias (and with it the alias itself).
+
+    This is a generator: it yields the number of placeholders done, the total
+    number of placeholders, the number of alias plugins replaced and the
+    number of placeholders skipped so far after each placeholder.
+    """
+    using = router.db_for_write(AliasPlugin)
+    placeholders = list(
+        Placeholder.objects.using(using).filter(pk__in=AliasPlugin.objects.filter(alias=alias).values("placeholder"))
+    )
+    source_plugins = {}
+    detached, skipped = 0, 0
+    for count, placeholder in enumerate(placeholders, start=1):
+        with transaction.atomic(using=using):
+            if _is_detachable(placeholder, user):
+                plugins = list(
+                    AliasPlugin.objects.using(using)
+                    .select_for_update()
+                    .filter(alias=alias, placeholder=placeholder)
+                    .order_by("language", "position")
+                )
+            else:
+                plugins = []
+                skipped += 1
+            languages = []
+            for language, language_plugins in groupby(plugins, key=lambda plugin: plugin.language):
+                if language not in source_plugins:
+                    source_plugins[language] = list(
+                        get_bound_plugins(alias.get_plugins(language, show_draft_content=True))
+                    )
+                _detach_plugins(list(language_plugins), source_plugins[language], using)
+                languages.append(language)
+        if plugins:
+            # No signals were sent for the copied plugins
+            invalidate_placeholders([placeholder.pk])
+        for language in languages:
+            placeholder.clear_cache(language)
+        detached += len(plugins)
+        yield count, len(placeholders), detached, skipped
+
+    if delete_alias and not Alias.objects.using(using).filter(pk=alias.pk, usage_count__gt=0).exists():
+        alias.delete()
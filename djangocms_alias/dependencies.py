@@ -0,0 +1,210 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+
+from .cache import (
+    get_dependency_graph_cache,
+    get_dependency_graph_generation,
+    invalidate_dependency_graph,
+    set_dependency_graph_cache,
+)
+from .models import AliasContent, AliasDependency, AliasPlugin
+
+__all__ = [
+    "DependencyGraph",
+    "get_cyclic_alias_ids",
+    "get_dependency_graph",
+    "update_dependencies",
+]
+
+
+class DependencyGraph:
+    """
+    The graph of aliases including other aliases through alias plugins in
+    any of their contents, built from the :class:`AliasDependency` edges.
+
+    Strongly connected components are computed once when the graph is built,
+    so that checking whether including an alias in another closes a cycle
+    takes constant time.
+    """
+
+    def __init__(self, edges):
+        self.includes = defaultdict(set)
+        self.included_by = defaultdict(set)
+        for alias_id, included_alias_id in edges:
+            self.includes[alias_id].add(included_alias_id)
+            self.included_by[included_alias_id].add(alias_id)
+        self.components = self._get_components()
+
+    def _get_components(self) -> dict:
+        """Maps the ids of aliases lying on a cycle to the index of their
+        strongly connected component (iterative Tarjan algorithm)."""
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = {}
+        for root in list(self.includes):
+            if root in index:
+                continue
+            work = [(root, iter(self.includes[root]))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.includes.get(child, ()))))
+                        break
+                    if child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.includes.get(node, ()):
+                            for member in component:
+                                components[member] = node
+        return components
+
+    def _walk(self, alias_ids, edges) -> set:
+        found = set()
+        pending = list(alias_ids)
+        while pending:
+            for next_id in edges.get(pending.pop(), ()):
+                if next_id not in found:
+                    found.add(next_id)
+                    pending.append(next_id)
+        return found
+
+    def get_included_alias_ids(self, alias_id) -> set:
+        """Returns the ids of all aliases rendered as part of the alias -
+        directly or through other aliases."""
+        return self._walk([alias_id], self.includes)
+
+    def get_including_alias_ids(self, alias_ids) -> set:
+        """Returns the ids of the given aliases and of all aliases whose
+        contents include one of them - directly or through other aliases."""
+        return set(alias_ids) | self._walk(alias_ids, self.included_by)
+
+    def get_including_depths(self, alias_id) -> dict:
+        """Maps the alias and all aliases including it - directly or through
+        other aliases - to the length of the shortest include chain, i.e. 0
+        for the alias itself and 1 for aliases including it directly."""
+        depths = {alias_id: 0}
+        pending = [alias_id]
+        while pending:
+            next_pending = []
+            for current_id in pending:
+                for including_id in self.included_by.get(current_id, ()):
+                    if including_id not in depths:
+                        depths[including_id] = depths[current_id] + 1
+                        next_pending.append(including_id)
+            pending = next_pending
+        return depths
+
+    def is_cyclic(self, alias_id, included_alias_id) -> bool:
+        """Returns True if the included alias (transitively) includes the
+        including alias again."""
+        component = self.components.get(alias_id)
+        return component is not None and component == self.components.get(included_alias_id)
+
+    def would_create_cycle(self, alias_id, included_alias_id) -> bool:
+        """Returns True if including an alias in another one would create a cycle."""
+        return alias_id == included_alias_id or alias_id in self.get_included_alias_ids(included_alias_id)
+
+
+# This process' copy of the dependency graph by its generation
+_graphs = {}
+
+
+def get_dependency_graph() -> DependencyGraph:
+    """
+    Returns the alias dependency graph. Each process keeps a copy of the graph
+    and only reads the generation of the graph from the shared cache as long
+    as the copy is current. Otherwise the graph is loaded from the shared cache
+    or, on a miss, built from the dependency edges.
+    """
+    generation = get_dependency_graph_generation()
+    graph = _graphs.get(generation)
+    if graph is None:
+        graph = get_dependency_graph_cache(generation)
+        if graph is None:
+            graph = DependencyGraph(AliasDependency.objects.values_list("alias_id", "included_alias_id").distinct())
+            set_dependency_graph_cache(generation, graph)
+        _graphs.clear()
+        _graphs[generation] = graph
+    return graph
+
+
+def get_cyclic_alias_ids(placeholder, alias_ids) -> set:
+    """Returns the ids of the aliases which would (transitively) include the
+    alias owning the placeholder again if alias plugins showing them were
+    added to the placeholder."""
+    if placeholder.content_type_id != ContentType.objects.get_for_model(AliasContent).pk:
+        return set()
+    alias_id = AliasContent.admin_manager.filter(pk=placeholder.object_id).values_list("alias_id", flat=True).first()
+    if alias_id is None:
+        return set()
+    graph = get_dependency_graph()
+    return {
+        included_alias_id for included_alias_id in alias_ids if graph.would_create_cycle(alias_id, included_alias_id)
+    }
+
+
+def update_dependencies(placeholder_ids) -> bool:
+    """
+    Brings the dependency edges of all alias plugins in the placeholders up to
+    date. Plugins moved out of an alias content's placeholder lose their edge,
+    plugins in an alias content's placeholder get one. Returns True if any
+    edge changed.
+    """
+    placeholder_ids = set(placeholder_ids)
+    if not placeholder_ids:
+        return False
+    plugins = AliasPlugin.objects.filter(
+        placeholder__in=placeholder_ids,
+        placeholder__content_type=ContentType.objects.get_for_model(AliasContent),
+    ).values_list("pk", "alias_id", "placeholder__object_id")
+    plugins = list(plugins)
+    alias_by_content = dict(
+        AliasContent.admin_manager.filter(
+            pk__in={content_id for _pk, _alias_id, content_id in plugins},
+        ).values_list("pk", "alias_id")
+    )
+    expected = {
+        plugin_id: (alias_by_content[content_id], included_alias_id)
+        for plugin_id, included_alias_id, content_id in plugins
+        if content_id in alias_by_content
+    }
+    existing = {
+        plugin_id: (alias_id, included_alias_id)
+        for plugin_id, alias_id, included_alias_id in AliasDependency.objects.filter(
+            plugin__placeholder__in=placeholder_ids,
+        ).values_list("plugin_id", "alias_id", "included_alias_id")
+    }
+    outdated = [plugin_id for plugin_id, edge in existing.items() if expected.get(plugin_id) != edge]
+    missing = [plugin_id for plugin_id, edge in expected.items() if existing.get(plugin_id) != edge]
+    if not outdated and not missing:
+        return False
+
+    AliasDependency.objects.filter(plugin__in=outdated).delete()
+    AliasDependency.objects.bulk_create(
+        AliasDependency(plugin_id=plugin_id, alias_id=expected[plugin_id][0], included_alias_id=expected[plugin_id][1])
+        for plugin_id in missing
+    )
+    invalidate_dependency_graph()
+    return True
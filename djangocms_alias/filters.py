@@ -1,15 +1,17 @@
 from cms.forms.utils import get_sites
 from django.contrib import admin
+from django.db.models import Count, OuterRef
 from django.utils.encoding import smart_str
 from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
+from .cache import get_category_choices_cache, set_category_choices_cache
 from .constants import (
     CATEGORY_FILTER_PARAM,
     SITE_FILTER_NO_SITE_VALUE,
     SITE_FILTER_URL_PARAM,
 )
-from .models import Category
+from .models import Alias, get_category_name
 
 
 class SiteFilter(admin.SimpleListFilter):
@@ -51,13 +53,20 @@ class CategoryFilter(admin.SimpleListFilter):
     parameter_name = CATEGORY_FILTER_PARAM
 
     def lookups(self, request, model_admin):
-        # Only offer categories available
-        qs = model_admin.get_queryset(request)
-        cat_id = qs.values_list("category", flat=True)
-        # Ensure the category is ordered by the name alphabetically by default
-        cat = Category.objects.filter(pk__in=cat_id).translated(get_language()).order_by("translations__name")
-        for obj in cat:
-            yield str(obj.pk), smart_str(obj)
+        # Only offer categories with aliases, ordered by their name
+        language = get_language()
+        generation, choices = get_category_choices_cache(language)
+        if choices is None:
+            choices = list(
+                Alias.objects.order_by()
+                .values("category")
+                .annotate(name=get_category_name(OuterRef("category"), language), alias_count=Count("pk"))
+                .order_by("name", "category")
+                .values_list("category", "name", "alias_count")
+            )
+            set_category_choices_cache(generation, language, choices)
+        self.alias_counts = {str(pk): alias_count for pk, _name, alias_count in choices}
+        return [(str(pk), smart_str(name)) for pk, name, _alias_count in choices]
 
     def queryset(self, request, queryset):
         if self.value():
@@ -73,7 +82,7 @@ class CategoryFilter(admin.SimpleListFilter):
             yield {
                 "selected": self.value() == str(lookup),
                 "query_string": changelist.get_query_string({self.parameter_name: lookup}),
-                "display": title,
+                "display": f"{title} ({self.alias_counts[lookup]})",
             }
 
 
@@ -90,9 +99,9 @@ class UsedFilter(admin.SimpleListFilter):
     def queryset(self, request, queryset):
         value = self.value()
         if value == "yes":
-            return queryset.filter(cmsplugins_count__gt=0)
+            return queryset.filter(usage_count__gt=0)
         elif value == "no":
-            return queryset.filter(cmsplugins_count=0)
+            return queryset.filter(usage_count=0)
         return queryset
 
     def choices(self, changelist):
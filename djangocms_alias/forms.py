@@ -17,6 +17,7 @@ from django.utils.translation import gettext_lazy as _
 from parler.forms import TranslatableModelForm
 
 from .constants import CATEGORY_SELECT2_URL_NAME, SELECT2_ALIAS_URL_NAME
+from .dependencies import get_dependency_graph
 from .models import (
     Alias,
     AliasContent,
@@ -342,6 +343,18 @@ class AliasPluginForm(forms.ModelForm):
         else:
             pass
 
+    def clean(self):
+        cleaned_data = super().clean()
+        alias = cleaned_data.get("alias")
+        source = getattr(getattr(self, "target_placeholder", None), "source", None)
+        if alias and isinstance(source, AliasContent):
+            if get_dependency_graph().would_create_cycle(source.alias_id, alias.pk):
+                self.add_error(
+                    "alias",
+                    _("This alias cannot be added here because it includes the alias being edited."),
+                )
+        return cleaned_data
+
     class Meta:
         model = AliasPlugin
         fields = (
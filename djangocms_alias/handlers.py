@@ -0,0 +1,211 @@
+from contextvars import ContextVar
+
+from cms import operations
+from cms.models import CMSPlugin, Placeholder
+from cms.signals import post_placeholder_operation, pre_placeholder_operation
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import PermissionDenied
+from django.core.signals import request_started
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext as _
+
+from .cache import (
+    invalidate_alias_fragments,
+    invalidate_category_choices,
+    invalidate_dependency_graph,
+    invalidate_plugin_snapshots,
+    invalidate_select2_results,
+    invalidate_static_alias_directory,
+)
+from .dependencies import get_cyclic_alias_ids, get_dependency_graph, update_dependencies
+from .models import Alias, AliasContent, AliasDependency, AliasPlugin, Category
+from .resolver import build_plugin_snapshots
+from .search import update_alias_tokens, update_category_tokens
+
+# Token of the placeholder operation in progress: plugins saved by it are
+# handled by the post_placeholder_operation receiver
+_placeholder_operation = ContextVar("djangocms_alias_placeholder_operation", default=None)
+
+
+@receiver(request_started, dispatch_uid="djangocms_alias_request_started")
+def reset_placeholder_operation(sender, **kwargs):
+    # An operation that failed does not send post_placeholder_operation
+    _placeholder_operation.set(None)
+
+
+def invalidate_aliases(alias_ids) -> None:
+    """Invalidates the rendered fragments of the aliases and of all aliases
+    including them."""
+    if alias_ids:
+        invalidate_alias_fragments(get_dependency_graph().get_including_alias_ids(alias_ids))
+
+
+def invalidate_placeholders(placeholder_ids) -> None:
+    invalidate_plugin_snapshots(placeholder_ids)
+    alias_ids = AliasContent.admin_manager.filter(placeholders__in=placeholder_ids).values_list("alias_id", flat=True)
+    invalidate_aliases(set(alias_ids))
+
+
+@receiver(post_save, sender=Alias, dispatch_uid="djangocms_alias_alias_saved")
+@receiver(post_delete, sender=Alias, dispatch_uid="djangocms_alias_alias_deleted")
+def alias_changed(sender, instance, **kwargs):
+    invalidate_static_alias_directory()
+    invalidate_select2_results()
+    invalidate_category_choices()
+    invalidate_aliases({instance.pk})
+    if kwargs["signal"] is post_save:
+        # The tokens of a deleted alias are deleted with it
+        update_alias_tokens({instance.pk})
+
+
+@receiver(post_save, sender=AliasContent, dispatch_uid="djangocms_alias_content_saved")
+@receiver(post_delete, sender=AliasContent, dispatch_uid="djangocms_alias_content_deleted")
+def alias_content_changed(sender, instance, **kwargs):
+    invalidate_static_alias_directory()
+    invalidate_select2_results()
+    invalidate_aliases({instance.alias_id})
+    origin = kwargs.get("origin")
+    if getattr(origin, "model", type(origin)) is not Alias:
+        # Unless the content is deleted together with its alias
+        update_alias_tokens({instance.alias_id})
+
+
+@receiver(post_save, sender=Category._parler_meta.root_model, dispatch_uid="djangocms_alias_category_name_saved")
+@receiver(post_delete, sender=Category._parler_meta.root_model, dispatch_uid="djangocms_alias_category_name_deleted")
+def category_translation_changed(sender, instance, **kwargs):
+    invalidate_select2_results()
+    invalidate_category_choices()
+    update_category_tokens({instance.master_id})
+
+
+@receiver(post_save, sender=Placeholder, dispatch_uid="djangocms_alias_placeholder_saved")
+@receiver(post_delete, sender=Placeholder, dispatch_uid="djangocms_alias_placeholder_deleted")
+def placeholder_changed(sender, instance, **kwargs):
+    if instance.content_type_id == ContentType.objects.get_for_model(AliasContent).pk:
+        invalidate_static_alias_directory()
+        invalidate_aliases(
+            set(AliasContent.admin_manager.filter(pk=instance.object_id).values_list("alias_id", flat=True))
+        )
+
+
+def update_usage_count(instance, signal, created=False) -> None:
+    """Counts the alias plugin in (or out of) the usage count of its alias
+    (and of the alias it used before). Counts are changed by increments in
+    the database so that concurrent changes do not overwrite each other."""
+    if signal is post_delete:
+        changes = {instance.alias_id: -1}
+    elif created:
+        changes = {instance.alias_id: 1}
+    elif not hasattr(instance, "_saved_alias_id"):
+        # Not loaded as an AliasPlugin, the previous alias is unknown
+        Alias.objects.filter(pk=instance.alias_id).update_usage_counts()
+        return
+    elif instance._saved_alias_id != instance.alias_id:
+        changes = {instance._saved_alias_id: -1, instance.alias_id: 1}
+    else:
+        return
+    for alias_id, change in changes.items():
+        Alias.objects.filter(pk=alias_id).update(usage_count=Greatest(F("usage_count") + change, 0))
+    instance._saved_alias_id = instance.alias_id
+
+
+@receiver(post_init, sender=AliasPlugin, dispatch_uid="djangocms_alias_plugin_loaded")
+def alias_plugin_loaded(sender, instance, **kwargs):
+    # The alias stored in the database, see update_usage_count
+    instance._saved_alias_id = instance.__dict__.get("alias_id")
+
+
+def get_placeholder_alias_ids(plugin) -> set:
+    """Returns the ids of the aliases whose content holds the plugin's
+    placeholder, with at most one query."""
+    if type(plugin).placeholder.is_cached(plugin):
+        if plugin.placeholder.content_type_id != ContentType.objects.get_for_model(AliasContent).pk:
+            return set()
+    return set(
+        AliasContent.admin_manager.filter(placeholders=plugin.placeholder_id).values_list("alias_id", flat=True)
+    )
+
+
+def plugin_changed(sender, instance, **kwargs):
+    if isinstance(instance, AliasPlugin):
+        update_usage_count(instance, kwargs["signal"], kwargs.get("created", False))
+    if not instance.placeholder_id or _placeholder_operation.get() is not None:
+        # Plugins changed by a placeholder operation are handled once the
+        # operation is done, see placeholder_operation
+        return
+    if isinstance(instance, AliasPlugin) and kwargs["signal"] is post_save:
+        # Also removes the edge of a plugin saved outside of an alias
+        # content. The edge of a deleted plugin is deleted with it.
+        update_dependencies([instance.placeholder_id])
+    # Plugins outside of alias contents do not change any alias
+    if alias_ids := get_placeholder_alias_ids(instance):
+        invalidate_plugin_snapshots([instance.placeholder_id])
+        invalidate_aliases(alias_ids)
+
+
+# Plugin models are all CMSPlugin subclasses, which are loaded before the
+# app is ready
+for plugin_model in apps.get_models():
+    if issubclass(plugin_model, CMSPlugin):
+        post_save.connect(plugin_changed, sender=plugin_model, dispatch_uid="djangocms_alias_plugin_saved")
+        post_delete.connect(plugin_changed, sender=plugin_model, dispatch_uid="djangocms_alias_plugin_deleted")
+
+
+@receiver(post_save, sender=AliasDependency, dispatch_uid="djangocms_alias_dependency_saved")
+@receiver(post_delete, sender=AliasDependency, dispatch_uid="djangocms_alias_dependency_deleted")
+def dependency_changed(sender, instance, **kwargs):
+    invalidate_dependency_graph()
+
+
+@receiver(pre_placeholder_operation, dispatch_uid="djangocms_alias_check_placeholder_operation")
+def check_placeholder_operation(sender, operation, target_placeholder=None, plugin=None, plugins=None, **kwargs):
+    # Like the plugin form: moved, pasted and copied alias plugins must not
+    # make an alias include itself
+    if target_placeholder is None:
+        return
+    plugin_ids = [source_plugin.pk for source_plugin in plugins or ()]
+    if plugin is not None and operation in (operations.MOVE_PLUGIN, operations.PASTE_PLUGIN):
+        plugin_ids += [plugin.pk, *plugin.get_descendants().values_list("pk", flat=True)]
+    alias_ids = set(AliasPlugin.objects.filter(pk__in=plugin_ids).values_list("alias_id", flat=True))
+    if alias_ids and get_cyclic_alias_ids(target_placeholder, alias_ids):
+        raise PermissionDenied(_("This alias cannot be added here because it includes the alias being edited."))
+
+
+@receiver(pre_placeholder_operation, dispatch_uid="djangocms_alias_placeholder_operation_started")
+def placeholder_operation_started(sender, token=None, **kwargs):
+    _placeholder_operation.set(token)
+
+
+@receiver(post_placeholder_operation, dispatch_uid="djangocms_alias_placeholder_operation")
+def placeholder_operation(sender, token=None, **kwargs):
+    if _placeholder_operation.get() == token:
+        _placeholder_operation.set(None)
+    # Moving plugins out of a placeholder does not save that placeholder's plugins
+    placeholder_ids = [value.pk for value in kwargs.values() if isinstance(value, Placeholder)]
+    if placeholder_ids:
+        update_dependencies(placeholder_ids)
+        invalidate_placeholders(placeholder_ids)
+
+
+def version_changed(sender, operation, obj, **kwargs):
+    # Publishing, unpublishing and archiving change which content is shown
+    invalidate_static_alias_directory()
+    invalidate_select2_results()
+    invalidate_aliases({obj.content.alias_id})
+    if operation == OPERATION_PUBLISH:
+        # Published contents are rendered from their plugin snapshot
+        if obj.content.placeholder:
+            build_plugin_snapshots([obj.content.placeholder], obj.content.language)
+
+
+if apps.is_installed("djangocms_versioning"):
+    from djangocms_versioning.constants import OPERATION_PUBLISH
+    from djangocms_versioning.signals import post_version_operation
+
+    post_version_operation.connect(
+        version_changed, sender=AliasContent, dispatch_uid="djangocms_alias_version_changed"
+    )
@@ -1,11 +1,22 @@
-from cms.toolbar.utils import get_object_preview_url, get_toolbar_from_request
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from cms.plugin_rendering import ContentRenderer
+from cms.toolbar.utils import get_object_preview_url
+from cms.utils.plugins import assign_plugins
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import F, OuterRef
 from django.template import RequestContext
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from djangocms_internalsearch.base import BaseSearchConfig
 from djangocms_internalsearch.helpers import get_request, get_version_object
 from haystack import indexes
 
-from .models import AliasContent
+from .models import AliasContent, get_category_name
 
 
 def get_title(obj):
@@ -58,33 +69,139 @@ class AliasContentConfig(BaseSearchConfig):
 
     model = AliasContent
 
-    def prepare_text(self, obj):
-        request = get_request(obj.language)
-        context = RequestContext(request)
-        if "request" not in context:
-            context["request"] = request
-
-        toolbar = get_toolbar_from_request(request)
-        renderer = toolbar.get_content_renderer()
-        source = obj.placeholder
-        if not source:
-            return
-        content = renderer.render_placeholder(
-            placeholder=source,
-            context=context,
-            editable=False,
+    def index_queryset(self, using=None):
+        """Loads the placeholder, category name and version state of all
+        contents with the contents instead of querying them for each content."""
+        queryset = (
+            super()
+            .index_queryset(using=using)
+            .with_placeholder()
+            .annotate(category_name=get_category_name(OuterRef("alias__category"), OuterRef("language")))
         )
-        return content
+        try:
+            AliasContent._meta.get_field("versions")
+        except FieldDoesNotExist:
+            # Versioning is not enabled for aliases
+            return queryset
+        return queryset.annotate(version_state=F("versions__state"))
+
+    @cached_property
+    def requests(self):
+        # Building a request and its toolbar is expensive - build one per
+        # language and reuse it for all contents indexed by this process
+        return {}
+
+    @cached_property
+    def texts(self):
+        # Texts rendered by update_batch, by content pk
+        return {}
+
+    def get_request(self, language):
+        if language not in self.requests:
+            self.requests[language] = get_request(language)
+        return self.requests[language]
+
+    def prepare_texts(self, contents) -> dict:
+        """
+        Renders the placeholders of the contents and returns the texts by
+        content pk. The plugins of all placeholders of a language are loaded
+        at once (one query plus one per plugin type) and rendered by one
+        renderer. Renderers keep all placeholders they rendered, so they are
+        not kept beyond the contents passed.
+        """
+        contents_by_language = defaultdict(list)
+        for content in contents:
+            contents_by_language[content.language].append(content)
+
+        texts = {}
+        for language, language_contents in contents_by_language.items():
+            request = self.get_request(language)
+            renderer = ContentRenderer(request=request)
+            placeholders = [content.placeholder for content in language_contents if content.placeholder]
+            assign_plugins(
+                request,
+                [placeholder for placeholder in placeholders if not hasattr(placeholder, "_plugins_cache")],
+                lang=language,
+            )
+            for content in language_contents:
+                if not content.placeholder:
+                    texts[content.pk] = None
+                    continue
+                context = RequestContext(request)
+                if "request" not in context:
+                    context["request"] = request
+                texts[content.pk] = renderer.render_placeholder(
+                    placeholder=content.placeholder,
+                    context=context,
+                    editable=False,
+                )
+        return texts
+
+    def prepare_text(self, obj):
+        if obj.pk in self.texts:
+            # Rendered with its batch by update_batch
+            return self.texts.pop(obj.pk)
+        return self.prepare_texts([obj])[obj.pk]
+
+    def update_batch(self, contents, using=None) -> int:
+        """Indexes the contents, rendering their texts together (see
+        prepare_texts). Returns the number of contents indexed."""
+        backend = self.get_backend(using)
+        contents = list(contents)
+        if backend is None or not contents:
+            return 0
+        self.texts.update(self.prepare_texts(contents))
+        try:
+            backend.update(self, contents)
+        finally:
+            for content in contents:
+                self.texts.pop(content.pk, None)
+        return len(contents)
+
+    def update_in_batches(self, using=None, batch_size=500, workers=0):
+        """
+        Indexes all contents of ``index_queryset`` in batches of
+        ``batch_size`` contents, by ``workers`` forked processes if given.
+        Yields the number of contents indexed after each batch.
+        """
+        pks = list(self.index_queryset(using=using).order_by("pk").values_list("pk", flat=True))
+        batches = [pks[start : start + batch_size] for start in range(0, len(pks), batch_size)]
+        indexed = 0
+        if workers > 0:
+            # Forked processes must not share the database connections
+            connections.close_all()
+            mp_context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+                for count in executor.map(update_batch, batches, repeat(using)):
+                    indexed += count
+                    yield indexed
+        else:
+            for batch in batches:
+                indexed += update_batch(batch, using, index=self)
+                yield indexed
 
     def prepare_url(self, obj):
         return get_object_preview_url(obj)
 
     def prepare_category(self, obj):
+        if hasattr(obj, "category_name"):
+            # Loaded by index_queryset
+            return obj.category_name
         obj.alias.category.set_current_language(obj.language)
         return obj.alias.category.name
 
     def prepare_version_status(self, obj):
+        if hasattr(obj, "version_state"):
+            # Loaded by index_queryset
+            return obj.version_state
         version_obj = get_version_object(obj)
         if not version_obj:
             return
         return version_obj.state
+
+
+def update_batch(pks, using=None, index=None) -> int:
+    """Indexes the alias contents with the given pks, see
+    ``AliasContentConfig.update_in_batches``."""
+    index = index or AliasContentConfig()
+    return index.update_batch(index.index_queryset(using=using).filter(pk__in=pks).order_by("pk"), using=using)
@@ -0,0 +1,79 @@
+import uuid
+from http import HTTPStatus
+
+from cms.utils.conf import get_cms_setting
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+
+from djangocms_alias.metrics import render_metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the given URL paths with the alias render metrics enabled and shows the time, database queries "
+        "and fragment cache hits of each rendered alias, the most expensive first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="URL paths to render, e.g. /en/")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Number of times each path is rendered",
+        )
+        parser.add_argument(
+            "--username",
+            type=str,
+            help="Username of the user the paths are rendered for (default: anonymous)",
+        )
+        parser.add_argument(
+            "--host",
+            type=str,
+            help="Host name the paths are requested from (defaults to the domain of the current site)",
+        )
+        parser.add_argument(
+            "--prometheus",
+            action="store_true",
+            help="Write the metrics in the Prometheus text format",
+        )
+
+    def handle(self, *args, **options):
+        client = Client(HTTP_HOST=options["host"] or Site.objects.get_current().domain)
+        if options["username"]:
+            User = get_user_model()
+            try:
+                client.force_login(User.objects.get(**{User.USERNAME_FIELD: options["username"]}))
+            except User.DoesNotExist as err:
+                raise CommandError(f"No user with name {options['username']} found") from err
+
+        render_metrics.reset()
+        # Render the aliases on every request instead of serving cached pages and placeholders. The
+        # placeholder cache stays enabled since the alias fragment cache is only used together with it:
+        # a new CMS cache prefix per request makes the page placeholders miss the cache instead.
+        cache_prefix = f"{get_cms_setting('CACHE_PREFIX')}alias-metrics-{uuid.uuid4().hex}"
+        with override_settings(DJANGOCMS_ALIAS_RENDER_METRICS=True, CMS_PAGE_CACHE=False):
+            for path in options["paths"]:
+                for index in range(options["repeat"]):
+                    with override_settings(CMS_CACHE_PREFIX=f"{cache_prefix}-{index}-"):
+                        response = client.get(path)
+                    if response.status_code != HTTPStatus.OK:
+                        self.stderr.write(f"{path}: status {response.status_code}")
+
+        if options["prometheus"]:
+            self.stdout.write(render_metrics.to_prometheus(), ending="")
+            return
+        for (path, alias, language), metrics in render_metrics.get_values().items():
+            renders = metrics["renders_total"]
+            hits, misses = metrics["render_cache_hits_total"], metrics["render_cache_misses_total"]
+            self.stdout.write(
+                f"{path} {alias} ({language}): {renders} renders, "
+                f"{metrics['render_seconds_total'] * 1000 / renders:.1f} ms and "
+                f"{metrics['render_queries_total'] / renders:.1f} queries per render, "
+                # Staff users, edit mode and a disabled cache bypass the fragment cache
+                + (f"{hits} cache hits, {misses} misses" if hits or misses else "fragment cache bypassed")
+            )
+        self.stdout.write(self.style.SUCCESS(f"{len(options['paths'])} paths rendered"))
@@ -0,0 +1,33 @@
+from cms.constants import TEMPLATE_INHERITANCE_MAGIC
+from cms.utils.conf import get_cms_setting
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateDoesNotExist
+
+from djangocms_alias.rendering import collect_static_alias_declarations
+
+
+class Command(BaseCommand):
+    help = (
+        "Scans the CMS templates for static_alias tags and stores their declarations in the cache shared by all "
+        "processes. Run it after deploying changed templates."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "templates",
+            nargs="*",
+            help="Templates to scan for static_alias tags (defaults to all templates in CMS_TEMPLATES)",
+        )
+
+    def handle(self, *args, **options):
+        templates = options["templates"] or [
+            template for template, _name in get_cms_setting("TEMPLATES") if template != TEMPLATE_INHERITANCE_MAGIC
+        ]
+        try:
+            declarations = collect_static_alias_declarations(templates)
+        except TemplateDoesNotExist as err:
+            raise CommandError(f"Template {err} not found") from err
+
+        for template, template_declarations in declarations.items():
+            self.stdout.write(f"{template}: {len(template_declarations)} static aliases")
+        self.stdout.write(self.style.SUCCESS("Static alias declarations collected"))
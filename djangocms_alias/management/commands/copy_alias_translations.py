@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from djangocms_alias.copying import copy_alias_translations
+from djangocms_alias.models import Alias, AliasContent
+from djangocms_alias.utils import is_versioning_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the contents of aliases with their plugins from one language to another, creating the missing "
+        "alias contents. Each batch of aliases is committed separately and aliases which already have content in "
+        "the target language are skipped, so an interrupted copy is resumed by running the command again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("language", help="Language to copy from")
+        parser.add_argument("target_language", help="Language to copy to")
+        parser.add_argument(
+            "--category",
+            type=int,
+            action="append",
+            dest="categories",
+            help="Only copy the aliases of the category with this id (can be given several times)",
+        )
+        parser.add_argument(
+            "--site",
+            type=int,
+            help="Only copy the aliases of the site with this id and those without site",
+        )
+        parser.add_argument(
+            "--username",
+            type=str,
+            help="Username of the user the alias contents are created by (required if versioning is enabled)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of aliases copied per transaction",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Do not change the database",
+        )
+
+    def handle(self, *args, **options):
+        language, target_language = options["language"], options["target_language"]
+        if language == target_language:
+            raise CommandError("The languages to copy from and to are the same")
+
+        aliases = Alias.objects.all()
+        if options["categories"]:
+            aliases = aliases.filter(category__in=options["categories"])
+        if options["site"]:
+            aliases = aliases.filter(Q(site=options["site"]) | Q(site__isnull=True))
+
+        if options["dry_run"]:
+            missing = (
+                aliases.filter(contents__language=language)
+                .exclude(pk__in=AliasContent.admin_manager.filter(language=target_language).values("alias"))
+                .distinct()
+                .count()
+            )
+            self.stdout.write(f"{missing} aliases to copy from {language} to {target_language}")
+            self.stdout.write("Dry run: no changes written")
+            return
+
+        user = None
+        if options["username"]:
+            User = get_user_model()
+            try:
+                user = User.objects.get(**{User.USERNAME_FIELD: options["username"]})
+            except User.DoesNotExist as err:
+                raise CommandError(f"No user with name {options['username']} found") from err
+        elif is_versioning_enabled():
+            raise CommandError("Versioning is enabled: --username is required")
+
+        created = 0
+        total = aliases.count()
+        for checked, created in copy_alias_translations(
+            aliases, language, target_language, user=user, batch_size=options["batch_size"]
+        ):
+            self.stdout.write(f"{checked}/{total} aliases checked, {created} alias contents created")
+
+        self.stdout.write(self.style.SUCCESS(f"{created} alias contents copied from {language} to {target_language}"))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from djangocms_alias.cache import invalidate_static_alias_directory
+from djangocms_alias.models import AliasContent
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the missing placeholders of all alias contents. Placeholders are created together with their "
+        "alias content - run this once for contents created before or bulk-created without their placeholder."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of alias contents checked per query",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Do not change the database",
+        )
+
+    def handle(self, *args, **options):
+        content_ids = list(AliasContent.admin_manager.order_by("pk").values_list("pk", flat=True))
+        batch_size = options["batch_size"]
+        created = 0
+        with transaction.atomic():
+            for start in range(0, len(content_ids), batch_size):
+                batch = content_ids[start : start + batch_size]
+                created += len(AliasContent.admin_manager.filter(pk__in=batch).create_missing_placeholders())
+            if options["dry_run"]:
+                transaction.set_rollback(True)
+            elif created:
+                # Bulk creation does not send the signals the directory relies on
+                transaction.on_commit(invalidate_static_alias_directory)
+
+        self.stdout.write(f"{len(content_ids)} alias contents checked, {created} placeholders missing")
+        if options["dry_run"]:
+            self.stdout.write("Dry run: no changes written")
+        else:
+            self.stdout.write(self.style.SUCCESS("Alias placeholders created"))
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djangocms_alias.copying import detach_alias
+from djangocms_alias.models import Alias, AliasPlugin
+
+
+class Command(BaseCommand):
+    help = (
+        "Replaces all alias plugins showing the given aliases by copies of the aliases' plugins and deletes the "
+        "aliases afterwards. Each placeholder is committed separately, so an interrupted detach is continued by "
+        "running the command again. With djangocms-versioning, only placeholders of unlocked draft versions are "
+        "changed, aliases still used by other versions are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("aliases", nargs="+", type=int, help="Ids of the aliases to detach")
+        parser.add_argument(
+            "--keep-alias",
+            action="store_true",
+            help="Do not delete the aliases once they are not used anymore",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Do not change the database",
+        )
+
+    def handle(self, *args, **options):
+        aliases = list(Alias.objects.filter(pk__in=options["aliases"]).order_by("pk"))
+        missing = set(options["aliases"]) - {alias.pk for alias in aliases}
+        if missing:
+            raise CommandError(f"No aliases with ids {', '.join(map(str, sorted(missing)))} found")
+
+        for alias in aliases:
+            pk = alias.pk
+            if options["dry_run"]:
+                plugins = AliasPlugin.objects.filter(alias=alias)
+                placeholders = plugins.values("placeholder").distinct().count()
+                self.stdout.write(f"Alias {pk}: {plugins.count()} alias plugins in {placeholders} placeholders")
+                continue
+            detached, skipped = 0, 0
+            for count, total, detached, skipped in detach_alias(alias, delete_alias=not options["keep_alias"]):
+                self.stdout.write(
+                    f"Alias {pk}: {count}/{total} placeholders, {detached} alias plugins detached, {skipped} skipped"
+                )
+            if skipped:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"Alias {pk}: {skipped} placeholders of published, archived or locked versions skipped"
+                    )
+                )
+            deleted = not Alias.objects.filter(pk=pk).exists()
+            self.stdout.write(f"Alias {pk}: {detached} alias plugins detached{', alias deleted' if deleted else ''}")
+
+        if options["dry_run"]:
+            self.stdout.write("Dry run: no changes written")
+        else:
+            self.stdout.write(self.style.SUCCESS("Aliases detached"))
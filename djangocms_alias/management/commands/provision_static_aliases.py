@@ -0,0 +1,153 @@
+from cms.constants import TEMPLATE_INHERITANCE_MAGIC
+from cms.utils.conf import get_cms_setting
+from cms.utils.i18n import get_language_list
+from django.contrib.auth import get_user_model
+from django.contrib.sites.models import Site
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.template import TemplateDoesNotExist
+
+from djangocms_alias.cache import (
+    invalidate_category_choices,
+    invalidate_select2_results,
+    invalidate_static_alias_directory,
+)
+from djangocms_alias.models import Alias, AliasContent, Category
+from djangocms_alias.rendering import scan_static_aliases
+from djangocms_alias.search import update_alias_tokens
+from djangocms_alias.utils import is_versioning_enabled
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the aliases, alias contents and placeholders of all static aliases declared in the CMS templates "
+        "for every site and language in one transaction. Use together with the STATIC_ALIAS_READ_ONLY setting "
+        "to keep the static_alias template tag from writing to the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "templates",
+            nargs="*",
+            help="Templates to scan for static_alias tags (defaults to all templates in CMS_TEMPLATES)",
+        )
+        parser.add_argument(
+            "--username",
+            type=str,
+            help="Username of the user the alias contents are created by (required if versioning is enabled)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Do not change the database",
+        )
+
+    def handle(self, *args, **options):
+        templates = options["templates"] or [
+            template for template, _name in get_cms_setting("TEMPLATES") if template != TEMPLATE_INHERITANCE_MAGIC
+        ]
+        declarations = set()
+        for template in templates:
+            try:
+                declarations.update(scan_static_aliases(template))
+            except TemplateDoesNotExist as err:
+                raise CommandError(f"Template {template} not found") from err
+
+        user = None
+        if options["username"]:
+            User = get_user_model()
+            try:
+                user = User.objects.get(**{User.USERNAME_FIELD: options["username"]})
+            except User.DoesNotExist as err:
+                raise CommandError(f"No user with name {options['username']} found") from err
+
+        with transaction.atomic():
+            aliases = self.provision_aliases(declarations, options["dry_run"])
+            contents = self.provision_contents(aliases, user, options["dry_run"])
+            self.provision_placeholders(contents, options["dry_run"])
+            # Bulk-created aliases and contents do not send the signals maintaining their search tokens
+            update_alias_tokens({content.alias_id for content in contents})
+            if options["dry_run"]:
+                transaction.set_rollback(True)
+            else:
+                # Bulk creation does not send the signals the caches rely on
+                transaction.on_commit(invalidate_static_alias_directory)
+                transaction.on_commit(invalidate_category_choices)
+                transaction.on_commit(invalidate_select2_results)
+
+    def provision_aliases(self, declarations, dry_run):
+        sites = list(Site.objects.all())
+        keys = set()
+        for declaration in declarations:
+            if declaration.site:
+                keys.update((declaration.static_code, site.pk) for site in sites)
+            else:
+                keys.add((declaration.static_code, None))
+
+        aliases = {
+            (alias.static_code, alias.site_id): alias
+            for alias in Alias.objects.filter(static_code__in={static_code for static_code, _site_id in keys})
+        }
+        missing = sorted(keys - aliases.keys(), key=lambda key: (key[0], key[1] or 0))
+        self.stdout.write(f"{len(keys)} static aliases declared, {len(missing)} missing")
+        if missing:
+            category = Category.get_static_alias_category()
+            category.lock()
+            position = category.aliases.get_next_position()
+            new_aliases = Alias.objects.bulk_create(
+                Alias(
+                    static_code=static_code,
+                    site_id=site_id,
+                    category=category,
+                    creation_method=Alias.CREATION_BY_TEMPLATE,
+                    position=position + index * Alias.POSITION_GAP,
+                )
+                for index, (static_code, site_id) in enumerate(missing)
+            )
+            for alias in new_aliases:
+                aliases[alias.static_code, alias.site_id] = alias
+        return [aliases[key] for key in keys]
+
+    def provision_contents(self, aliases, user, dry_run):
+        all_languages = []
+        for site in Site.objects.all():
+            all_languages += [language for language in get_language_list(site.pk) if language not in all_languages]
+
+        contents = list(AliasContent.admin_manager.filter(alias__in=aliases))
+        existing = {(content.alias_id, content.language) for content in contents}
+        missing = [
+            (alias, language)
+            for alias in aliases
+            for language in (get_language_list(alias.site_id) if alias.site_id else all_languages)
+            if (alias.pk, language) not in existing
+        ]
+        self.stdout.write(f"{len(existing)} alias contents found, {len(missing)} missing")
+        if not missing:
+            return contents
+
+        if dry_run:
+            for alias, language in missing:
+                self.stdout.write(f"Would create alias content {alias.static_code} ({language})")
+        if is_versioning_enabled():
+            if user is None:
+                raise CommandError("Versioning is enabled: specify the user creating the contents with --username")
+            # Each content needs its own draft version, so it cannot be bulk-created
+            manager = AliasContent.objects.with_user(user)
+            new_contents = [
+                manager.create(alias=alias, name=alias.static_code, language=language) for alias, language in missing
+            ]
+        else:
+            new_contents = AliasContent.objects.bulk_create(
+                AliasContent(alias=alias, name=alias.static_code, language=language) for alias, language in missing
+            )
+        return contents + new_contents
+
+    def provision_placeholders(self, contents, dry_run):
+        missing = AliasContent.admin_manager.filter(
+            pk__in=[content.pk for content in contents]
+        ).create_missing_placeholders()
+        self.stdout.write(f"{len(missing)} placeholders missing")
+        if dry_run:
+            self.stdout.write("Dry run: no changes written")
+        else:
+            self.stdout.write(self.style.SUCCESS("Static aliases provisioned"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from djangocms_alias.models import Alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Spaces out the positions of the aliases of each category again, keeping their order. Moving aliases "
+        "takes free positions between their neighbours - this restores free positions everywhere at once."
+    )
+
+    def handle(self, *args, **options):
+        category_ids = list(Alias.objects.order_by("category").values_list("category", flat=True).distinct())
+        updated = 0
+        for category_id in category_ids:
+            with transaction.atomic():
+                updated += Alias.objects.filter(category=category_id).rebalance()
+
+        self.stdout.write(f"{updated} aliases in {len(category_ids)} categories")
+        self.stdout.write(self.style.SUCCESS("Alias positions rebalanced"))
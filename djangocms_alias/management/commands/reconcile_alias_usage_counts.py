@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from djangocms_alias.models import Alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts the alias plugins using each alias and corrects the stored usage counts, e.g. after alias "
+        "plugins were created or deleted without sending signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of aliases updated per query",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Do not change the database",
+        )
+
+    def handle(self, *args, **options):
+        outdated = list(
+            Alias.objects.with_plugin_count()
+            .exclude(usage_count=F("plugin_count"))
+            .order_by("pk")
+            .values_list("pk", "usage_count", "plugin_count")
+        )
+        for pk, usage_count, plugin_count in outdated:
+            self.stdout.write(f"Alias {pk}: usage count {usage_count}, used by {plugin_count} alias plugins")
+
+        if not options["dry_run"]:
+            batch_size = options["batch_size"]
+            with transaction.atomic():
+                for start in range(0, len(outdated), batch_size):
+                    batch = [pk for pk, _usage_count, _plugin_count in outdated[start : start + batch_size]]
+                    Alias.objects.filter(pk__in=batch).update_usage_counts()
+
+        self.stdout.write(f"{len(outdated)} alias usage counts outdated")
+        if options["dry_run"]:
+            self.stdout.write("Dry run: no changes written")
+        else:
+            self.stdout.write(self.style.SUCCESS("Alias usage counts reconciled"))
@@ -0,0 +1,62 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from djangocms_alias.models import ContentEvent
+from djangocms_alias.utils import get_content_event_emitters, send_content_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends the content change and delete events stored in the outbox (with the DJANGOCMS_ALIAS_CONTENT_EVENTS "
+        'setting set to "outbox") to djangocms-internalsearch and removes them from the outbox.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of events sent per batch",
+        )
+
+    def handle(self, *args, **options):
+        if get_content_event_emitters() is None:
+            raise CommandError("djangocms-internalsearch is not installed")
+
+        sent = 0
+        while batch := self.send_batch(options["batch_size"]):
+            sent += batch
+            self.stdout.write(f"{sent} content events sent")
+        self.stdout.write(self.style.SUCCESS(f"{sent} content events sent"))
+
+    def send_batch(self, batch_size) -> int:
+        started = timezone.now()
+        events = list(ContentEvent.objects.select_related("content_type").order_by("pk")[:batch_size])
+        if not events:
+            return 0
+
+        ids_by_model = {}
+        for event in events:
+            ids_by_model.setdefault(event.content_type.model_class(), []).append(event.object_id)
+        objs = {
+            (model, pk): obj
+            for model, ids in ids_by_model.items()
+            if model is not None
+            for pk, obj in model._base_manager.in_bulk(ids).items()
+        }
+
+        content_events = []
+        for event in events:
+            model = event.content_type.model_class()
+            sender = apps.get_model(event.sender) if event.sender else None
+            if (model, event.object_id) in objs:
+                content_events.append((event.action, objs[model, event.object_id], sender))
+            elif model is not None and event.action == ContentEvent.DELETE:
+                # Deleted objects are identified by their model and primary key
+                content_events.append((event.action, model(pk=event.object_id), sender))
+        send_content_events(content_events)
+
+        # Events replaced while sending stay in the outbox
+        ContentEvent.objects.filter(pk__in=[event.pk for event in events], modified__lte=started).delete()
+        return len(events)
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djangocms_alias.cms_config import AliasContentConfig
+
+
+class Command(BaseCommand):
+    help = (
+        "Indexes all alias contents for djangocms-internalsearch in batches. The plugins of each batch are loaded "
+        "together and rendered by one renderer per language, optionally in several worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--using",
+            type=str,
+            help="Search connection to update (default: chosen by the search routers)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of alias contents indexed per batch",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help="Number of worker processes indexing the batches (default: index in this process)",
+        )
+
+    def handle(self, *args, **options):
+        if AliasContentConfig is None:
+            raise CommandError("djangocms-internalsearch is not installed")
+
+        indexed = 0
+        for indexed in AliasContentConfig().update_in_batches(
+            using=options["using"], batch_size=options["batch_size"], workers=options["workers"]
+        ):
+            self.stdout.write(f"{indexed} alias contents indexed")
+        self.stdout.write(self.style.SUCCESS(f"{indexed} alias contents indexed"))
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections, router
+
+from .models import Alias, AliasContent
+from .signals import alias_rendered
+
+# ``path`` is "plugin" (Alias plugin), "static" ({% static_alias %} tag) or
+# "structure" (static aliases of the structure board), ``alias`` the alias id
+# for the plugin and the static code otherwise. ``cache`` is "hit" or "miss"
+# if the fragment cache was asked for the rendered content, else None.
+AliasRender = namedtuple("AliasRender", ["alias", "language", "path", "duration", "queries", "cache"])
+
+
+class _Measurement:
+    __slots__ = ("queries", "cache")
+
+    def __init__(self):
+        self.queries = 0
+        self.cache = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+
+# The measurement of the alias currently rendered by this thread or task
+_current_measurement = ContextVar("djangocms_alias_render_measurement", default=None)
+
+
+def is_render_metrics_enabled() -> bool:
+    return getattr(settings, "DJANGOCMS_ALIAS_RENDER_METRICS", False)
+
+
+def measure_render(path: str, alias, language: str):
+    """
+    Context manager measuring the wall time, the database queries and the
+    fragment cache use of rendering an alias. The measurement is recorded by
+    the in-process :data:`render_metrics` and sent with the ``alias_rendered``
+    signal. Does nothing unless ``DJANGOCMS_ALIAS_RENDER_METRICS`` is enabled.
+    """
+    if not is_render_metrics_enabled():
+        return nullcontext()
+    return _measure_render(path, alias, language)
+
+
+@contextmanager
+def _measure_render(path, alias, language):
+    measurement = _Measurement()
+    token = _current_measurement.set(measurement)
+    connection = connections[router.db_for_read(AliasContent)]
+    start = time.perf_counter()
+    try:
+        with connection.execute_wrapper(measurement):
+            yield
+    finally:
+        duration = time.perf_counter() - start
+        _current_measurement.reset(token)
+        render = AliasRender(alias, language, path, duration, measurement.queries, measurement.cache)
+        render_metrics.record(render)
+        if alias_rendered.has_listeners(Alias):
+            alias_rendered.send(sender=Alias, render=render)
+
+
+def record_cache_use(hit: bool) -> None:
+    """Records whether the fragment cache held the content of the alias rendered."""
+    measurement = _current_measurement.get()
+    if measurement is not None:
+        measurement.cache = "hit" if hit else "miss"
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RenderMetrics:
+    """
+    Aggregates the alias renders of this process by path, alias and language.
+    Each process (e.g. each worker of an application server) has its own
+    metrics.
+    """
+
+    metrics = [
+        ("renders_total", "Number of alias renders"),
+        ("render_seconds_total", "Wall time spent rendering aliases"),
+        ("render_queries_total", "Database queries executed while rendering aliases"),
+        ("render_cache_hits_total", "Alias renders served from the fragment cache"),
+        ("render_cache_misses_total", "Alias renders not found in the fragment cache"),
+    ]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def record(self, render: AliasRender) -> None:
+        key = (render.path, str(render.alias), render.language)
+        with self._lock:
+            values = self._values.setdefault(key, [0, 0.0, 0, 0, 0])
+            values[0] += 1
+            values[1] += render.duration
+            values[2] += render.queries
+            if render.cache == "hit":
+                values[3] += 1
+            elif render.cache == "miss":
+                values[4] += 1
+
+    def get_values(self) -> dict:
+        """Returns a dict of the metric values by ``(path, alias, language)``,
+        ordered by the time spent rendering (longest first)."""
+        with self._lock:
+            values = {key: list(value) for key, value in self._values.items()}
+        names = [name for name, _help in self.metrics]
+        values = {key: dict(zip(names, value, strict=True)) for key, value in values.items()}
+        return dict(sorted(values.items(), key=lambda item: -item[1]["render_seconds_total"]))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def to_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        values = self.get_values()
+        lines = []
+        for name, help_text in self.metrics:
+            lines.append(f"# HELP djangocms_alias_{name} {help_text}")
+            lines.append(f"# TYPE djangocms_alias_{name} counter")
+            for (path, alias, language), metric in values.items():
+                labels = ",".join(
+                    f'{label}="{_escape_label(value)}"'
+                    for label, value in (("path", path), ("alias", alias), ("language", language))
+                )
+                lines.append(f"djangocms_alias_{name}{{{labels}}} {metric[name]}")
+        return "\n".join(lines) + "\n"
+
+
+render_metrics = RenderMetrics()
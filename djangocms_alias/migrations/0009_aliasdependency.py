@@ -0,0 +1,75 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def create_dependencies(apps, schema_editor):
+    AliasContent = apps.get_model("djangocms_alias", "AliasContent")
+    AliasDependency = apps.get_model("djangocms_alias", "AliasDependency")
+    AliasPlugin = apps.get_model("djangocms_alias", "AliasPlugin")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    db_alias = schema_editor.connection.alias
+    content_type = (
+        ContentType.objects.using(db_alias).filter(app_label="djangocms_alias", model="aliascontent").first()
+    )
+    if content_type is None:
+        return
+    plugins = list(
+        AliasPlugin.objects.using(db_alias)
+        .filter(placeholder__content_type=content_type)
+        .values_list("pk", "alias_id", "placeholder__object_id")
+    )
+    alias_by_content = dict(AliasContent._default_manager.using(db_alias).values_list("pk", "alias_id"))
+    AliasDependency.objects.using(db_alias).bulk_create(
+        (
+            AliasDependency(plugin_id=plugin_id, alias_id=alias_by_content[content_id], included_alias_id=alias_id)
+            for plugin_id, alias_id, content_id in plugins
+            if content_id in alias_by_content
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("djangocms_alias", "0008_alter_categorytranslation_unique_together_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AliasDependency",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "alias",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dependencies",
+                        to="djangocms_alias.alias",
+                    ),
+                ),
+                (
+                    "included_alias",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dependents",
+                        to="djangocms_alias.alias",
+                    ),
+                ),
+                (
+                    "plugin",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="dependency",
+                        to="djangocms_alias.aliasplugin",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "alias dependency",
+                "verbose_name_plural": "alias dependencies",
+            },
+        ),
+        migrations.RunPython(create_dependencies, migrations.RunPython.noop, elidable=True),
+    ]
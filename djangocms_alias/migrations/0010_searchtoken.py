@@ -0,0 +1,86 @@
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+MAX_TOKEN_LENGTH = 64
+WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text) -> list:
+    # Frozen copy of djangocms_alias.search.tokenize at the time of this
+    # migration, which must not change with the application code
+    text = unicodedata.normalize("NFKD", str(text or "")).casefold()
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return list(dict.fromkeys(word[:MAX_TOKEN_LENGTH] for word in WORD_RE.findall(text)))
+
+
+def create_search_tokens(apps, schema_editor):
+    Alias = apps.get_model("djangocms_alias", "Alias")
+    AliasContent = apps.get_model("djangocms_alias", "AliasContent")
+    CategoryTranslation = apps.get_model("djangocms_alias", "CategoryTranslation")
+    SearchToken = apps.get_model("djangocms_alias", "SearchToken")
+
+    db_alias = schema_editor.connection.alias
+    words = set()
+    for alias_id, language, name in AliasContent._default_manager.using(db_alias).values_list(
+        "alias_id", "language", "name"
+    ):
+        words.update((alias_id, None, language, word) for word in tokenize(name))
+    for alias_id, static_code in (
+        Alias.objects.using(db_alias).filter(static_code__isnull=False).values_list("pk", "static_code")
+    ):
+        words.update((alias_id, None, "", word) for word in tokenize(static_code))
+    for category_id, language, name in CategoryTranslation.objects.using(db_alias).values_list(
+        "master_id", "language_code", "name"
+    ):
+        words.update((None, category_id, language, word) for word in tokenize(name))
+    SearchToken.objects.using(db_alias).bulk_create(
+        (
+            SearchToken(alias_id=alias_id, category_id=category_id, language=language, token=word)
+            for alias_id, category_id, language, word in words
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_alias", "0009_aliasdependency"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchToken",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("language", models.CharField(blank=True, max_length=10)),
+                ("token", models.CharField(max_length=64)),
+                (
+                    "alias",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_tokens",
+                        to="djangocms_alias.alias",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_tokens",
+                        to="djangocms_alias.category",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "search token",
+                "verbose_name_plural": "search tokens",
+                "indexes": [models.Index(fields=["language", "token"], name="djangocms_alias_search_idx")],
+            },
+        ),
+        migrations.RunPython(create_search_tokens, migrations.RunPython.noop, elidable=True),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_usages(apps, schema_editor):
+    Alias = apps.get_model("djangocms_alias", "Alias")
+    AliasPlugin = apps.get_model("djangocms_alias", "AliasPlugin")
+
+    db_alias = schema_editor.connection.alias
+    plugins = AliasPlugin.objects.using(db_alias).filter(alias=OuterRef("pk")).order_by().values("alias")
+    Alias.objects.using(db_alias).update(
+        usage_count=Coalesce(Subquery(plugins.annotate(count=Count("pk")).values("count")), 0)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_alias", "0010_searchtoken"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="alias",
+            name="usage_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of alias plugins using the alias, kept up to date when alias plugins change.",
+                verbose_name="usage count",
+            ),
+        ),
+        migrations.RunPython(count_usages, migrations.RunPython.noop, elidable=True),
+    ]
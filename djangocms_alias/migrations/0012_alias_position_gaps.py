@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import F
+
+POSITION_GAP = 1024
+
+
+def space_out_positions(apps, schema_editor):
+    Alias = apps.get_model("djangocms_alias", "Alias")
+
+    db_alias = schema_editor.connection.alias
+    Alias.objects.using(db_alias).update(position=(F("position") + 1) * POSITION_GAP)
+
+
+def compact_positions(apps, schema_editor):
+    Alias = apps.get_model("djangocms_alias", "Alias")
+
+    db_alias = schema_editor.connection.alias
+    for category_id in Alias.objects.using(db_alias).values_list("category", flat=True).distinct():
+        aliases = Alias.objects.using(db_alias).filter(category=category_id).order_by("position", "pk")
+        for index, pk in enumerate(aliases.values_list("pk", flat=True)):
+            Alias.objects.using(db_alias).filter(pk=pk).update(position=index)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_alias", "0011_alias_usage_count"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="alias",
+            options={"ordering": ["position", "pk"], "verbose_name": "alias", "verbose_name_plural": "aliases"},
+        ),
+        migrations.RunPython(space_out_positions, compact_positions),
+    ]
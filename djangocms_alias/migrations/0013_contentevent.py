@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("djangocms_alias", "0012_alias_position_gaps"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentEvent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("object_id", models.PositiveBigIntegerField()),
+                ("action", models.CharField(choices=[("change", "change"), ("delete", "delete")], max_length=10)),
+                ("sender", models.CharField(blank=True, max_length=100)),
+                ("modified", models.DateTimeField(auto_now=True)),
+                (
+                    "content_type",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="contenttypes.contenttype"),
+                ),
+            ],
+            options={
+                "verbose_name": "content event",
+                "verbose_name_plural": "content events",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("content_type", "object_id"), name="djangocms_alias_content_event_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations
+
+
+def create_placeholders(apps, schema_editor):
+    from djangocms_alias.models import AliasContent as AliasContentModelClass
+
+    AliasContent = apps.get_model("djangocms_alias", "AliasContent")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Placeholder = apps.get_model("cms", "Placeholder")
+
+    default_slot_name = AliasContentModelClass.placeholder_slotname
+
+    db_alias = schema_editor.connection.alias
+    content_type = (
+        ContentType.objects.using(db_alias).filter(app_label="djangocms_alias", model="aliascontent").first()
+    )
+    if content_type is None:
+        return
+    existing = set(
+        Placeholder.objects.using(db_alias).filter(content_type=content_type).values_list("object_id", "slot")
+    )
+    contents = AliasContent._default_manager.using(db_alias).values_list("pk", "alias__static_code")
+    Placeholder.objects.using(db_alias).bulk_create(
+        (
+            Placeholder(content_type=content_type, object_id=content_id, slot=slot)
+            for content_id, static_code in contents
+            if (content_id, slot := static_code or default_slot_name) not in existing
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_alias", "0013_contentevent"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_placeholders, migrations.RunPython.noop, elidable=True),
+    ]
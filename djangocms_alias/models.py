@@ -1,31 +1,34 @@
-import operator
 from collections import defaultdict
 
 from cms.api import add_plugin
 from cms.models import CMSPlugin, Page, Placeholder
 from cms.models.fields import PlaceholderRelationField
-from cms.models.managers import ContentAdminManager, WithUserMixin
+from cms.models.managers import ContentAdminManager, ContentAdminQuerySet, WithUserMixin
 from cms.utils.permissions import get_model_permission_codename
 from cms.utils.plugins import copy_plugins_to_placeholder
 from cms.utils.urlutils import admin_reverse
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
 from django.core.exceptions import FieldDoesNotExist
 from django.db import models, transaction
-from django.db.models import F, Q
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.encoding import force_str
 from django.utils.functional import cached_property
 from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 from parler.models import TranslatableModel, TranslatedFields
 
-from .constants import CHANGE_ALIAS_URL_NAME, CHANGE_CATEGORY_URL_NAME
+from .constants import CHANGE_ALIAS_URL_NAME, CHANGE_CATEGORY_URL_NAME, DEFAULT_STATIC_ALIAS_CATEGORY_NAME
 
 __all__ = [
     "Category",
     "Alias",
     "AliasContent",
     "AliasPlugin",
+    "AliasDependency",
+    "SearchToken",
 ]
 
 
@@ -67,6 +70,112 @@ class Category(TranslatableModel):
         """Builds the url to the admin category change view"""
         return admin_reverse(CHANGE_CATEGORY_URL_NAME, args=[self.pk])
 
+    def lock(self) -> None:
+        """Locks the category until the end of the transaction, so that the
+        positions of aliases added to or moved within it are assigned one
+        after another."""
+        list(Category.objects.select_for_update().filter(pk=self.pk).order_by().values_list("pk", flat=True))
+
+    @classmethod
+    def get_static_alias_category(cls):
+        """Returns the category for aliases created for static_alias tags"""
+        # Parler's get_or_create doesn't work well with translations, so we must perform our own get or create
+        category = cls.objects.filter(translations__name=DEFAULT_STATIC_ALIAS_CATEGORY_NAME).first()
+        if not category:
+            category = cls.objects.create(name=DEFAULT_STATIC_ALIAS_CATEGORY_NAME)
+        return category
+
+
+def get_category_name(category_id, language):
+    """Returns an expression for the name of the category ``category_id``
+    (e.g. an ``OuterRef``) in ``language``, falling back to any of its names."""
+    translations = Category._parler_meta.root_model.objects.filter(master=category_id)
+    return Coalesce(
+        Subquery(translations.filter(language_code=language).values("name")[:1]),
+        Subquery(translations.order_by("language_code").values("name")[:1]),
+        models.Value(""),
+    )
+
+
+class AliasQuerySet(models.QuerySet):
+    def with_display_names(self, language=None):
+        """
+        Annotates each alias with the name (``display_name``) and the version
+        state (``display_state``, None without versioning) of its latest content
+        in ``language`` - or in any language if there is none - in the same SQL
+        statement. ``get_name`` and ``__str__`` use the annotations instead of
+        querying the contents and versions of each alias.
+        """
+        language = language or get_language()
+        contents = (
+            AliasContent.admin_manager.latest_content()
+            .filter(alias=OuterRef("pk"))
+            .order_by(models.Case(models.When(language=language, then=0), default=1), "pk")
+        )
+        try:
+            AliasContent._meta.get_field("versions")
+        except FieldDoesNotExist:
+            # Versioning is not enabled for aliases
+            state = models.Value(None, output_field=models.CharField())
+        else:
+            state = Subquery(contents.values("versions__state")[:1])
+        return self.annotate(
+            display_name=Subquery(contents.values("name")[:1]),
+            display_state=state,
+            display_language=models.Value(language, output_field=models.CharField()),
+        )
+
+    def with_plugin_count(self):
+        """Annotates each alias with the number of alias plugins using it
+        (``plugin_count``), counted from the plugins instead of ``usage_count``."""
+        return self.annotate(plugin_count=_count_alias_plugins())
+
+    def update_usage_counts(self) -> int:
+        """Recounts the alias plugins using each alias of the queryset in a
+        single UPDATE statement. Returns the number of aliases updated."""
+        return self.update(usage_count=_count_alias_plugins())
+
+    def get_next_position(self) -> int:
+        """Returns a position after the last alias of the queryset (e.g. of
+        the aliases of a category). Lock the category first (see
+        ``Category.lock``) so that concurrent transactions do not get the same
+        position."""
+        last_position = self.aggregate(last_position=models.Max("position"))["last_position"]
+        return (last_position or 0) + Alias.POSITION_GAP
+
+    def reorder(self, alias_ids) -> int:
+        """
+        Orders the aliases of the queryset as in ``alias_ids`` by giving them
+        evenly spaced positions in a single UPDATE statement. Aliases missing
+        in ``alias_ids`` keep their position, so pass all aliases of a
+        category. Returns the number of aliases updated.
+        """
+        from .cache import invalidate_select2_results
+
+        alias_ids = list(alias_ids)
+        if not alias_ids:
+            return 0
+        positions = [
+            models.When(pk=pk, then=models.Value(index * Alias.POSITION_GAP))
+            for index, pk in enumerate(alias_ids, start=1)
+        ]
+        updated = self.filter(pk__in=alias_ids).update(
+            position=models.Case(*positions, output_field=models.PositiveIntegerField())
+        )
+        # The alias picker is ordered by position, the update sends no signals
+        transaction.on_commit(invalidate_select2_results, using=self.db)
+        return updated
+
+    def rebalance(self) -> int:
+        """Evenly spaces the positions of the aliases of the queryset (e.g. of
+        a category) again, keeping their order."""
+        return self.reorder(self.order_by("position", "pk").values_list("pk", flat=True))
+
+
+def _count_alias_plugins():
+    plugins = AliasPlugin.objects.filter(alias=OuterRef("pk")).order_by().values("alias")
+    return Coalesce(Subquery(plugins.annotate(count=models.Count("pk")).values("count")), 0)
+
 
 class Alias(models.Model):
     CREATION_BY_TEMPLATE = "template"
@@ -75,6 +184,9 @@ class Alias(models.Model):
         (CREATION_BY_TEMPLATE, _("by template")),
         (CREATION_BY_CODE, _("by code")),
     )
+    # Positions are spaced out, so that an alias can be added or moved
+    # between two others without changing their positions
+    POSITION_GAP = 1024
     creation_method = models.CharField(
         verbose_name=_("creation_method"),
         choices=CREATION_METHODS,
@@ -100,11 +212,19 @@ class Alias(models.Model):
         help_text=_("To render the alias in templates."),
     )
     site = models.ForeignKey(Site, on_delete=models.CASCADE, null=True, blank=True)
+    usage_count = models.PositiveIntegerField(
+        verbose_name=_("usage count"),
+        default=0,
+        editable=False,
+        help_text=_("Number of alias plugins using the alias, kept up to date when alias plugins change."),
+    )
+
+    objects = AliasQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("alias")
         verbose_name_plural = _("aliases")
-        ordering = ["position"]
+        ordering = ["position", "pk"]
         unique_together = (("static_code", "site"),)  # Only restrict instances that have a site specified
 
     def __init__(self, *args, **kwargs):
@@ -121,9 +241,9 @@ class Alias(models.Model):
         """Show alias name for current language"""
         return self.get_name() or ""
 
-    @cached_property
+    @property
     def is_in_use(self):
-        return self.cms_plugins.exists()
+        return self.usage_count > 0
 
     def get_admin_change_url(self):
         return admin_reverse(CHANGE_ALIAS_URL_NAME, args=[self.pk])
@@ -131,6 +251,41 @@ class Alias(models.Model):
     @cached_property
     def objects_using(self):
         plugins = self.cms_plugins.select_related("placeholder").prefetch_related("placeholder__source")
+        objects, self._hidden_usages = self._get_objects_using(plugins)
+        return objects
+
+    @cached_property
+    def transitive_objects_using(self):
+        """Objects using the alias directly or through aliases including it.
+        Each object's ``usage_depth`` is 1 for direct usages, 2 for objects
+        using an alias which includes this alias, and so on."""
+        plugins = self.get_usage_plugins().select_related("placeholder").prefetch_related("placeholder__source")
+        objects, self._transitive_hidden_usages = self._get_objects_using(plugins)
+        return objects
+
+    def get_usage_plugins(self, transitive=True):
+        """
+        Returns a queryset of the alias plugins rendering this alias annotated
+        with their ``depth``: 1 for plugins referencing the alias, 2 for plugins
+        referencing an alias which includes this alias, and so on. The aliases
+        are found in the alias dependency graph.
+        """
+        if not transitive:
+            return self.cms_plugins.annotate(depth=models.Value(1))
+        from .dependencies import get_dependency_graph
+
+        depths = get_dependency_graph().get_including_depths(self.pk)
+        return AliasPlugin.objects.filter(alias__in=depths).annotate(
+            depth=models.Case(
+                *(models.When(alias_id=alias_id, then=models.Value(depth + 1)) for alias_id, depth in depths.items()),
+                output_field=models.PositiveIntegerField(),
+            )
+        )
+
+    @classmethod
+    def _get_objects_using(cls, plugins) -> tuple[list, list]:
+        """Returns the objects using the plugins and the placeholders of
+        plugins without a visible object."""
         # The prefetch fetches the placeholder sources in one query per content type
         sources_by_type = defaultdict(list)
         hidden_placeholders = {}
@@ -142,8 +297,9 @@ class Alias(models.Model):
                 # object to show, so the usage view lists them separately
                 hidden_placeholders.setdefault(plugin.placeholder_id, plugin.placeholder)
             else:
+                depth = getattr(plugin, "depth", 1)
+                obj.usage_depth = min(getattr(obj, "usage_depth", depth), depth)
                 sources_by_type[type(obj)].append(obj)
-        self._hidden_usages = list(hidden_placeholders.values())
 
         objects = set()
         contents_by_grouper = defaultdict(lambda: defaultdict(list))
@@ -175,14 +331,15 @@ class Alias(models.Model):
                 queryset = queryset.prefetch_related("pagecontent_set", "urls")
             groupers = list(queryset)
             if issubclass(grouper_model, Alias):
-                self._prefill_content_caches(groupers)
+                cls._prefill_content_caches(groupers)
             for grouper in groupers:
                 # The content objects through which this alias references the
                 # grouper - they exist even when the grouper has no URL in the
                 # current language (e.g. unpublished or untranslated pages)
                 grouper._using_contents = contents_by_id[grouper.pk]
+                grouper.usage_depth = min(content.usage_depth for content in grouper._using_contents)
                 objects.add(grouper)
-        return list(objects)
+        return list(objects), list(hidden_placeholders.values())
 
     @staticmethod
     def _prefill_content_caches(aliases):
@@ -201,18 +358,27 @@ class Alias(models.Model):
             alias._content_cache.setdefault(language, None)
 
     def get_name(self, language=None):
-        content = self.get_content(language, show_draft_content=True)
-        if not content:
-            content = next(iter(self._content_cache.values()), None)
-        name = getattr(content, "name", f"Alias {self.pk} (No content)")
+        if getattr(self, "display_language", None) == (language or get_language()):
+            # Annotated by AliasQuerySet.with_display_names
+            if self.display_name is None:
+                return f"Alias {self.pk} (No content)"
+            name, state = self.display_name, self.display_state
+        else:
+            content = self.get_content(language, show_draft_content=True)
+            if not content:
+                content = next(iter(self._content_cache.values()), None)
+            name = getattr(content, "name", f"Alias {self.pk} (No content)")
+            try:
+                state = content.versions.first().state
+            except AttributeError:
+                # djangocms-versioning not installed or no content
+                state = None
         try:
             from djangocms_versioning.constants import DRAFT
 
-            version = content.versions.first()
-
-            if version.state == DRAFT:
+            if state == DRAFT:
                 return f"{name} (Not published)"
-        except (ImportError, ModuleNotFoundError, AttributeError):
+        except (ImportError, ModuleNotFoundError):
             # djangocms-versioning not installed
             pass
         return name
@@ -261,44 +427,86 @@ class Alias(models.Model):
         self._content_cache = {}
         self._content_languages_cache = []
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            self.category.lock()
+            self.position = self.category.aliases.get_next_position()
+            return super().save(*args, **kwargs)
+
     @transaction.atomic
-    def delete(self, *args, **kwargs):
-        super().delete(*args, **kwargs)
-        self.category.aliases.filter(position__gt=self.position).update(
-            position=F("position") - 1,
-        )
+    def _set_position(self, index):
+        """
+        Moves the alias to ``index`` in the order of the aliases of its
+        category. Only the alias itself is updated - unless there is no free
+        position left between its new neighbours, then the positions of the
+        category are spaced out first.
+        """
+        self.category.lock()
+        siblings = self.category.aliases.exclude(pk=self.pk).order_by("position", "pk")
+        while True:
+            if index > 0:
+                positions = list(siblings.values_list("position", flat=True)[index - 1 : index + 1])
+                if not positions:
+                    position = siblings.get_next_position()
+                    break
+                before, after = positions[0], positions[1] if len(positions) > 1 else None
+            else:
+                before, after = 0, siblings.values_list("position", flat=True).first()
 
-    def save(self, *args, **kwargs):
-        if self._state.adding:
-            self.position = self.category.aliases.count()
-        return super().save(*args, **kwargs)
-
-    def _set_position(self, position):
-        previous_position = self.position
-
-        if previous_position > position:  # moving up
-            op = operator.add
-            position_range = (position, previous_position)
-        else:  # moving down
-            op = operator.sub
-            position_range = (previous_position, position)
-
-        filters = [
-            ~Q(pk=self.pk),
-            Q(position__range=position_range),
-        ]
+            if after is None:
+                position = before + self.POSITION_GAP
+                break
+            if after - before > 1:
+                position = (before + after) // 2
+                break
+            self.category.aliases.rebalance()
 
         self.position = position
-        self.save()
-        self.category.aliases.filter(*filters).update(position=op(F("position"), 1))  # noqa: E501
+        self.save(update_fields=["position"])
+
+
+class AliasContentQuerySet(models.QuerySet):
+    def with_placeholder(self):
+        """Loads the alias and prefetches the placeholder of each content, so
+        that accessing ``placeholder`` of N contents costs one query, not N."""
+        return self.select_related("alias").prefetch_related("placeholders")
+
+    def create_missing_placeholders(self) -> list:
+        """Creates the placeholders of the contents which do not have one yet,
+        e.g. contents bulk-created or created before placeholders were created
+        together with their content. Returns the created placeholders."""
+        content_type = ContentType.objects.get_for_model(self.model)
+        contents = {content.pk: content for content in self.select_related("alias")}
+        existing = set(
+            Placeholder.objects.filter(content_type=content_type, object_id__in=contents).values_list(
+                "object_id", "slot"
+            )
+        )
+        missing = [
+            Placeholder(content_type=content_type, object_id=content.pk, slot=slot)
+            for content in contents.values()
+            if (content.pk, slot := content.get_placeholder_slot()) not in existing
+        ]
+        return Placeholder.objects.bulk_create(missing)
 
 
-class AliasContentManager(WithUserMixin, models.Manager):
+class AliasContentManager(WithUserMixin, models.Manager.from_queryset(AliasContentQuerySet)):
     """Adds with_user syntax to AliasContent w/o using versioning"""
 
     pass
 
 
+class AliasContentAdminQuerySet(AliasContentQuerySet, ContentAdminQuerySet):
+    pass
+
+
+class AliasContentAdminManager(ContentAdminManager.from_queryset(AliasContentAdminQuerySet)):
+    def get_queryset(self):
+        return AliasContentAdminQuerySet(self.model, using=self._db)
+
+
 def can_change_alias(placeholder, user):
     permission = get_model_permission_codename(AliasContent, "change")
     return user.has_perm(permission)
@@ -322,7 +530,7 @@ class AliasContent(models.Model):
     )
 
     objects = AliasContentManager()
-    admin_manager = ContentAdminManager()  # Manager with latest_content
+    admin_manager = AliasContentAdminManager()  # Manager with latest_content
 
     class Meta:
         verbose_name = _("alias content")
@@ -331,24 +539,54 @@ class AliasContent(models.Model):
     def __str__(self):
         return f"{self.name} ({self.language})"
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            # Create the placeholder right away, so that looking it up never writes
+            placeholder = self.placeholders.create(slot=self.get_placeholder_slot())
+            placeholder.source = self
+            self.__dict__["placeholder"] = placeholder
+
+    def get_placeholder_slot(self):
+        return self.alias.static_code or self.placeholder_slotname
+
     @cached_property
     def placeholder(self):
-        placeholder = self.placeholders.get_or_create(slot=self.alias.static_code or self.placeholder_slotname)[0]
-        placeholder.source = self
+        """The placeholder of the content, or None for contents created
+        without it (see the ``create_alias_placeholders`` command). Uses the
+        placeholders prefetched by ``with_placeholder`` if available."""
+        slot = self.get_placeholder_slot()
+        if "placeholders" in getattr(self, "_prefetched_objects_cache", {}):
+            placeholder = next(
+                (placeholder for placeholder in self.placeholders.all() if placeholder.slot == slot), None
+            )
+        else:
+            placeholder = self.placeholders.filter(slot=slot).first()
+        if placeholder is not None:
+            placeholder.source = self
         return placeholder
 
     def get_placeholders(self):
-        return [self.placeholder]
+        return [self.placeholder] if self.placeholder else []
 
     def get_template(self):
         return None
 
     def get_placeholder_slots(self):
         """Returns a list of placeholder slots used by this content."""
-        return [self.placeholder.slot]
+        return [self.get_placeholder_slot()]
 
     @transaction.atomic
     def populate(self, replaced_placeholder=None, replaced_plugin=None, plugins=None):
+        from .cache import invalidate_plugin_snapshots
+
+        new_plugin = self._populate(replaced_placeholder, replaced_plugin, plugins)
+        # Plugins are copied and moved without sending signals
+        invalidate_plugin_snapshots([self.placeholder.pk])
+        return new_plugin
+
+    def _populate(self, replaced_placeholder=None, replaced_plugin=None, plugins=None):
         if not replaced_placeholder and not replaced_plugin:
             copy_plugins_to_placeholder(
                 plugins,
@@ -391,7 +629,10 @@ def copy_alias_content(original_content):
     """Copy the AliasContent object and deepcopy its
     placeholders and plugins
 
-    This is needed for versioning integration.
+    This is needed for versioning integration. Plugins are copied with
+    ``copy_plugins_to_placeholder``, so their ``save()`` methods and model
+    signals run, see :func:`djangocms_alias.copying.copy_alias_contents`
+    for copying many contents at once.
     """
     # Copy content object
     content_fields = {
@@ -405,19 +646,17 @@ def copy_alias_content(original_content):
     # Copy placeholders
     new_placeholders = []
     for placeholder in original_content.placeholders.all():
-        placeholder_fields = {
-            field.name: getattr(placeholder, field.name)
-            for field in Placeholder._meta.fields
-            # don't copy primary key because we're creating a new obj
-            # and handle the source field later
-            if field.name not in [Placeholder._meta.pk.name, "source"]
-        }
-        if placeholder.source:
-            placeholder_fields["source"] = new_content
-        new_placeholder = Placeholder.objects.create(**placeholder_fields)
+        if placeholder.slot == new_content.placeholder.slot:
+            # Created together with the content
+            new_placeholder = new_content.placeholder
+        else:
+            new_placeholder = Placeholder.objects.create(
+                slot=placeholder.slot,
+                default_width=placeholder.default_width,
+            )
+            new_placeholders.append(new_placeholder)
         # Copy plugins
         placeholder.copy_plugins(new_placeholder)
-        new_placeholders.append(new_placeholder)
     new_content.placeholders.add(*new_placeholders)
 
     return new_content
@@ -445,12 +684,100 @@ class AliasPlugin(CMSPlugin):
         return force_str(self.alias.name)
 
     def is_recursive(self, language=None):
-        # When versioning is enabled it will only get published content
-        # placeholder. If does not exist, then None.
-        placeholder = self.alias.get_placeholder(language)
+        """Returns True if rendering this plugin would render the alias
+        containing it again. Answered from the alias dependency graph."""
+        from .dependencies import get_dependency_graph
 
-        plugins = AliasPlugin.objects.filter(
-            placeholder_id=placeholder,
-        )
-        plugins = plugins.filter(Q(pk=self) | Q(alias__contents__placeholders=placeholder))
-        return plugins.exists()
+        alias_id = getattr(self.placeholder.source, "alias_id", None)
+        if alias_id is None:
+            return False
+        return alias_id == self.alias_id or get_dependency_graph().is_cyclic(alias_id, self.alias_id)
+
+
+class AliasDependency(models.Model):
+    """Edge of the alias dependency graph: The content of ``alias`` includes
+    ``included_alias`` through the alias plugin ``plugin``. Maintained by
+    :func:`djangocms_alias.dependencies.update_dependencies`."""
+
+    plugin = models.OneToOneField(
+        AliasPlugin,
+        on_delete=models.CASCADE,
+        related_name="dependency",
+    )
+    alias = models.ForeignKey(
+        Alias,
+        on_delete=models.CASCADE,
+        related_name="dependencies",
+    )
+    included_alias = models.ForeignKey(
+        Alias,
+        on_delete=models.CASCADE,
+        related_name="dependents",
+    )
+
+    class Meta:
+        verbose_name = _("alias dependency")
+        verbose_name_plural = _("alias dependencies")
+
+    def __str__(self):
+        return f"{self.alias_id} -> {self.included_alias_id}"
+
+
+class SearchToken(models.Model):
+    """A normalized word of the name of an alias content, an alias' static
+    code (with an empty ``language``) or a category translation. Maintained
+    by :mod:`djangocms_alias.search`."""
+
+    alias = models.ForeignKey(
+        Alias,
+        on_delete=models.CASCADE,
+        related_name="search_tokens",
+        null=True,
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name="search_tokens",
+        null=True,
+    )
+    language = models.CharField(max_length=10, blank=True)
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = _("search token")
+        verbose_name_plural = _("search tokens")
+        indexes = [models.Index(fields=["language", "token"], name="djangocms_alias_search_idx")]
+
+    def __str__(self):
+        return self.token
+
+
+class ContentEvent(models.Model):
+    """A change or deletion of an object waiting in the outbox to be sent to
+    djangocms-internalsearch by the ``send_content_events`` command, see
+    :func:`djangocms_alias.utils.emit_content_change`. Only the last event of
+    each object is kept."""
+
+    CHANGE = "change"
+    DELETE = "delete"
+    ACTIONS = (
+        (CHANGE, _("change")),
+        (DELETE, _("delete")),
+    )
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    # Label of the model sending the event, e.g. "djangocms_alias.category"
+    sender = models.CharField(max_length=100, blank=True)
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _("content event")
+        verbose_name_plural = _("content events")
+        constraints = [
+            models.UniqueConstraint(fields=["content_type", "object_id"], name="djangocms_alias_content_event_uniq")
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.content_type_id}:{self.object_id}"
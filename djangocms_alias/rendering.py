@@ -1,24 +1,29 @@
+import hashlib
 import os
-from functools import cache
-from typing import TYPE_CHECKING
 
-from cms.models import Placeholder
 from cms.plugin_rendering import BaseRenderer
-from cms.utils.placeholder import _get_nodelist, _scan_placeholders
+from cms.utils import get_language_from_request
+from cms.utils.placeholder import _get_nodelist, _scan_placeholders, get_context
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 from django.http import HttpRequest
+from django.template import TemplateDoesNotExist
 from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode, IncludeNode
 from django.template.response import TemplateResponse
 from django.utils.safestring import mark_safe
 
-from djangocms_alias.templatetags.djangocms_alias_tags import StaticAlias, _static_alias_editing_enabled
+from djangocms_alias.templatetags.djangocms_alias_tags import (
+    DeclaredStaticAlias,
+    StaticAlias,
+    _static_alias_editing_enabled,
+)
 
-from .models import Alias, AliasContent
-
-if TYPE_CHECKING:
-    from djangocms_alias.templatetags.djangocms_alias_tags import DeclaredStaticAlias
+from .cache import get_declarations_cache, invalidate_declarations, set_declarations_cache
+from .metrics import measure_render
+from .models import AliasContent
+from .resolver import StaticAliasResolver
 
 
 def render_alias_content(request: HttpRequest, alias_content: AliasContent) -> TemplateResponse:
@@ -35,22 +40,136 @@ def render_alias_content(request: HttpRequest, alias_content: AliasContent) -> T
     return TemplateResponse(request, templates, context)
 
 
-def get_declared_static_aliases(template: str) -> list["DeclaredStaticAlias"]:
-    """Scan a template for static_alias declarations.
-    Returns a list of DeclaredStaticAlias namedtuples.
+def get_published_alias_etag(alias, language: str, template: str) -> str:
+    """
+    Returns a strong ETag of the rendered published content of an alias and of
+    all aliases it includes, without rendering it. The ETag changes whenever a
+    different content version is published or a plugin of a published content
+    is added, changed, moved or deleted.
+
+    The plugin tree (placeholder, parent and position of each plugin) is part
+    of the ETag since moving plugins does not change their ``changed_date``.
+    No modification time is derived from the plugins: the latest change date
+    of the remaining plugins neither moves forward when an older plugin is
+    deleted nor when a version is unpublished or reverted.
+    """
+    from cms.models import CMSPlugin
+
+    from .dependencies import get_dependency_graph
+
+    alias_ids = {alias.pk, *get_dependency_graph().get_included_alias_ids(alias.pk)}
+    content_ids = sorted(
+        AliasContent.objects.filter(alias__in=alias_ids, language=language).values_list("pk", flat=True)
+    )
+    plugins = (
+        CMSPlugin.objects.filter(
+            placeholder__content_type=ContentType.objects.get_for_model(AliasContent),
+            placeholder__object_id__in=content_ids,
+            language=language,
+        )
+        .order_by("pk")
+        .values_list("pk", "placeholder_id", "parent_id", "position", "changed_date")
+    )
+    token = ":".join(
+        [
+            str(alias.pk),
+            language,
+            template,
+            ",".join(map(str, content_ids)),
+            ";".join(
+                f"{pk},{placeholder_id},{parent_id or ''},{position},{changed_date.isoformat()}"
+                for pk, placeholder_id, parent_id, position, changed_date in plugins
+            ),
+        ]
+    )
+    return f'"{hashlib.sha256(token.encode()).hexdigest()}"'
+
+
+def scan_static_aliases(template: str) -> list[DeclaredStaticAlias]:
+    """Scan a template (including the templates it extends or includes) for
+    static_alias declarations regardless of whether static alias editing is
+    enabled. Returns a list of DeclaredStaticAlias namedtuples.
     """
-    if _static_alias_editing_enabled is False:
-        return []
     compiled_template = get_template(template)
     nodes = _scan_placeholders((_get_nodelist(compiled_template)), node_class=StaticAlias)
     placeholders = [node.get_declaration() for node in nodes]
     return [placeholder for placeholder in placeholders if placeholder.static_code]
 
 
-if settings.DEBUG is False or "PYTEST_VERSION" in os.environ:
-    # Cache in production only, so template changes in development
-    # are always reflected without needing a server restart
-    get_declared_static_aliases = cache(get_declared_static_aliases)
+def _get_template_files(compiled_template, files=None) -> dict:
+    """Returns the modification times of the file of a compiled template and
+    of the templates it extends or includes by name."""
+    files = {} if files is None else files
+    name = compiled_template.origin.name
+    if name in files:
+        return files
+    files[name] = os.path.getmtime(name) if os.path.isfile(name) else None
+    nodelist = _get_nodelist(compiled_template)
+    for node in nodelist.get_nodes_by_type(ExtendsNode):
+        _get_template_files(node.get_parent(get_context()), files)
+    for node in nodelist.get_nodes_by_type(IncludeNode):
+        included = getattr(node.template, "var", None)
+        if isinstance(included, str):
+            try:
+                _get_template_files(get_template(included), files)
+            except TemplateDoesNotExist:
+                pass
+    return files
+
+
+def _scan_declarations(template: str) -> dict:
+    return {
+        "declarations": [tuple(declaration) for declaration in scan_static_aliases(template)],
+        "files": _get_template_files(get_template(template)),
+    }
+
+
+def _is_current(entry: dict) -> bool:
+    return all(
+        (os.path.getmtime(name) if os.path.isfile(name) else None) == mtime for name, mtime in entry["files"].items()
+    )
+
+
+# This process' copy of the static alias declaration registry
+_declarations = {}
+
+
+def get_static_alias_declarations(template: str) -> list[DeclaredStaticAlias]:
+    """
+    Returns the static alias declarations of a template from the declaration
+    registry shared by all processes through the cache. Templates missing from
+    the registry are scanned and added. Each process checks a registry entry
+    against the modification times of the template files once, so templates
+    changed by a deployment are scanned again by the first new process. With
+    ``DEBUG``, a template is scanned again whenever the file of it or of a
+    template it extends or includes changes.
+    """
+    entry = _declarations.get(template)
+    # Templates only change with a deployment, which restarts the processes
+    if entry is None or (settings.DEBUG and not _is_current(entry)):
+        generation, entry = get_declarations_cache(template)
+        if entry is None or not _is_current(entry):
+            entry = _scan_declarations(template)
+            set_declarations_cache(generation, template, entry)
+        _declarations[template] = entry
+    return [DeclaredStaticAlias(*declaration) for declaration in entry["declarations"]]
+
+
+def collect_static_alias_declarations(templates) -> dict:
+    """Scans the templates and replaces the declaration registry by their
+    declarations. Returns the declarations of each template."""
+    invalidate_declarations()
+    _declarations.clear()
+    return {template: get_static_alias_declarations(template) for template in templates}
+
+
+def get_declared_static_aliases(template: str) -> list[DeclaredStaticAlias]:
+    """Scan a template for static_alias declarations editable in the structure board.
+    Returns a list of DeclaredStaticAlias namedtuples.
+    """
+    if _static_alias_editing_enabled is False:
+        return []
+    return get_static_alias_declarations(template)
 
 
 def render_alias_structure_js(context: dict, renderer: BaseRenderer, obj: models.Model) -> str:
@@ -58,38 +177,30 @@ def render_alias_structure_js(context: dict, renderer: BaseRenderer, obj: models
 
     # 1. get template, bail early
     template = getattr(obj, "get_template", lambda: None)()
-    if not template:
+    if not template or request is None:
         return ""
 
     # 2. resolve language once
-    lang = getattr(getattr(request, "toolbar", None), "request_language", None)
+    lang = getattr(getattr(request, "toolbar", None), "request_language", None) or get_language_from_request(request)
 
     # 3. scan for declarations
     declared = get_declared_static_aliases(template)
     if not declared:
         return ""
 
-    # 4. build Q() in two grouped filters (site vs no‐site)
-    site_codes = [a.static_code for a in declared if a.site]
-    nosite_codes = [a.static_code for a in declared if not a.site]
-    q_parts = models.Q(static_code__in=site_codes, site=renderer.current_site) if site_codes else models.Q()
-    if nosite_codes:
-        q_parts |= models.Q(static_code__in=nosite_codes, site__isnull=True)
-    alias_qs = Alias.objects.filter(q_parts)
-
-    # 5. fetch AliasContent PKs & map CMS Placeholder by slot
-    content_ct = ContentType.objects.get_for_model(AliasContent)
-    alias_pks = AliasContent.admin_manager.current_content(alias__in=alias_qs).values_list("pk", flat=True)
-    placeholders = {ph.slot: ph for ph in Placeholder.objects.filter(content_type=content_ct, object_id__in=alias_pks)}
+    # 4. resolve all declared aliases and their placeholders in bulk
+    resolver = StaticAliasResolver.for_request(request, lang, show_draft_content=True)
+    resolver.load([(decl.static_code, decl.site) for decl in declared])
 
-    # 6. render into JS array
+    # 5. render into JS array
     js_parts = []
     for decl in declared:
-        ph = placeholders.get(decl.static_code)
+        ph = resolver.get_placeholder(decl.static_code, site=decl.site)
         if not ph:
             continue
         ph.is_static = True
-        js_parts.append(renderer.render_placeholder(ph, lang, obj))
+        with measure_render("structure", decl.static_code, lang):
+            js_parts.append(renderer.render_placeholder(ph, lang, obj))
     return "\n".join(js_parts)
 
 
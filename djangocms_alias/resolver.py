@@ -0,0 +1,279 @@
+from collections import defaultdict
+
+from cms.models import CMSPlugin, Placeholder
+from cms.plugin_pool import plugin_pool
+from cms.toolbar.utils import get_toolbar_from_request
+from cms.utils.plugins import assign_plugins, downcast_plugins, get_plugins_as_layered_tree
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
+from django.template import TemplateDoesNotExist
+
+from .cache import (
+    deserialize_plugins,
+    get_cache,
+    get_cache_timeout,
+    get_directory_generation,
+    get_fragment_keys,
+    get_plugin_snapshot_keys,
+    get_static_aliases,
+    is_fragment_cache_enabled,
+    is_plugin_snapshot_enabled,
+    serialize_plugins,
+    set_static_aliases,
+)
+from .models import Alias, AliasContent
+from .utils import get_current_site
+
+__all__ = [
+    "StaticAliasResolver",
+    "assign_published_plugins",
+    "build_plugin_snapshots",
+    "prefetch_alias_contents",
+    "prefetch_alias_plugins",
+]
+
+
+class StaticAliasResolver:
+    """
+    Resolves the static aliases rendered during one request in bulk.
+
+    The first lookup loads every static alias declared by the rendered template
+    together with its content, placeholder and plugins in a fixed number of
+    queries. Subsequent lookups are served from memory. There is one resolver
+    per request, language and draft mode.
+
+    Aliases, contents and placeholders are looked up in the shared static
+    alias directory (see :mod:`djangocms_alias.cache`) before the database.
+    """
+
+    def __init__(self, request, language, show_draft_content):
+        self.request = request
+        self.language = language
+        self.show_draft_content = show_draft_content
+        self.site = get_current_site(request)
+        self._aliases = {}
+        self._scanned_templates = set()
+
+    @classmethod
+    def for_request(cls, request, language, show_draft_content):
+        resolvers = request.__dict__.setdefault("_static_alias_resolvers", {})
+        key = (language, show_draft_content)
+        if key not in resolvers:
+            resolvers[key] = cls(request, language, show_draft_content)
+        return resolvers[key]
+
+    def _get_key(self, static_code, site):
+        return static_code, self.site.pk if site else None
+
+    def get(self, static_code, site=False, template=None):
+        """Returns the alias for the static code or None if it does not exist.
+        Loads all static aliases declared in ``template`` on the first miss."""
+        key = self._get_key(static_code, site)
+        if key not in self._aliases:
+            self.load([(static_code, site), *self._get_declarations(template)])
+        return self._aliases.get(key)
+
+    def get_placeholder(self, static_code, site=False):
+        """Returns the placeholder of a loaded static alias without creating it."""
+        alias = self._aliases.get(self._get_key(static_code, site))
+        content = alias._content_cache.get(self.language) if alias else None
+        return content.__dict__.get("placeholder") if content else None
+
+    def add(self, alias, site=False):
+        """Registers an alias created during rendering."""
+        self._aliases[self._get_key(alias.static_code, site)] = alias
+
+    def _get_declarations(self, template):
+        if not template or template in self._scanned_templates:
+            return []
+        self._scanned_templates.add(template)
+
+        from .rendering import get_static_alias_declarations
+
+        try:
+            return [
+                (declaration.static_code, declaration.site) for declaration in get_static_alias_declarations(template)
+            ]
+        except TemplateDoesNotExist:
+            return []
+
+    def load(self, declarations):
+        keys = {self._get_key(static_code, site) for static_code, site in declarations} - self._aliases.keys()
+        if not keys:
+            return
+
+        # Consult the shared static alias directory first
+        generation = get_directory_generation()
+        aliases = get_static_aliases(generation, keys, self.language, self.show_draft_content)
+        if missing := keys - aliases.keys():
+            fetched = self._fetch(missing)
+            set_static_aliases(generation, fetched, self.language, self.show_draft_content)
+            aliases.update(fetched)
+        self._aliases.update(aliases)
+        self._assign_plugins([alias for alias in aliases.values() if alias])
+
+    def _fetch(self, keys):
+        """Loads the aliases for the keys from the database together with
+        their content for the current language and its placeholder."""
+        site_codes = [static_code for static_code, site_id in keys if site_id]
+        nosite_codes = [static_code for static_code, site_id in keys if not site_id]
+        query = Q(static_code__in=site_codes, site=self.site) if site_codes else Q()
+        if nosite_codes:
+            query |= Q(static_code__in=nosite_codes, site__isnull=True)
+        aliases = {(alias.static_code, alias.site_id): alias for alias in Alias.objects.filter(query)}
+        if not aliases:
+            return dict.fromkeys(keys)
+
+        prefetch_alias_contents(aliases.values(), self.language, self.show_draft_content)
+        return {key: aliases.get(key) for key in keys}
+
+    def _assign_plugins(self, aliases):
+        fragment_templates = dict.fromkeys((alias.pk for alias in aliases), ["static"])
+        prefetch_alias_plugins(self.request, aliases, self.language, self.show_draft_content, fragment_templates)
+
+
+def prefetch_alias_contents(aliases, language, show_draft_content) -> None:
+    """Fills the content cache of the aliases for ``language`` and attaches
+    the contents' placeholders in two queries."""
+    aliases = [alias for alias in aliases if language not in alias._content_cache]
+    if not aliases:
+        return
+    if show_draft_content:
+        contents = AliasContent.admin_manager.filter(alias__in=aliases, language=language).latest_content()
+    else:
+        contents = AliasContent.objects.filter(alias__in=aliases, language=language)
+    contents_by_alias = {}
+    for content in contents:
+        contents_by_alias.setdefault(content.alias_id, content)
+
+    placeholders = Placeholder.objects.filter(
+        content_type=ContentType.objects.get_for_model(AliasContent),
+        object_id__in=[content.pk for content in contents_by_alias.values()],
+    )
+    placeholders_by_content = {(placeholder.object_id, placeholder.slot): placeholder for placeholder in placeholders}
+
+    for alias in aliases:
+        # Cache "no content" as None like get_content does
+        content = alias._content_cache.setdefault(language, contents_by_alias.get(alias.pk))
+        if content is None:
+            continue
+        content.alias = alias
+        placeholder = placeholders_by_content.get((content.pk, alias.static_code or content.placeholder_slotname))
+        if placeholder is not None:
+            # Otherwise AliasContent.placeholder looks it up, e.g. to return None
+            placeholder.source = content
+            content.__dict__["placeholder"] = placeholder
+
+
+def prefetch_alias_plugins(request, aliases, language, show_draft_content, fragment_templates=None) -> None:
+    """
+    Assigns the plugins of the aliases' placeholders in one go. Placeholders
+    served from the placeholder cache are skipped, as are published aliases
+    whose fragments are cached for all templates listed for them in
+    ``fragment_templates`` (a dict mapping alias ids to fragment templates).
+    """
+    renderer = get_toolbar_from_request(request).get_content_renderer()
+    use_cache = renderer.placeholder_cache_is_enabled()
+    if fragment_templates and not show_draft_content and use_cache and is_fragment_cache_enabled():
+        # Published aliases with a cached fragment are not rendered at all
+        fragment_keys = defaultdict(list)
+        for template in {template for templates in fragment_templates.values() for template in templates}:
+            alias_ids = [alias_id for alias_id, templates in fragment_templates.items() if template in templates]
+            for alias_id, fragment_key in get_fragment_keys(
+                alias_ids, language, renderer.current_site.pk, template
+            ).items():
+                fragment_keys[alias_id].append(fragment_key)
+        cached_fragments = get_cache().get_many([key for keys in fragment_keys.values() for key in keys])
+        aliases = [alias for alias in aliases if not set(fragment_keys[alias.pk]) <= cached_fragments.keys()]
+
+    placeholders_to_fetch = {}
+    for alias in aliases:
+        content = alias._content_cache.get(language)
+        placeholder = content.__dict__.get("placeholder") if content else None
+        if placeholder is None or hasattr(placeholder, "_plugins_cache"):
+            continue
+        # Same as the renderer's page preloading: do not fetch plugins
+        # for placeholders served from the placeholder cache
+        if (
+            use_cache
+            and placeholder.cache_placeholder
+            and renderer._get_cached_placeholder_content(placeholder, language) is not None
+        ):
+            continue
+        placeholders_to_fetch[placeholder.pk] = placeholder
+
+    if not placeholders_to_fetch:
+        return
+    if show_draft_content:
+        assign_plugins(request, placeholders_to_fetch.values(), lang=language)
+    else:
+        assign_published_plugins(request, placeholders_to_fetch.values(), language)
+
+
+def _restore_plugins(request, placeholder, plugins) -> None:
+    """Attaches the plugins restored from a snapshot to the placeholder like
+    :func:`cms.utils.plugins.assign_plugins` does."""
+    plugins_by_id = {plugin.pk: plugin for plugin in plugins}
+    for plugin in plugins:
+        plugin.placeholder = placeholder
+        if plugin.parent_id in plugins_by_id:
+            plugin._state.fields_cache["parent"] = plugins_by_id[plugin.parent_id]
+        plugin_class = plugin_pool.get_plugin(plugin.plugin_type)
+        if not plugin_class.cache and not plugin_class().get_cache_expiration(request, plugin, placeholder):
+            placeholder.cache_placeholder = False
+    placeholder._all_plugins_cache = plugins
+    placeholder._plugins_cache = get_plugins_as_layered_tree(plugins)
+
+
+def assign_published_plugins(request, placeholders, language) -> None:
+    """
+    Assigns the plugins of published alias content placeholders from their
+    plugin snapshots (see :mod:`djangocms_alias.cache`) without querying the
+    plugin tables. Placeholders without a snapshot get their plugins from the
+    database and their snapshot is stored.
+    """
+    placeholders = [placeholder for placeholder in placeholders if not hasattr(placeholder, "_plugins_cache")]
+    if not placeholders:
+        return
+    if not is_plugin_snapshot_enabled():
+        assign_plugins(request, placeholders, lang=language)
+        return
+
+    snapshot_keys = get_plugin_snapshot_keys([placeholder.pk for placeholder in placeholders], language)
+    snapshots = get_cache().get_many(snapshot_keys.values())
+    missing = []
+    for placeholder in placeholders:
+        plugins = deserialize_plugins(snapshots.get(snapshot_keys[placeholder.pk]))
+        if plugins is None:
+            missing.append(placeholder)
+        else:
+            _restore_plugins(request, placeholder, plugins)
+    if missing:
+        assign_plugins(request, missing, lang=language)
+        get_cache().set_many(
+            {
+                snapshot_keys[placeholder.pk]: serialize_plugins(placeholder._all_plugins_cache)
+                for placeholder in missing
+            },
+            timeout=get_cache_timeout(),
+        )
+
+
+def build_plugin_snapshots(placeholders, language) -> None:
+    """Stores the plugin snapshots of published alias content placeholders
+    ahead of their first render, e.g. when a version is published."""
+    if not placeholders or not is_plugin_snapshot_enabled():
+        return
+    placeholders = {placeholder.pk: placeholder for placeholder in placeholders}
+    snapshot_keys = get_plugin_snapshot_keys(placeholders, language)
+    plugins = CMSPlugin.objects.filter(placeholder__in=placeholders, language=language)
+    plugins_by_placeholder = {placeholder_id: [] for placeholder_id in placeholders}
+    for plugin in downcast_plugins(list(plugins), list(placeholders.values())):
+        plugins_by_placeholder[plugin.placeholder_id].append(plugin)
+    get_cache().set_many(
+        {
+            snapshot_keys[placeholder_id]: serialize_plugins(plugins)
+            for placeholder_id, plugins in plugins_by_placeholder.items()
+        },
+        timeout=get_cache_timeout(),
+    )
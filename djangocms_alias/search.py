@@ -0,0 +1,98 @@
+import re
+import unicodedata
+
+from .models import Alias, AliasContent, Category, SearchToken
+
+__all__ = [
+    "filter_aliases",
+    "filter_categories",
+    "tokenize",
+    "update_alias_tokens",
+    "update_category_tokens",
+]
+
+MAX_TOKEN_LENGTH = SearchToken._meta.get_field("token").max_length
+WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text) -> list:
+    """Splits a text into lower-case words without accents, e.g.
+    ``"Café Menü-Leiste"`` into ``["cafe", "menu", "leiste"]``."""
+    text = unicodedata.normalize("NFKD", str(text or "")).casefold()
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return list(dict.fromkeys(word[:MAX_TOKEN_LENGTH] for word in WORD_RE.findall(text)))
+
+
+def _get_matching_tokens(word, languages):
+    # A range instead of startswith lets every database backend use the
+    # (language, token) index - tokens only consist of normalized word
+    # characters, so all tokens starting with ``word`` sort below its successor
+    successor = word[:-1] + chr(ord(word[-1]) + 1)
+    return SearchToken.objects.filter(language__in=languages, token__gte=word, token__lt=successor)
+
+
+def filter_aliases(queryset, term, language):
+    """
+    Filters an alias queryset to aliases with a content name in ``language``
+    or a static code containing words starting with each word of ``term``,
+    e.g. "main me" finds "Main menu" and "Menu (main)".
+    """
+    for word in tokenize(term):
+        queryset = queryset.filter(
+            pk__in=_get_matching_tokens(word, [language, ""]).filter(alias__isnull=False).values("alias_id")
+        )
+    return queryset
+
+
+def filter_categories(queryset, term, language):
+    """Filters a category queryset to categories with a name in ``language``
+    containing words starting with each word of ``term``."""
+    for word in tokenize(term):
+        queryset = queryset.filter(
+            pk__in=_get_matching_tokens(word, [language]).filter(category__isnull=False).values("category_id")
+        )
+    return queryset
+
+
+def _replace_tokens(lookup, object_ids, tokens) -> None:
+    SearchToken.objects.filter(**{f"{lookup}__in": object_ids}).delete()
+    SearchToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+def update_alias_tokens(alias_ids) -> None:
+    """Rebuilds the search tokens of the aliases from the names of all their
+    contents (all versions) and their static codes."""
+    alias_ids = set(alias_ids)
+    if not alias_ids:
+        return
+    words = set()
+    for alias_id, language, name in AliasContent.admin_manager.filter(alias__in=alias_ids).values_list(
+        "alias_id", "language", "name"
+    ):
+        words.update((alias_id, language, word) for word in tokenize(name))
+    static_codes = Alias.objects.filter(pk__in=alias_ids, static_code__isnull=False).values_list("pk", "static_code")
+    for alias_id, static_code in static_codes:
+        words.update((alias_id, "", word) for word in tokenize(static_code))
+    _replace_tokens(
+        "alias",
+        alias_ids,
+        [SearchToken(alias_id=alias_id, language=language, token=word) for alias_id, language, word in words],
+    )
+
+
+def update_category_tokens(category_ids) -> None:
+    """Rebuilds the search tokens of the categories from their translated names."""
+    category_ids = set(category_ids)
+    if not category_ids:
+        return
+    translations = Category._parler_meta.root_model.objects.filter(master__in=category_ids)
+    words = {
+        (category_id, language, word)
+        for category_id, language, name in translations.values_list("master_id", "language_code", "name")
+        for word in tokenize(name)
+    }
+    _replace_tokens(
+        "category",
+        category_ids,
+        [SearchToken(category_id=category_id, language=language, token=word) for category_id, language, word in words],
+    )
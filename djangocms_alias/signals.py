@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after an alias has been rendered if DJANGOCMS_ALIAS_RENDER_METRICS is
+# enabled, with the AliasRender namedtuple as ``render`` argument
+alias_rendered = Signal()
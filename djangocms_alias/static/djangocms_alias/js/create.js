@@ -4,22 +4,34 @@
     const itemsPerPage = 30;
 
     function ajaxConfig(endpoint, extraData) {
+        // Cursors returned by the endpoint, by page number
+        const cursors = {};
+
         return {
             url: endpoint,
             dataType: 'json',
             delay: 250,
             data: function(params) {
+                const page = params.page || 1;
                 const data = {
                     term: params.term || '',
-                    page: params.page || 1,
+                    page: page,
                     limit: itemsPerPage,
                 };
+                if (page > 1 && cursors[page]) {
+                    data.cursor = cursors[page];
+                }
                 if (extraData) {
                     Object.assign(data, extraData());
                 }
                 return data;
             },
-            processResults: function(data) {
+            processResults: function(data, params) {
+                const page = params.page || 1;
+
+                if (data.cursor) {
+                    cursors[page + 1] = data.cursor;
+                }
                 return {
                     results: data.results,
                     pagination: { more: data.more },
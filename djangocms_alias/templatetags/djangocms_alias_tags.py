@@ -1,3 +1,4 @@
+import time
 from collections import ChainMap, namedtuple
 
 from classytags.arguments import Argument, ListValue, MultiValueArgument
@@ -5,15 +6,24 @@ from classytags.core import Tag
 from cms.templatetags.cms_tags import PlaceholderOptions
 from cms.toolbar.utils import get_object_preview_url, get_toolbar_from_request
 from cms.utils import get_language_from_request
+from cms.utils.conf import get_cms_setting
 from cms.utils.helpers import is_editable_model
-from cms.utils.placeholder import validate_placeholder_name
+from cms.utils.placeholder import restore_sekizai_context, validate_placeholder_name
 from cms.utils.urlutils import add_url_parameters, admin_reverse
 from django import template
 from django.conf import settings
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.timezone import now
 from django.utils.translation import get_language
+from sekizai.helpers import Watcher
 
-from ..constants import DEFAULT_STATIC_ALIAS_CATEGORY_NAME, USAGE_ALIAS_URL_NAME
-from ..models import Alias, AliasContent, Category
+from ..cache import get_cache, get_cache_timeout, get_fragment_keys, is_fragment_cache_enabled
+from ..constants import ALIAS_FRAGMENT_URL_NAME, USAGE_ALIAS_URL_NAME
+from ..metrics import measure_render, record_cache_use
+from ..models import Alias, AliasContent, AliasPlugin, Category
+from ..resolver import StaticAliasResolver, prefetch_alias_plugins
 from ..utils import get_current_site, is_versioning_enabled
 
 register = template.Library()
@@ -23,6 +33,10 @@ DeclaredStaticAlias = namedtuple("DeclaredStaticAlias", ["static_code", "site"])
 _static_alias_editing_enabled = getattr(settings, "STATIC_ALIAS_EDITING_ENABLED", True)
 
 
+def is_static_alias_read_only() -> bool:
+    return getattr(settings, "STATIC_ALIAS_READ_ONLY", False)
+
+
 @register.simple_tag(takes_context=False)
 def get_alias_usage_view_url(alias, **kwargs) -> str:
     url = admin_reverse(USAGE_ALIAS_URL_NAME, args=[alias.pk])
@@ -79,14 +93,99 @@ def model_name(obj) -> str:
     return obj._meta.model_name
 
 
+def get_published_alias_fragment(context, renderer, alias, language, template, cache_headers=False, **kwargs) -> dict:
+    """
+    Returns the rendered published content of an alias from the fragment cache
+    or renders it. The fragment is a dict holding the rendered ``content``, the
+    ``max_age`` in seconds it may be cached for and the request headers it
+    varies on (``vary``). Unless ``cache_headers`` is set, the latter two are
+    only computed when the fragment cache is enabled.
+
+    Rendered fragments are keyed by alias, language, site, ``template`` and the
+    alias' content version token. Placeholders containing plugins that must not
+    be cached or that vary the cache on request headers are never stored. The
+    fragment cache is bypassed whenever the renderer does not use the
+    placeholder cache (``CMS_PLACEHOLDER_CACHE`` disabled or staff users).
+    """
+    fragment_key = None
+    if is_fragment_cache_enabled() and renderer.placeholder_cache_is_enabled():
+        fragment_key = get_fragment_keys([alias.pk], language, renderer.current_site.pk, template)[alias.pk]
+        cached_value = get_cache().get(fragment_key)
+        record_cache_use(cached_value is not None)
+        if cached_value is not None:
+            restore_sekizai_context(context, cached_value["sekizai"])
+            max_age = max(int(cached_value["expires"] - time.time()), 0)
+            return {"content": mark_safe(cached_value["content"]), "max_age": max_age, "vary": []}
+
+    placeholder = alias.get_placeholder(language=language)
+    if not placeholder:
+        max_age = get_cms_setting("CACHE_DURATIONS")["content"]
+        if fragment_key:
+            get_cache().set(
+                fragment_key,
+                {"content": "", "sekizai": {}, "expires": time.time() + max_age},
+                timeout=min(max_age, get_cache_timeout() or max_age),
+            )
+        return {"content": "", "max_age": max_age, "vary": []}
+
+    # Restore the plugins from the snapshot of the published content
+    prefetch_alias_plugins(context["request"], [alias], language, show_draft_content=False)
+    watcher = Watcher(context) if fragment_key else None
+    content = renderer.render_placeholder(placeholder=placeholder, context=context, **kwargs) or ""
+    if not fragment_key and not cache_headers:
+        return {"content": content, "max_age": 0, "vary": []}
+    request = context["request"]
+    max_age = placeholder.get_cache_expiration(request, now())
+    vary = placeholder.get_vary_cache_on(request)
+    if fragment_key and max_age > 0 and not vary:
+        timeout = min(max_age, get_cache_timeout() or max_age)
+        get_cache().set(
+            fragment_key,
+            {"content": content, "sekizai": watcher.get_changes(), "expires": time.time() + timeout},
+            timeout=timeout,
+        )
+    return {"content": content, "max_age": max_age, "vary": vary}
+
+
+def render_published_alias(context, renderer, alias, language, template, **kwargs) -> str:
+    """Renders the published content of an alias through the fragment cache."""
+    return get_published_alias_fragment(context, renderer, alias, language, template, **kwargs)["content"]
+
+
+def is_esi_enabled() -> bool:
+    return getattr(settings, "DJANGOCMS_ALIAS_ESI_ENABLED", False)
+
+
+def render_esi_include(alias, language, site_id, template) -> str:
+    """Returns an Edge Side Include of the alias' fragment view, see
+    :func:`djangocms_alias.views.alias_fragment_view`."""
+    url = reverse(
+        ALIAS_FRAGMENT_URL_NAME,
+        kwargs={"site_id": site_id, "language": language, "pk": alias.pk, "template": template},
+    )
+    return format_html('<esi:include src="{}" />', url)
+
+
 @register.simple_tag(takes_context=True)
 def render_alias(context, instance) -> str:
+    with measure_render("plugin", instance.pk, get_language()):
+        return _render_alias(context, instance)
+
+
+def _render_alias(context, instance) -> str:
     request = context["request"]
 
     toolbar = get_toolbar_from_request(request)
     renderer = toolbar.get_content_renderer()
 
-    if source := instance.get_placeholder(show_draft_content=toolbar.edit_mode_active or toolbar.preview_mode_active):
+    if not (toolbar.edit_mode_active or toolbar.preview_mode_active):
+        plugin = context.get("instance")
+        template = f"plugin-{plugin.template if isinstance(plugin, AliasPlugin) else ''}"
+        if is_esi_enabled():
+            return render_esi_include(instance, get_language(), renderer.current_site.pk, template)
+        return render_published_alias(context, renderer, instance, get_language(), template)
+
+    if source := instance.get_placeholder(show_draft_content=True):
         content = renderer.render_placeholder(
             placeholder=source,
             context=context,
@@ -102,10 +201,12 @@ class StaticAlias(Tag):
 
     eg: {% static_alias "identifier_text" %}
     eg: {% static_alias "identifier_text" site %}
+    eg: {% static_alias "identifier_text" esi %}
 
     Keyword arguments:
     static_code -- the unique identifier of the Alias
     site -- If site is supplied an Alias instance will be created per site.
+    esi -- If esi is supplied the published content is rendered as an Edge Side Include.
     """
 
     name = "static_alias"
@@ -117,50 +218,44 @@ class StaticAlias(Tag):
         ],
     )
 
-    def _get_alias(self, request, static_code, extra_bits) -> Alias | None:
-        alias_filter_kwargs = {
-            "static_code": static_code,
-        }
-        # Site
-        current_site = get_current_site(request)
-        if "site" in extra_bits:
-            alias_filter_kwargs["site"] = current_site
-        else:
-            alias_filter_kwargs["site_id__isnull"] = True
-
-        # Try and find an Alias to render
-        alias = Alias.objects.filter(**alias_filter_kwargs).first()
+    def _get_alias(self, request, static_code, extra_bits, language, get_draft_content, template=None) -> Alias | None:
+        site = "site" in extra_bits
+        # Try and find an Alias to render - the resolver loads all static
+        # aliases declared in the template at once
+        resolver = StaticAliasResolver.for_request(request, language, get_draft_content)
+        alias = resolver.get(static_code, site=site, template=template)
+        if is_static_alias_read_only():
+            # Aliases are provisioned by the provision_static_aliases command
+            return alias
         # If there is no alias found we need to create one
         if not alias:
             # If versioning is enabled we can only create the records with a logged-in user / staff member
             if is_versioning_enabled() and not request.user.is_authenticated:
                 return None
 
-            # Parler's get_or_create doesn't work well with translations, so we must perform our own get or create
-            default_category = Category.objects.filter(translations__name=DEFAULT_STATIC_ALIAS_CATEGORY_NAME).first()
-            if not default_category:
-                default_category = Category.objects.create(name=DEFAULT_STATIC_ALIAS_CATEGORY_NAME)
+            default_category = Category.get_static_alias_category()
 
             alias_creation_kwargs = {
                 "static_code": static_code,
                 "creation_method": Alias.CREATION_BY_TEMPLATE,
             }
             # Site
-            if "site" in extra_bits:
-                alias_creation_kwargs["site"] = current_site
+            if site:
+                alias_creation_kwargs["site"] = get_current_site(request)
 
             alias = Alias.objects.create(category=default_category, **alias_creation_kwargs)
+            resolver.add(alias, site=site)
         if (
-            not alias.get_content(language=self.language, show_draft_content=self.get_draft_content)
+            not alias.get_content(language=language, show_draft_content=get_draft_content)
             and request.user.is_authenticated
-            and self.get_draft_content
+            and get_draft_content
         ):
             alias_content = AliasContent.objects.with_user(request.user).create(
                 alias=alias,
                 name=static_code,
-                language=self.language,
+                language=language,
             )
-            alias._content_cache[self.language] = alias_content
+            alias._content_cache[language] = alias_content
         return alias
 
     def render_tag(self, context, static_code, extra_bits, nodelist=None) -> str:
@@ -174,38 +269,53 @@ class StaticAlias(Tag):
 
         validate_placeholder_name(static_code)
 
-        self.language = get_language_from_request(request)
-        self.toolbar = get_toolbar_from_request(request)
+        # The node is shared by all threads rendering the (cached) template:
+        # keep the state of this rendering in local variables
+        language = get_language_from_request(request)
+        toolbar = get_toolbar_from_request(request)
         # Get draft contents in edit or preview mode?
-        self.get_draft_content = self.toolbar.edit_mode_active or self.toolbar.preview_mode_active
-
-        alias = self._get_alias(request, static_code, extra_bits)
-        if not alias:
-            return ""
-
-        placeholder = alias.get_placeholder(language=self.language, show_draft_content=self.get_draft_content)
-        if placeholder:
-            # Heuristic: treat this as nested/plugin rendering when "instance" is present in the context
-            is_nested = "instance" in context
-            editable = self.toolbar.edit_mode_active and placeholder.check_source(request.user)
-            renderer = self.toolbar.get_content_renderer()
-            content = renderer.render_placeholder(
-                placeholder=placeholder,
-                context=context,
-                nodelist=nodelist,
-                use_cache=True,
-                editable=editable and _static_alias_editing_enabled and not is_nested,
+        get_draft_content = toolbar.edit_mode_active or toolbar.preview_mode_active
+
+        with measure_render("static", static_code, language):
+            alias = self._get_alias(
+                request,
+                static_code,
+                extra_bits,
+                language,
+                get_draft_content,
+                template=getattr(context.template, "name", None),
             )
-            if self.toolbar.edit_mode_active and not editable and _static_alias_editing_enabled and not is_nested:
-                # Also non-editable placeholders need interactivity in the structure board
-                content += renderer.get_placeholder_toolbar_js(placeholder)
-            return content
-        return ""
+            if not alias:
+                return ""
+
+            if not get_draft_content and not nodelist:
+                # The fallback content of the nodelist belongs to the template, not the alias
+                renderer = toolbar.get_content_renderer()
+                if "esi" in extra_bits or is_esi_enabled():
+                    return render_esi_include(alias, language, renderer.current_site.pk, "static")
+                return render_published_alias(context, renderer, alias, language, "static", use_cache=True)
+
+            placeholder = alias.get_placeholder(language=language, show_draft_content=get_draft_content)
+            if placeholder:
+                # Heuristic: treat this as nested/plugin rendering when "instance" is present in the context
+                is_nested = "instance" in context
+                editable = toolbar.edit_mode_active and placeholder.check_source(request.user)
+                renderer = toolbar.get_content_renderer()
+                content = renderer.render_placeholder(
+                    placeholder=placeholder,
+                    context=context,
+                    nodelist=nodelist,
+                    use_cache=True,
+                    editable=editable and _static_alias_editing_enabled and not is_nested,
+                )
+                if toolbar.edit_mode_active and not editable and _static_alias_editing_enabled and not is_nested:
+                    # Also non-editable placeholders need interactivity in the structure board
+                    content += renderer.get_placeholder_toolbar_js(placeholder)
+                return content
+            return ""
 
     def get_declaration(self) -> DeclaredStaticAlias | None:
         """Used to identify static_alias declarations"""
-        if not _static_alias_editing_enabled:
-            return None
         static_code = str(self.kwargs["static_code"].var).strip('"').strip("'")
         site = False
         if isinstance(self.kwargs["extra_bits"], ListValue):
@@ -0,0 +1,17 @@
+from django.urls import path
+
+from . import views
+from .constants import ALIAS_FRAGMENT_URL_NAME, STATIC_ALIAS_FRAGMENT_URL_NAME
+
+urlpatterns = [
+    path(
+        "<int:site_id>/<str:language>/<int:pk>/<path:template>/",
+        views.alias_fragment_view,
+        name=ALIAS_FRAGMENT_URL_NAME,
+    ),
+    path(
+        "<int:site_id>/<str:language>/static/<str:static_code>/<path:template>/",
+        views.alias_fragment_view,
+        name=STATIC_ALIAS_FRAGMENT_URL_NAME,
+    ),
+]
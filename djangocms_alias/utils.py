@@ -1,6 +1,10 @@
+import threading
 from functools import cache
+from weakref import WeakValueDictionary
 
 from django.apps import apps
+from django.conf import settings
+from django.db import router, transaction
 
 
 def get_current_site(request):
@@ -41,39 +45,167 @@ def is_versioning_enabled() -> bool:
     return bool(getattr(cms_config, "versioning", False))
 
 
-def get_alias_usage_context(alias) -> dict:
-    """Common template context for the usage and delete confirmation views."""
+def get_alias_usage_context(alias, transitive=False) -> dict:
+    """Common template context for the usage and delete confirmation views.
+    If ``transitive`` also objects using the alias through other aliases are
+    listed together with their usage depth."""
     from cms.models import Page
 
     objects_list = sorted(
-        alias.objects_using,
-        # First show Pages on list
-        key=lambda obj: isinstance(obj, Page),
-        reverse=True,
+        alias.transitive_objects_using if transitive else alias.objects_using,
+        # First show Pages on list, then by usage depth
+        key=lambda obj: (not isinstance(obj, Page), getattr(obj, "usage_depth", 1)),
     )
     return {
         "objects_list": objects_list,
         # Usages without a visible object (e.g. clipboard content or orphaned
         # placeholders) - set by accessing objects_using above
-        "hidden_usages": getattr(alias, "_hidden_usages", []),
+        "hidden_usages": getattr(alias, "_transitive_hidden_usages" if transitive else "_hidden_usages", []),
+        "show_usage_depth": transitive,
     }
 
 
-def emit_content_change(objs, sender=None):
+def get_content_events_mode() -> str:
+    """``"on_commit"`` (default) sends content events once the transaction is
+    committed, ``"outbox"`` stores them for the ``send_content_events``
+    command."""
+    return getattr(settings, "DJANGOCMS_ALIAS_CONTENT_EVENTS", "on_commit")
+
+
+def get_content_event_emitters() -> dict | None:
+    """Returns functions sending the content events of a list of objects to
+    djangocms-internalsearch by action, or None if it is not installed."""
+    from .models import ContentEvent
+
     try:
-        from djangocms_internalsearch.helpers import emit_content_change
+        from djangocms_internalsearch.helpers import emit_content_change, emit_content_delete
     except ImportError:
+        return None
+
+    def get_emitter(emit):
+        # djangocms-internalsearch notifies its receivers of one object per call
+        def emit_objects(objs, sender=None):
+            for obj in objs:
+                emit(obj, sender=sender)
+
+        return emit_objects
+
+    return {
+        ContentEvent.CHANGE: get_emitter(emit_content_change),
+        ContentEvent.DELETE: get_emitter(emit_content_delete),
+    }
+
+
+def send_content_events(events) -> None:
+    """Sends ``(action, obj, sender)`` content events to djangocms-internalsearch
+    with one call per action and sender."""
+    emitters = get_content_event_emitters()
+    if emitters is None:
         return
+    objs_by_action = {}
+    for action, obj, sender in events:
+        objs_by_action.setdefault((action, sender), []).append(obj)
+    for (action, sender), objs in objs_by_action.items():
+        emitters[action](objs, sender=sender)
+
+
+class ContentEventQueue:
+    """The content events of an atomic block, sent when the transaction is
+    committed. Each object is sent once, with the last event emitted for it."""
+
+    def __init__(self, using):
+        self.using = using
+        self.events = {}
+
+    def add(self, action, objs, sender) -> None:
+        for obj in objs:
+            self.events[obj._meta.concrete_model, obj.pk] = (action, obj, sender)
+
+    def send(self) -> None:
+        # The first queue sent on commit sends the events of all blocks of the
+        # transaction that were not rolled back, in the order they were queued
+        events = {}
+        for key, queue in list(_content_event_queues.queues.items()):
+            if queue.using == self.using:
+                del _content_event_queues.queues[key]
+                events.update(queue.events)
+                queue.events = {}
+        send_content_events(events.values())
+
+
+class ContentEventQueues(threading.local):
+    def __init__(self):
+        # Queues by database and atomic block. Only the on_commit callback
+        # sending a queue keeps it alive: when its block is rolled back, the
+        # callback is dropped and so is the queue.
+        self.queues = WeakValueDictionary()
+
 
+# Like database connections, queues are per thread
+_content_event_queues = ContentEventQueues()
+
+
+def _get_content_event_queue(using) -> ContentEventQueue:
+    # Savepoint ids are not reused while the transaction is open
+    key = (using, tuple(transaction.get_connection(using).savepoint_ids))
+    queue = _content_event_queues.queues.get(key)
+    if queue is None:
+        queue = ContentEventQueue(using)
+        _content_event_queues.queues[key] = queue
+        transaction.on_commit(queue.send, using=using)
+    return queue
+
+
+def _store_content_events(action, objs, sender, using) -> None:
+    from django.contrib.contenttypes.models import ContentType
+
+    from .models import ContentEvent
+
+    events = {}
     for obj in objs:
-        emit_content_change(obj, sender=sender)
+        content_type = ContentType.objects.db_manager(using).get_for_model(obj, for_concrete_model=True)
+        events[content_type.pk, obj.pk] = ContentEvent(
+            content_type=content_type,
+            object_id=obj.pk,
+            action=action,
+            sender=sender._meta.label_lower if sender else "",
+        )
+    # The last event of each object replaces earlier ones still waiting
+    ContentEvent.objects.using(using).bulk_create(
+        events.values(),
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=["content_type", "object_id"],
+        update_fields=["action", "sender", "modified"],
+    )
 
 
-def emit_content_delete(objs, sender=None):
-    try:
-        from djangocms_internalsearch.helpers import emit_content_delete
-    except ImportError:
+def _emit_content_events(action, objs, sender) -> None:
+    if get_content_event_emitters() is None:
         return
+    objs = list(objs)
+    if not objs:
+        return
+    using = router.db_for_write(type(objs[0]))
+    if get_content_events_mode() == "outbox":
+        _store_content_events(action, objs, sender, using)
+    elif transaction.get_connection(using).in_atomic_block:
+        _get_content_event_queue(using).add(action, objs, sender)
+    else:
+        send_content_events((action, obj, sender) for obj in objs)
 
-    for obj in objs:
-        emit_content_delete(obj, sender=sender)
+
+def emit_content_change(objs, sender=None):
+    """Notifies djangocms-internalsearch of the changed objects when the
+    current transaction is committed (or stores the events in the outbox, see
+    ``get_content_events_mode``). Repeated events of an object are sent once."""
+    from .models import ContentEvent
+
+    _emit_content_events(ContentEvent.CHANGE, objs, sender)
+
+
+def emit_content_delete(objs, sender=None):
+    """Like ``emit_content_change`` for deleted objects."""
+    from .models import ContentEvent
+
+    _emit_content_events(ContentEvent.DELETE, objs, sender)
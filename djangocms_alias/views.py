@@ -1,16 +1,34 @@
+import hashlib
 import json
 
-from cms.toolbar.utils import get_plugin_toolbar_info
+from cms.toolbar.utils import get_plugin_toolbar_info, get_toolbar_from_request
+from cms.utils.i18n import force_language, get_language_list
+from django.core import signing
 from django.core.exceptions import PermissionDenied
-from django.db.models import Q
-from django.http import JsonResponse
-from django.shortcuts import render
+from django.db.models import Exists, F, OuterRef, Q
+from django.http import Http404, HttpResponse, HttpResponseBadRequest
+from django.shortcuts import get_object_or_404, render
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_response_headers,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
 from django.utils.translation import (
     get_language,
 )
+from django.views.decorators.http import require_safe
 from django.views.generic import ListView
+from sekizai.context import SekizaiContext
 
-from .models import Alias, Category
+from .cache import get_cache, get_fragment_last_modified, get_select2_cache_key, get_select2_cache_timeout
+from .metrics import render_metrics
+from .models import Alias, AliasContent, Category, get_category_name, get_templates
+from .rendering import get_published_alias_etag
+from .search import filter_aliases, filter_categories
+from .templatetags.djangocms_alias_tags import get_published_alias_fragment
+from .utils import get_current_site
 
 try:
     from cms.toolbar.utils import get_plugin_tree
@@ -65,30 +83,128 @@ def render_replace_response(request, new_plugins, source_placeholder=None, sourc
     return render(request, "djangocms_alias/alias_replace.html", context)
 
 
-class CategorySelect2View(ListView):
-    queryset = Category.objects.order_by("translations__name")
+class Select2ViewMixin:
+    """
+    Keyset pagination and response caching for the select2 views.
 
-    def get(self, request, *args, **kwargs):
-        self.object_list = self.get_queryset()
-        context = self.get_context_data()
-        return JsonResponse(
-            {
-                "results": [
-                    {
-                        "text": str(obj),
-                        "id": obj.pk,
-                    }
-                    for obj in context["object_list"]
-                ],
-                "more": context["page_obj"].has_next(),
-            }
-        )
+    Results are ordered by ``keyset_ordering``, which has to end with a unique
+    field. Each page links to the next one with an opaque ``cursor`` holding
+    the ordering values of its last result, so that any page is found through
+    the ordering instead of skipping all results before it.
+
+    Responses are cached for ``DJANGOCMS_ALIAS_SELECT2_CACHE_TIMEOUT`` seconds
+    per site, permission set, language and query and carry an ETag.
+    """
+
+    keyset_ordering = ()
+    default_page_size = 30
+    max_page_size = 100
+    cursor_salt = "djangocms_alias.select2"
 
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_staff:
             raise PermissionDenied
         return super().dispatch(request, *args, **kwargs)
 
+    def get(self, request, *args, **kwargs):
+        timeout = get_select2_cache_timeout()
+        if timeout:
+            cache_key = get_select2_cache_key(
+                self.get_cache_scope(), request.path, get_language(), sorted(request.GET.lists())
+            )
+            cached = get_cache().get(cache_key)
+        else:
+            cached = None
+
+        if cached is None:
+            try:
+                objects, more, cursor = self.get_page(self.get_queryset())
+            except signing.BadSignature:
+                return HttpResponseBadRequest("Invalid cursor")
+            content = json.dumps(
+                {
+                    "results": [self.get_result(obj) for obj in objects],
+                    "more": more,
+                    "cursor": cursor,
+                }
+            )
+            cached = (content, quote_etag(hashlib.sha256(content.encode()).hexdigest()))
+            if timeout:
+                get_cache().set(cache_key, cached, timeout)
+
+        content, etag = cached
+        response = HttpResponse(content, content_type="application/json")
+        response["ETag"] = etag
+        # Browsers may keep the response but have to revalidate it
+        patch_cache_control(response, private=True, no_cache=True)
+        return get_conditional_response(request, etag=etag, response=response)
+
+    def get_cache_scope(self):
+        """Identifies the results visible to the requesting user: responses
+        are shared by the users with the same permissions on the same site."""
+        user = self.request.user
+        # Superusers have all permissions
+        permissions = [] if user.is_superuser else sorted(user.get_all_permissions())
+        return [get_current_site(self.request).pk, user.is_superuser, permissions]
+
+    def get_result(self, obj):
+        return {
+            "text": str(obj),
+            "id": obj.pk,
+        }
+
+    def get_page_size(self):
+        try:
+            limit = int(self.request.GET.get("limit", self.default_page_size))
+        except (TypeError, ValueError):
+            limit = self.default_page_size
+        return max(1, min(limit, self.max_page_size))
+
+    def get_cursor(self):
+        cursor = self.request.GET.get("cursor")
+        if not cursor:
+            return None
+        values = signing.loads(cursor, salt=self.cursor_salt)
+        if not isinstance(values, list) or len(values) != len(self.keyset_ordering):
+            raise signing.BadSignature
+        return values
+
+    def get_page(self, queryset):
+        """Returns the results of the requested page, whether more results
+        follow and the cursor of the next page."""
+        limit = self.get_page_size()
+        queryset = queryset.order_by(*self.keyset_ordering)
+        cursor = self.get_cursor()
+        if cursor is not None:
+            after = Q()
+            for index, field in enumerate(self.keyset_ordering):
+                equal = dict(zip(self.keyset_ordering[:index], cursor[:index], strict=True))
+                after |= Q(**equal, **{f"{field}__gt": cursor[index]})
+            objects = list(queryset.filter(after)[: limit + 1])
+        else:
+            # Clients not sending a cursor page by number
+            try:
+                page = max(int(self.request.GET.get("page", 1)), 1)
+            except (TypeError, ValueError):
+                page = 1
+            offset = (page - 1) * limit
+            objects = list(queryset[offset : offset + limit + 1])
+
+        more = len(objects) > limit
+        objects = objects[:limit]
+        if more:
+            cursor = signing.dumps(
+                [getattr(objects[-1], field) for field in self.keyset_ordering], salt=self.cursor_salt
+            )
+        else:
+            cursor = None
+        return objects, more, cursor
+
+
+class CategorySelect2View(Select2ViewMixin, ListView):
+    queryset = Category.objects.all()
+    keyset_ordering = ("category_name", "pk")
+
     def get_queryset(self):
         """
         Only show Categories that have an Alias attached.
@@ -96,66 +212,39 @@ class CategorySelect2View(ListView):
         """
         term = self.request.GET.get("term")
         site = self.request.GET.get("site")
+        language = get_language()
         queryset = super().get_queryset()
-        # Only get categories that have aliases attached
-        queryset = queryset.filter(aliases__isnull=False)
 
         try:
             pk = int(self.request.GET.get("pk"))
         except (TypeError, ValueError):
             pk = None
 
-        q = Q()
-        if term:
-            q &= Q(translations__name__icontains=term)
+        # Only get categories that have aliases attached
+        aliases = Alias.objects.filter(category=OuterRef("pk"))
         if site:
-            q &= Q(aliases__site=site) | Q(aliases__site=None)
+            aliases = aliases.filter(Q(site=site) | Q(site=None))
+        translations = Category._parler_meta.root_model.objects.filter(master=OuterRef("pk"), language_code=language)
+        queryset = queryset.filter(Exists(aliases), Exists(translations))
+        if term:
+            queryset = filter_categories(queryset, term, language)
         if pk:
-            q &= Q(pk=pk)
-
-        return queryset.translated(get_language()).filter(q).distinct()
-
-    def get_paginate_by(self, queryset):
-        return self.request.GET.get("limit", 30)
-
+            queryset = queryset.filter(pk=pk)
+        return queryset.annotate(category_name=get_category_name(OuterRef("pk"), language))
 
-class AliasSelect2View(ListView):
-    queryset = Alias.objects.order_by("category__translations__name", "position")
 
-    def get(self, request, *args, **kwargs):
-        self.object_list = self.get_queryset()
-        context = self.get_context_data()
-        return JsonResponse(
-            {
-                "results": [
-                    {
-                        "text": str(obj),
-                        "id": obj.pk,
-                    }
-                    for obj in context["object_list"]
-                ],
-                "more": context["page_obj"].has_next(),
-            }
-        )
-
-    def dispatch(self, request, *args, **kwargs):
-        if not request.user.is_staff:
-            raise PermissionDenied
-        return super().dispatch(request, *args, **kwargs)
+class AliasSelect2View(Select2ViewMixin, ListView):
+    queryset = Alias.objects.all()
+    keyset_ordering = ("category_name", "position", "pk")
 
     def get_queryset(self):
         term = self.request.GET.get("term")
         category = self.request.GET.get("category")
         site = self.request.GET.get("site")
+        language = get_language()
         # Showing published and unpublished aliases
-        queryset = (
-            super()
-            .get_queryset()
-            .filter(
-                contents__language=get_language(),
-            )
-            .distinct()
-        )
+        contents = AliasContent.admin_manager.filter(alias=OuterRef("pk"), language=language)
+        queryset = super().get_queryset().filter(Exists(contents))
 
         try:
             pk = int(self.request.GET.get("pk"))
@@ -164,7 +253,7 @@ class AliasSelect2View(ListView):
 
         q = Q()
         if term:
-            q &= Q(contents__name__icontains=term)
+            queryset = filter_aliases(queryset, term, language)
         if category:
             q &= Q(category=category)
         if site:
@@ -172,7 +261,65 @@ class AliasSelect2View(ListView):
         if pk:
             q &= Q(pk=pk)
 
-        return queryset.filter(q).distinct()
+        # The results are labelled with the alias names
+        return (
+            queryset.filter(q)
+            .annotate(category_name=get_category_name(OuterRef("category_id"), language))
+            .with_display_names()
+        )
+
+
+@require_safe
+def alias_fragment_view(request, site_id, language, template, pk=None, static_code=None):
+    """
+    Renders the published content of an alias (by pk or static code) for an
+    Edge Side Include or a client-side include. The response carries its own
+    cache headers, so that pages including the alias can be cached
+    independently of it. Conditional requests (with the ETag or the
+    modification time) are answered with 304 Not Modified without rendering.
+    Assets added to sekizai blocks by the alias' plugins are not part of the
+    fragment.
+    """
+    site = get_current_site(request)
+    valid_templates = ["static"] + [f"plugin-{name}" for name, _label in get_templates()]
+    if site.pk != site_id or language not in get_language_list(site_id) or template not in valid_templates:
+        raise Http404
+    if pk is not None:
+        alias = get_object_or_404(Alias.objects.filter(Q(site=site) | Q(site__isnull=True)), pk=pk)
+    else:
+        # Site-bound static aliases take precedence like in {% static_alias code site %}
+        alias = (
+            Alias.objects.filter(Q(site=site) | Q(site__isnull=True), static_code=static_code)
+            .order_by(F("site").asc(nulls_last=True))
+            .first()
+        )
+        if alias is None:
+            raise Http404
+
+    # Answer conditional requests without rendering
+    etag = get_published_alias_etag(alias, language, template)
+    last_modified = get_fragment_last_modified(alias.pk, language, template, etag)
+    if response := get_conditional_response(request, etag=etag, last_modified=last_modified):
+        return response
+
+    with force_language(language):
+        renderer = get_toolbar_from_request(request).get_content_renderer()
+        context = SekizaiContext({"request": request})
+        fragment = get_published_alias_fragment(context, renderer, alias, language, template, cache_headers=True)
+
+    response = HttpResponse(fragment["content"])
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(last_modified)
+    patch_response_headers(response, cache_timeout=fragment["max_age"])
+    if fragment["vary"]:
+        patch_vary_headers(response, fragment["vary"])
+    return response
+
 
-    def get_paginate_by(self, queryset):
-        return self.request.GET.get("limit", 30)
+@require_safe
+def render_metrics_view(request):
+    """Returns the alias render metrics of this process in the Prometheus text
+    exposition format, see ``DJANGOCMS_ALIAS_RENDER_METRICS``."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    return HttpResponse(render_metrics.to_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
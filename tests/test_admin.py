@@ -7,6 +7,8 @@ from cms.toolbar.utils import get_object_edit_url, get_object_preview_url
 from cms.utils.i18n import force_language
 from cms.utils.urlutils import add_url_parameters, admin_reverse
 from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.formats import localize
 from django.utils.timezone import localtime
@@ -18,6 +20,7 @@ from djangocms_alias.constants import (
 from djangocms_alias.models import (
     Alias,
     AliasContent,
+    AliasPlugin,
     Category,
 )
 from djangocms_alias.models import (
@@ -458,6 +461,83 @@ class AliasContentManagerTestCase(BaseAliasPluginTestCase):
         self.assertContains(response, aliascontent2_url)
         self.assertContains(response, aliascontent3_url)
 
+    def test_alias_changelist_queries_do_not_grow_with_aliases(self):
+        url = self.get_admin_url(AliasModel, "changelist")
+        alias = self._create_alias(name="alias 0")
+        add_plugin(self.placeholder, "Alias", language=self.language, alias=alias)
+
+        with self.login_user_context(self.superuser):
+            self.client.get(url)  # Warm up session and content type caches
+            with CaptureQueriesContext(connection) as one_alias:
+                self.client.get(url)
+
+            for position in range(1, 5):
+                alias = self._create_alias(name=f"alias {position}", position=position)
+                if position % 2:
+                    add_plugin(self.placeholder, "Alias", language=self.language, alias=alias)
+            with CaptureQueriesContext(connection) as many_aliases:
+                response = self.client.get(url)
+            used_response = self.client.get(url, data={"used": "yes"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(one_alias), len(many_aliases))
+        self.assertEqual(
+            {alias.pk for alias in used_response.context["cl"].queryset},
+            set(AliasModel.objects.filter(cms_plugins__isnull=False).values_list("pk", flat=True)),
+        )
+
+    def test_copy_default_language_action(self):
+        alias = self._create_alias(name="alias")
+        german_alias = self._create_alias(name="german", position=1)
+        AliasContent.objects.with_user(self.superuser).create(alias=german_alias, name="deutsch", language="de")
+        url = self.get_admin_url(AliasModel, "changelist") + "?language=de"
+
+        with self.login_user_context(self.superuser):
+            response = self.client.post(
+                url,
+                data={"action": "copy_default_language", "_selected_action": [alias.pk, german_alias.pk]},
+                follow=True,
+            )
+
+        self.assertContains(response, "Copied 1 of 2 aliases from en to de.")
+        self.assertEqual(AliasContent.admin_manager.get(alias=alias, language="de").name, "alias")
+        self.assertEqual(AliasContent.admin_manager.get(alias=german_alias, language="de").name, "deutsch")
+
+    def test_detach_aliases_action(self):
+        alias = self._create_alias(name="alias")
+        add_plugin(alias.get_placeholder(self.language, True), "TextPlugin", language=self.language, body="text")
+        placeholder = self._get_draft_page_placeholder() if is_versioning_enabled() else self.placeholder
+        add_plugin(placeholder, "Alias", language=self.language, alias=alias)
+        url = self.get_admin_url(AliasModel, "changelist")
+        data = {"action": "detach_aliases", "_selected_action": [alias.pk]}
+
+        with self.login_user_context(self.get_staff_user_with_std_permissions()):
+            self.client.post(url, data=data)
+
+        self.assertTrue(AliasModel.objects.filter(pk=alias.pk).exists())
+
+        with self.login_user_context(self.superuser):
+            response = self.client.post(url, data=data, follow=True)
+
+        self.assertContains(response, "Replaced 1 alias plugins, deleted 1 aliases.")
+        self.assertFalse(AliasModel.objects.filter(pk=alias.pk).exists())
+
+    @skipUnless(is_versioning_enabled(), "Test only relevant for versioning")
+    def test_detach_aliases_action_skips_published_versions(self):
+        alias = self._create_alias(name="alias")
+        add_plugin(alias.get_placeholder(self.language, True), "TextPlugin", language=self.language, body="text")
+        add_plugin(self.placeholder, "Alias", language=self.language, alias=alias)
+        url = self.get_admin_url(AliasModel, "changelist")
+
+        with self.login_user_context(self.superuser):
+            response = self.client.post(
+                url, data={"action": "detach_aliases", "_selected_action": [alias.pk]}, follow=True
+            )
+
+        self.assertContains(response, "Replaced 0 alias plugins, deleted 0 aliases.")
+        self.assertContains(response, "Skipped 1 placeholders of published, archived or locked versions.")
+        self.assertTrue(AliasPlugin.objects.filter(alias=alias, placeholder=self.placeholder).exists())
+
 
 class CategoryAdminViewsTestCase(BaseAliasPluginTestCase):
     def test_changelist(self):
@@ -266,3 +266,31 @@ class CatergoryFiltersTestCase(BaseAliasPluginTestCase):
         self.assertEqual(first_lookup_value, category_one.name)
         # Category not linked to alias content should not be listed in the choices
         self.assertNotEqual(first_lookup_value, category_two.name)
+
+    def test_category_filter_lookups_are_counted_in_one_cached_query(self):
+        """
+        The category filter shows the number of aliases of each category,
+        computed by a single query and cached until a category or alias changes
+        """
+        category_one = Category.objects.create(name="b - category")
+        category_two = Category.objects.create(name="a - category")
+        AliasModel.objects.create(category=category_one, position=0)
+        AliasModel.objects.create(category=category_one, position=1)
+        AliasModel.objects.create(category=category_two, position=2)
+        version_admin = admin.site._registry[AliasModel]
+
+        with self.assertNumQueries(1):
+            category_filter = CategoryFilter(None, {"category": [""]}, AliasModel, version_admin)
+        with self.assertNumQueries(0):
+            CategoryFilter(None, {"category": [""]}, AliasModel, version_admin)
+        changelist = version_admin.get_changelist_instance(self.get_request("/"))
+
+        self.assertEqual(
+            [choice["display"] for choice in category_filter.choices(changelist)],
+            ["All", "a - category (1)", "b - category (2)"],
+        )
+
+        AliasModel.objects.create(category=category_two, position=3)
+        category_filter = CategoryFilter(None, {"category": [""]}, AliasModel, version_admin)
+
+        self.assertEqual(category_filter.alias_counts, {str(category_two.pk): 2, str(category_one.pk): 2})
@@ -0,0 +1,270 @@
+from unittest import skipUnless
+from unittest.mock import patch
+
+from cms.api import add_plugin
+from cms.utils.urlutils import add_url_parameters, admin_reverse
+from django.contrib.sites.models import Site
+from django.db import connection
+from django.template.loader import get_template
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from djangocms_alias.handlers import invalidate_placeholders
+from djangocms_alias.models import AliasPlugin
+from djangocms_alias.utils import is_versioning_enabled
+
+from .base import BaseAliasPluginTestCase
+
+ALIAS_TABLES = ('"djangocms_alias_alias"', '"djangocms_alias_aliascontent"', '"cms_placeholder"')
+PLUGIN_TABLES = ('"cms_cmsplugin"', '"text_text"')
+
+
+class StaticAliasDirectoryTestCase(BaseAliasPluginTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alias = self._create_alias(static_code="header")
+        add_plugin(
+            self.alias.get_placeholder(self.language),
+            "TextPlugin",
+            language=self.language,
+            body="Content header",
+        )
+
+    def _render(self):
+        with CaptureQueriesContext(connection) as queries:
+            output = get_template("static_aliases/one.html").render({}, self.get_request("/"))
+        alias_queries = [query["sql"] for query in queries if any(table in query["sql"] for table in ALIAS_TABLES)]
+        return output, alias_queries
+
+    def test_warm_directory_resolves_without_queries(self):
+        output, alias_queries = self._render()
+        self.assertIn("Content header", output)
+        self.assertNotEqual(alias_queries, [])
+
+        output, alias_queries = self._render()
+        self.assertIn("Content header", output)
+        self.assertEqual(alias_queries, [])
+
+    def test_content_change_invalidates_directory(self):
+        self._render()
+        content = self.alias.get_content(self.language, show_draft_content=True)
+        content.name = "changed"
+        content.save()
+
+        output, alias_queries = self._render()
+        self.assertIn("Content header", output)
+        self.assertNotEqual(alias_queries, [])
+
+    def test_alias_delete_invalidates_directory(self):
+        self._render()
+        self.alias.cms_plugins.all().delete()
+        self.alias.delete()
+
+        output, alias_queries = self._render()
+        self.assertNotIn("Content header", output)
+
+    def test_directory_entries_of_other_model_fields_are_not_read(self):
+        self._render()
+
+        # E.g. a field added to Placeholder by a django CMS upgrade
+        with patch("djangocms_alias.cache._get_schema_fingerprint", return_value="changed"):
+            output, alias_queries = self._render()
+        self.assertIn("Content header", output)
+        self.assertNotEqual(alias_queries, [])
+
+    @override_settings(DJANGOCMS_ALIAS_DIRECTORY_CACHE_ENABLED=False)
+    def test_directory_can_be_disabled(self):
+        self._render()
+        output, alias_queries = self._render()
+        self.assertIn("Content header", output)
+        self.assertNotEqual(alias_queries, [])
+
+    @skipUnless(is_versioning_enabled(), "Test only relevant for versioning")
+    def test_unpublish_invalidates_directory(self):
+        output, _ = self._render()
+        self.assertIn("Content header", output)
+
+        self._unpublish(self.alias)
+
+        output, _ = self._render()
+        self.assertNotIn("Content header", output)
+
+
+class AliasFragmentCacheTestCase(BaseAliasPluginTestCase):
+    alias_template = """{% load djangocms_alias_tags %}{% render_alias plugin.alias %}"""
+
+    def setUp(self):
+        super().setUp()
+        self.alias = self._create_alias([self.plugin])
+        self.alias_plugin = add_plugin(self.placeholder, "Alias", language=self.language, alias=self.alias)
+
+    def _render(self, user=None):
+        request = self.get_request("/")
+        if user is not None:
+            request.user = user
+        # Fresh instances do not carry the in-memory caches of earlier renders
+        alias_plugin = AliasPlugin.objects.select_related("alias").get(pk=self.alias_plugin.pk)
+        with CaptureQueriesContext(connection) as queries:
+            output = self.render_template_obj(self.alias_template, {"plugin": alias_plugin}, request)
+        return output, len(queries)
+
+    def test_published_alias_is_served_from_cache(self):
+        output, _ = self._render()
+        self.assertEqual(output, "test")
+
+        output, num_queries = self._render()
+        self.assertEqual(output, "test")
+        self.assertEqual(num_queries, 0)
+
+    def test_plugin_change_invalidates_fragment(self):
+        self._render()
+        add_plugin(
+            self.alias.get_placeholder(self.language),
+            "TextPlugin",
+            language=self.language,
+            body=" more",
+        )
+
+        output, _ = self._render()
+        self.assertEqual(output, "test more")
+
+    def test_page_plugin_change_does_not_touch_aliases(self):
+        self._render()
+        plugin = self.plugin.__class__.objects.get(pk=self.plugin.pk)
+
+        with (
+            patch("djangocms_alias.handlers.invalidate_aliases") as invalidate_aliases,
+            patch("djangocms_alias.handlers.invalidate_plugin_snapshots") as invalidate_plugin_snapshots,
+        ):
+            plugin.save()
+
+        invalidate_aliases.assert_not_called()
+        invalidate_plugin_snapshots.assert_not_called()
+        output, num_queries = self._render()
+        self.assertEqual(num_queries, 0)
+
+    def test_other_models_do_not_touch_aliases(self):
+        with patch("djangocms_alias.handlers.get_placeholder_alias_ids") as get_placeholder_alias_ids:
+            Site.objects.get_current().save()
+
+        get_placeholder_alias_ids.assert_not_called()
+
+    def test_placeholder_operation_invalidates_once(self):
+        placeholder = self._get_draft_page_placeholder() if is_versioning_enabled() else self.placeholder
+        add_plugin(placeholder, "TextPlugin", language=self.language, body="copied")
+        target_placeholder = self._create_alias(name="draft", published=False).get_placeholder(
+            self.language, show_draft_content=True
+        )
+        url = add_url_parameters(admin_reverse("cms_placeholder_copy_plugins"), cms_path="/")
+
+        with (
+            self.login_user_context(self.superuser),
+            patch("djangocms_alias.handlers.get_placeholder_alias_ids") as get_placeholder_alias_ids,
+            patch(
+                "djangocms_alias.handlers.invalidate_placeholders", wraps=invalidate_placeholders
+            ) as invalidate_placeholders_mock,
+        ):
+            response = self.client.post(
+                url,
+                {
+                    "source_language": self.language,
+                    "source_placeholder_id": placeholder.pk,
+                    "target_language": self.language,
+                    "target_placeholder_id": target_placeholder.pk,
+                },
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(target_placeholder.get_plugins(self.language).exists())
+        # Plugins saved by the operation are handled once it is done
+        get_placeholder_alias_ids.assert_not_called()
+        invalidate_placeholders_mock.assert_called_once()
+        self.assertIn(target_placeholder.pk, invalidate_placeholders_mock.call_args.args[0])
+
+    def test_nested_alias_change_invalidates_including_alias(self):
+        inner_alias = self._create_alias(name="inner")
+        inner_placeholder = inner_alias.get_placeholder(self.language)
+        add_plugin(self.alias.get_placeholder(self.language), "Alias", language=self.language, alias=inner_alias)
+        output, _ = self._render()
+        self.assertEqual(output, "test")
+
+        add_plugin(inner_placeholder, "TextPlugin", language=self.language, body=" inner")
+
+        output, _ = self._render()
+        self.assertEqual(output, "test inner")
+
+    @override_settings(DJANGOCMS_ALIAS_FRAGMENT_CACHE_ENABLED=False)
+    def test_fragment_cache_can_be_disabled(self):
+        self._render()
+        output, num_queries = self._render()
+        self.assertEqual(output, "test")
+        self.assertGreater(num_queries, 0)
+
+    @override_settings(CMS_PLACEHOLDER_CACHE=False)
+    def test_fragment_cache_follows_placeholder_cache_setting(self):
+        self._render()
+        output, num_queries = self._render()
+        self.assertEqual(output, "test")
+        self.assertGreater(num_queries, 0)
+
+    def test_staff_renders_bypass_fragment_cache(self):
+        self._render(user=self.superuser)
+        output, num_queries = self._render()
+        self.assertEqual(output, "test")
+        self.assertGreater(num_queries, 0)
+
+        output, num_queries = self._render(user=self.superuser)
+        self.assertEqual(output, "test")
+        self.assertGreater(num_queries, 0)
+
+
+@override_settings(DJANGOCMS_ALIAS_FRAGMENT_CACHE_ENABLED=False)
+class PluginSnapshotTestCase(BaseAliasPluginTestCase):
+    alias_template = AliasFragmentCacheTestCase.alias_template
+
+    def setUp(self):
+        super().setUp()
+        self.alias = self._create_alias([self.plugin])
+        self.alias_plugin = add_plugin(self.placeholder, "Alias", language=self.language, alias=self.alias)
+
+    def _render(self):
+        request = self.get_request("/")
+        alias_plugin = AliasPlugin.objects.select_related("alias").get(pk=self.alias_plugin.pk)
+        with CaptureQueriesContext(connection) as queries:
+            output = self.render_template_obj(self.alias_template, {"plugin": alias_plugin}, request)
+        plugin_queries = [query["sql"] for query in queries if any(table in query["sql"] for table in PLUGIN_TABLES)]
+        return output, plugin_queries
+
+    def test_published_plugins_are_restored_from_snapshot(self):
+        output, plugin_queries = self._render()
+        self.assertEqual(output, "test")
+        self.assertNotEqual(plugin_queries, [])
+
+        output, plugin_queries = self._render()
+        self.assertEqual(output, "test")
+        self.assertEqual(plugin_queries, [])
+
+    def test_plugin_change_invalidates_snapshot(self):
+        self._render()
+        add_plugin(self.alias.get_placeholder(self.language), "TextPlugin", language=self.language, body=" more")
+
+        output, plugin_queries = self._render()
+        self.assertEqual(output, "test more")
+        self.assertNotEqual(plugin_queries, [])
+
+    @override_settings(DJANGOCMS_ALIAS_PLUGIN_SNAPSHOTS_ENABLED=False)
+    def test_plugin_snapshots_can_be_disabled(self):
+        self._render()
+        output, plugin_queries = self._render()
+        self.assertEqual(output, "test")
+        self.assertNotEqual(plugin_queries, [])
+
+    @skipUnless(is_versioning_enabled(), "Test only relevant for versioning")
+    def test_publish_builds_snapshot(self):
+        alias = self._create_alias([self.plugin], name="draft", published=False)
+        self.alias_plugin = add_plugin(self.placeholder, "Alias", language=self.language, alias=alias)
+
+        self._publish(alias)
+
+        output, plugin_queries = self._render()
+        self.assertEqual(output, "test")
+        self.assertEqual(plugin_queries, [])
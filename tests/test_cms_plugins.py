@@ -8,6 +8,8 @@ from cms.utils import get_current_site
 from cms.utils.plugins import downcast_plugins
 from cms.utils.urlutils import admin_reverse
 from django.contrib import admin
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 
 from djangocms_alias.cms_plugins import Alias
 from djangocms_alias.constants import SELECT2_ALIAS_URL_NAME
@@ -125,6 +127,49 @@ class AliasPluginTestCase(BaseAliasPluginTestCase):
 
         self.assertContains(response, "Content Alias 1234")
 
+    @override_settings(
+        CMS_PLACEHOLDER_CACHE=False,
+        CMS_PAGE_CACHE=False,
+        DJANGOCMS_ALIAS_PLUGIN_SNAPSHOTS_ENABLED=False,
+    )
+    def test_rendering_many_alias_plugins_does_not_add_queries(self):
+        """All alias plugins of a placeholder are loaded in a constant number of queries"""
+
+        def add_alias_plugin(body):
+            alias = self._create_alias(name=body)
+            add_plugin(alias.get_placeholder(self.language), "TextPlugin", language=self.language, body=body)
+            add_plugin(self.placeholder, Alias, language=self.language, alias=alias)
+
+        add_alias_plugin("Alias content 0")
+        # Warm up session and content type caches
+        self.client.get(self.page.get_absolute_url(self.language))
+
+        with CaptureQueriesContext(connection) as one_alias:
+            response = self.client.get(self.page.get_absolute_url(self.language))
+        self.assertContains(response, "Alias content 0")
+
+        for index in range(1, 5):
+            add_alias_plugin(f"Alias content {index}")
+
+        with CaptureQueriesContext(connection) as many_aliases:
+            response = self.client.get(self.page.get_absolute_url(self.language))
+        for index in range(5):
+            self.assertContains(response, f"Alias content {index}")
+
+        self.assertEqual(len(one_alias), len(many_aliases))
+
+    def test_nested_alias_plugins_are_checked_for_recursion(self):
+        alias = self._create_alias(published=True)
+        nested_alias = self._create_alias(name="nested", published=True)
+        add_plugin(nested_alias.get_placeholder(self.language), "TextPlugin", language=self.language, body="Nested")
+        add_plugin(alias.get_placeholder(self.language), Alias, language=self.language, alias=nested_alias)
+        add_plugin(alias.get_placeholder(self.language), Alias, language=self.language, alias=alias)
+        add_plugin(self.placeholder, Alias, language=self.language, alias=alias)
+
+        response = self.client.get(self.page.get_absolute_url(self.language))
+
+        self.assertContains(response, "Nested")
+
     def test_detach_alias(self):
         alias = self._create_alias()
         alias_placeholder = alias.get_placeholder(self.language)
@@ -0,0 +1,247 @@
+from io import StringIO
+
+from cms.api import add_plugin
+from cms.models import Placeholder
+from django.core.management import CommandError, call_command
+from django.test.utils import override_settings
+
+from djangocms_alias.cache import get_category_choices_cache, get_select2_cache_key
+from djangocms_alias.constants import DEFAULT_STATIC_ALIAS_CATEGORY_NAME
+from djangocms_alias.models import Alias as AliasModel
+from djangocms_alias.models import AliasContent, AliasPlugin, Category
+from djangocms_alias.utils import is_versioning_enabled
+
+from .base import BaseAliasPluginTestCase
+
+
+class ProvisionStaticAliasesTestCase(BaseAliasPluginTestCase):
+    def provision(self, *args, **kwargs):
+        if is_versioning_enabled():
+            kwargs.setdefault("username", self.superuser.username)
+        call_command("provision_static_aliases", *args, stdout=StringIO(), **kwargs)
+
+    def test_provision_creates_aliases_contents_and_placeholders(self):
+        self.provision("static_alias.html")
+
+        alias = AliasModel.objects.get(static_code="template_example_global_alias_code")
+        contents = AliasContent.admin_manager.filter(alias=alias)
+
+        self.assertIsNone(alias.site)
+        self.assertEqual(alias.creation_method, AliasModel.CREATION_BY_TEMPLATE)
+        self.assertEqual(alias.category.name, DEFAULT_STATIC_ALIAS_CATEGORY_NAME)
+        self.assertEqual(sorted(contents.values_list("language", flat=True)), ["de", "en", "fr", "it"])
+        self.assertEqual(
+            Placeholder.objects.filter(
+                object_id__in=[content.pk for content in contents], slot="template_example_global_alias_code"
+            ).count(),
+            4,
+        )
+
+    def test_provision_is_idempotent(self):
+        self.provision("static_alias.html")
+        counts = (AliasModel.objects.count(), AliasContent.admin_manager.count(), Placeholder.objects.count())
+
+        self.provision("static_alias.html")
+
+        self.assertEqual(
+            (AliasModel.objects.count(), AliasContent.admin_manager.count(), Placeholder.objects.count()),
+            counts,
+        )
+
+    def test_provision_invalidates_category_choices_and_select2_results(self):
+        # Created with signals, unlike the aliases
+        Category.get_static_alias_category()
+        choices_generation, _choices = get_category_choices_cache(self.language)
+        select2_key = get_select2_cache_key("aliases")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.provision("static_alias.html")
+
+        self.assertNotEqual(get_category_choices_cache(self.language)[0], choices_generation)
+        self.assertNotEqual(get_select2_cache_key("aliases"), select2_key)
+
+    def test_provision_site_aliases(self):
+        self.provision("static_aliases/many.html")
+
+        alias = AliasModel.objects.get(static_code="sidebar")
+
+        self.assertEqual(alias.site_id, 1)
+        self.assertEqual(
+            set(AliasModel.objects.values_list("static_code", flat=True)),
+            {"header", "navigation", "sidebar", "footer"},
+        )
+
+    def test_provision_dry_run(self):
+        self.provision("static_alias.html", dry_run=True)
+
+        self.assertFalse(AliasModel.objects.filter(static_code="template_example_global_alias_code").exists())
+
+    def test_provision_requires_user_with_versioning(self):
+        if not is_versioning_enabled():
+            self.skipTest("Versioning not enabled")
+
+        with self.assertRaises(CommandError):
+            call_command("provision_static_aliases", "static_alias.html", stdout=StringIO())
+
+    @override_settings(STATIC_ALIAS_READ_ONLY=True)
+    def test_read_only_static_alias_tag_does_not_create_aliases(self):
+        alias_template = """{% load djangocms_alias_tags %}{% static_alias "read_only_code" %}"""
+
+        with self.login_user_context(self.superuser):
+            output = self.render_template_obj(alias_template, {}, self.get_request("/"))
+
+        self.assertEqual(output, "")
+        self.assertFalse(AliasModel.objects.filter(static_code="read_only_code").exists())
+
+
+class CreateAliasPlaceholdersTestCase(BaseAliasPluginTestCase):
+    def test_missing_placeholders_are_created(self):
+        alias = self._create_alias(name="legacy", static_code="legacy")
+        content = alias.get_content(self.language, show_draft_content=True)
+        content.placeholders.all().delete()
+        other_content = self._create_alias(name="other").get_content(self.language, show_draft_content=True)
+        stdout = StringIO()
+
+        call_command("create_alias_placeholders", "--dry-run", stdout=stdout)
+
+        self.assertIn("1 placeholders missing", stdout.getvalue())
+        self.assertFalse(content.placeholders.exists())
+
+        call_command("create_alias_placeholders", stdout=StringIO())
+
+        self.assertEqual(list(content.placeholders.values_list("slot", flat=True)), ["legacy"])
+        self.assertEqual(other_content.placeholders.count(), 1)
+
+
+class ReconcileAliasUsageCountsTestCase(BaseAliasPluginTestCase):
+    def test_outdated_usage_counts_are_corrected(self):
+        used_alias = self._create_alias(name="used")
+        unused_alias = self._create_alias(name="unused", position=1)
+        add_plugin(self.placeholder, "Alias", language=self.language, alias=used_alias)
+        AliasModel.objects.update(usage_count=3)
+        stdout = StringIO()
+
+        call_command("reconcile_alias_usage_counts", "--dry-run", stdout=stdout)
+
+        self.assertIn("2 alias usage counts outdated", stdout.getvalue())
+        self.assertEqual(set(AliasModel.objects.values_list("usage_count", flat=True)), {3})
+
+        call_command("reconcile_alias_usage_counts", stdout=StringIO())
+
+        used_alias.refresh_from_db()
+        unused_alias.refresh_from_db()
+        self.assertEqual(used_alias.usage_count, 1)
+        self.assertEqual(unused_alias.usage_count, 0)
+
+
+class RebalanceAliasPositionsTestCase(BaseAliasPluginTestCase):
+    def test_positions_are_spaced_out_keeping_the_order(self):
+        aliases = [AliasModel.objects.create(category=self.category) for _index in range(3)]
+        for position, alias in enumerate(aliases):
+            AliasModel.objects.filter(pk=alias.pk).update(position=position)
+
+        call_command("rebalance_alias_positions", stdout=StringIO())
+
+        gap = AliasModel.POSITION_GAP
+        self.assertEqual(
+            list(self.category.aliases.values_list("pk", "position")),
+            [(alias.pk, (index + 1) * gap) for index, alias in enumerate(aliases)],
+        )
+
+
+class CopyAliasTranslationsTestCase(BaseAliasPluginTestCase):
+    def copy(self, *args, **kwargs):
+        if is_versioning_enabled():
+            kwargs.setdefault("username", self.superuser.username)
+        stdout = StringIO()
+        call_command("copy_alias_translations", *args, stdout=stdout, **kwargs)
+        return stdout.getvalue()
+
+    def test_category_aliases_are_copied(self):
+        alias = self._create_alias(name="alias")
+        add_plugin(
+            alias.get_content(self.language, show_draft_content=True).placeholder,
+            "TextPlugin",
+            language=self.language,
+            body="text",
+        )
+        other_alias = self._create_alias(name="other", category=Category.objects.create(name="other"))
+
+        output = self.copy(self.language, "de", "--dry-run", categories=[self.category.pk])
+
+        self.assertIn("1 aliases to copy from en to de", output)
+        self.assertFalse(AliasContent.admin_manager.filter(language="de").exists())
+
+        output = self.copy(self.language, "de", categories=[self.category.pk])
+
+        content = AliasContent.admin_manager.get(language="de")
+        self.assertIn("1 alias contents copied from en to de", output)
+        self.assertEqual(content.alias, alias)
+        self.assertEqual(
+            list(content.placeholder.get_plugins("de").values_list("plugin_type", flat=True)), ["TextPlugin"]
+        )
+        self.assertFalse(AliasContent.admin_manager.filter(alias=other_alias, language="de").exists())
+
+    def test_same_language_is_rejected(self):
+        with self.assertRaises(CommandError):
+            self.copy(self.language, self.language)
+
+
+class DetachAliasTestCase(BaseAliasPluginTestCase):
+    def test_alias_plugins_are_replaced_and_alias_deleted(self):
+        alias = self._create_alias(name="alias")
+        add_plugin(alias.get_placeholder(self.language, True), "TextPlugin", language=self.language, body="text")
+        # Published page versions are not changed
+        placeholder = self._get_draft_page_placeholder() if is_versioning_enabled() else self.placeholder
+        add_plugin(placeholder, "Alias", language=self.language, alias=alias)
+        stdout = StringIO()
+
+        call_command("detach_alias", alias.pk, "--dry-run", stdout=stdout)
+
+        self.assertIn(f"Alias {alias.pk}: 1 alias plugins in 1 placeholders", stdout.getvalue())
+        self.assertTrue(AliasPlugin.objects.filter(alias=alias).exists())
+
+        stdout = StringIO()
+        call_command("detach_alias", alias.pk, stdout=stdout)
+
+        self.assertIn(f"Alias {alias.pk}: 1 alias plugins detached, alias deleted", stdout.getvalue())
+        self.assertFalse(AliasModel.objects.filter(pk=alias.pk).exists())
+        self.assertEqual(
+            list(placeholder.get_plugins(self.language).values_list("plugin_type", flat=True))[-1:],
+            ["TextPlugin"],
+        )
+
+    def test_unknown_alias_is_rejected(self):
+        with self.assertRaises(CommandError):
+            call_command("detach_alias", 0, stdout=StringIO())
+
+
+class AliasRenderMetricsTestCase(BaseAliasPluginTestCase):
+    def test_rendered_aliases_are_listed(self):
+        alias = self._create_alias([self.plugin])
+        add_plugin(self.placeholder, "Alias", language=self.language, alias=alias)
+        stdout = StringIO()
+
+        call_command(
+            "alias_render_metrics", self.page.get_absolute_url(), "--repeat=2", "--host=testserver", stdout=stdout
+        )
+
+        self.assertIn(f"plugin {alias.pk} (en): 2 renders", stdout.getvalue())
+        self.assertIn("1 cache hits, 1 misses", stdout.getvalue())
+
+    def test_bypassed_fragment_cache_is_reported(self):
+        alias = self._create_alias([self.plugin])
+        add_plugin(self.placeholder, "Alias", language=self.language, alias=alias)
+        stdout = StringIO()
+
+        call_command(
+            "alias_render_metrics",
+            self.page.get_absolute_url(),
+            "--repeat=2",
+            "--host=testserver",
+            f"--username={self.superuser.username}",
+            stdout=stdout,
+        )
+
+        self.assertIn(f"plugin {alias.pk} (en): 2 renders", stdout.getvalue())
+        self.assertIn("fragment cache bypassed", stdout.getvalue())
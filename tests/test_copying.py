@@ -0,0 +1,261 @@
+import os
+import time
+from unittest import skipUnless
+from unittest.mock import Mock, patch
+
+from cms.api import add_plugin
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
+
+from djangocms_alias.cms_plugins import Alias as AliasPluginClass
+from djangocms_alias.copying import copy_alias_contents, copy_alias_translations, detach_alias
+from djangocms_alias.models import Alias as AliasModel
+from djangocms_alias.models import AliasContent, AliasDependency, AliasPlugin, copy_alias_content
+from djangocms_alias.test_utils.text.models import Text
+from djangocms_alias.utils import is_versioning_enabled
+
+from .base import BaseAliasPluginTestCase
+
+
+class PluginTreeTestCase(BaseAliasPluginTestCase):
+    def _add_plugin_tree(self, placeholder, depth, children=2, parent=None):
+        for index in range(children if parent else 1):
+            plugin = add_plugin(
+                placeholder,
+                "TextPlugin",
+                language=self.language,
+                body=f"depth {depth} plugin {index}",
+                target=parent,
+                position="last-child",
+            )
+            if depth > 1:
+                self._add_plugin_tree(placeholder, depth - 1, children, parent=plugin)
+
+    def _get_tree(self, placeholder):
+        return [
+            (
+                plugin.plugin_type,
+                plugin.position,
+                plugin.language,
+                plugin.parent.position if plugin.parent_id else None,
+                getattr(plugin.get_bound_plugin(), "body", None),
+            )
+            for plugin in placeholder.get_plugins().order_by("position")
+        ]
+
+
+class CopyAliasContentsTestCase(PluginTreeTestCase):
+    def test_copy_keeps_plugin_tree(self):
+        included_alias = self._create_alias(name="included")
+        alias = self._create_alias(name="alias", position=1)
+        content = alias.get_content(self.language, show_draft_content=True)
+        self._add_plugin_tree(content.placeholder, depth=3)
+        text_plugin = content.placeholder.get_plugins().filter(parent__isnull=False).last()
+        add_plugin(
+            content.placeholder,
+            "Alias",
+            language=self.language,
+            alias=included_alias,
+            target=text_plugin,
+            position="last-child",
+        )
+
+        new_content = copy_alias_content(content)
+
+        self.assertNotEqual(new_content.pk, content.pk)
+        self.assertEqual(new_content.name, "alias")
+        self.assertEqual(new_content.placeholder.slot, content.placeholder.slot)
+        self.assertEqual(new_content.placeholders.get().pk, new_content.placeholder.pk)
+        self.assertEqual(self._get_tree(new_content.placeholder), self._get_tree(content.placeholder))
+        self.assertEqual(AliasModel.objects.get(pk=included_alias.pk).usage_count, 2)
+        self.assertEqual(
+            AliasDependency.objects.filter(plugin__placeholder=new_content.placeholder).get().included_alias_id,
+            included_alias.pk,
+        )
+
+    def test_copy_alias_content_saves_plugins(self):
+        alias = self._create_alias(name="alias")
+        content = alias.get_content(self.language, show_draft_content=True)
+        self._add_plugin_tree(content.placeholder, depth=2)
+        receiver = Mock()
+        post_save.connect(receiver, sender=Text)
+        self.addCleanup(post_save.disconnect, receiver, sender=Text)
+
+        # Used by djangocms-versioning to create new drafts
+        new_content = copy_alias_content(content)
+
+        self.assertEqual(
+            {call.kwargs["instance"].pk for call in receiver.call_args_list},
+            set(new_content.placeholder.get_plugins().values_list("pk", flat=True)),
+        )
+
+    def test_copy_queries_do_not_grow_with_contents(self):
+        def create_contents(count):
+            contents = []
+            for index in range(count):
+                alias = self._create_alias(name=f"alias {index}", position=index)
+                content = alias.get_content(self.language, show_draft_content=True)
+                self._add_plugin_tree(content.placeholder, depth=3)
+                contents.append(AliasContent.admin_manager.get(pk=content.pk))
+            return contents
+
+        one_content = create_contents(1)
+        many_contents = create_contents(5)
+
+        with CaptureQueriesContext(connection) as one_copy:
+            copy_alias_contents(one_content)
+        with CaptureQueriesContext(connection) as many_copies:
+            new_contents = copy_alias_contents(many_contents)
+
+        self.assertEqual(len(one_copy), len(many_copies))
+        self.assertEqual(
+            [self._get_tree(content.placeholder) for content in new_contents],
+            [self._get_tree(content.placeholder) for content in many_contents],
+        )
+
+    def test_copied_plugin_rows_are_prepared_by_their_fields(self):
+        alias = self._create_alias(name="alias")
+        content = alias.get_content(self.language, show_draft_content=True)
+        self._add_plugin_tree(content.placeholder, depth=1)
+        body_field = Text._meta.get_field("body")
+
+        # Like the ORM, e.g. for auto_now fields
+        with patch.object(body_field, "pre_save", return_value="prepared") as pre_save:
+            new_content = copy_alias_contents([AliasContent.admin_manager.get(pk=content.pk)])[0]
+
+        self.assertTrue(pre_save.call_args.kwargs["add"])
+        self.assertEqual([tree[-1] for tree in self._get_tree(new_content.placeholder)], ["prepared"])
+        self.assertEqual([tree[-1] for tree in self._get_tree(content.placeholder)], ["depth 1 plugin 0"])
+
+    @skipUnless(os.environ.get("DJANGOCMS_ALIAS_BENCHMARK"), "Set DJANGOCMS_ALIAS_BENCHMARK=1 to run benchmarks")
+    def test_copy_benchmark(self):
+        """Copying 20 alias contents with 63 nested plugins each in bulk is
+        at least 5 times faster than copying them one by one"""
+        contents = []
+        for index in range(20):
+            alias = self._create_alias(name=f"alias {index}", position=index)
+            content = alias.get_content(self.language, show_draft_content=True)
+            self._add_plugin_tree(content.placeholder, depth=6)
+            contents.append(content)
+
+        start = time.perf_counter()
+        for content in contents:
+            copy_alias_content(AliasContent.admin_manager.get(pk=content.pk))
+        one_by_one = time.perf_counter() - start
+
+        start = time.perf_counter()
+        copy_alias_contents(AliasContent.admin_manager.filter(pk__in=[content.pk for content in contents]))
+        bulk = time.perf_counter() - start
+
+        self.assertLess(bulk * 5, one_by_one, f"Bulk copy took {bulk:.2f} s, one by one {one_by_one:.2f} s")
+
+
+class CopyAliasTranslationsTestCase(PluginTreeTestCase):
+    def _copy(self, aliases, **kwargs):
+        return list(copy_alias_translations(aliases, self.language, "de", user=self.superuser, **kwargs))
+
+    def test_copy_creates_target_contents_with_plugin_tree(self):
+        alias = self._create_alias(name="alias")
+        content = alias.get_content(self.language, show_draft_content=True)
+        self._add_plugin_tree(content.placeholder, depth=3)
+
+        progress = self._copy(AliasModel.objects.filter(pk=alias.pk))
+
+        new_content = AliasContent.admin_manager.get(alias=alias, language="de")
+        self.assertEqual(progress, [(1, 1)])
+        self.assertEqual(new_content.name, "alias")
+        self.assertEqual(
+            [(*plugin[:2], "de", *plugin[3:]) for plugin in self._get_tree(content.placeholder)],
+            self._get_tree(new_content.placeholder),
+        )
+
+    def test_copy_skips_translated_aliases(self):
+        translated_alias = self._create_alias(name="translated")
+        AliasContent.objects.with_user(self.superuser).create(alias=translated_alias, name="übersetzt", language="de")
+        aliases = [self._create_alias(name=f"alias {index}", position=index + 1) for index in range(3)]
+
+        progress = self._copy(AliasModel.objects.all(), batch_size=2)
+
+        self.assertEqual(progress, [(2, 1), (4, 3)])
+        self.assertEqual(AliasContent.admin_manager.get(alias=translated_alias, language="de").name, "übersetzt")
+        self.assertEqual(
+            AliasContent.admin_manager.filter(alias__in=aliases, language="de").count(),
+            3,
+        )
+        self.assertEqual(self._copy(AliasModel.objects.all()), [(4, 0)])
+
+
+class DetachAliasTestCase(PluginTreeTestCase):
+    def _add_host_plugins(self, placeholder, alias):
+        add_plugin(placeholder, "TextPlugin", language=self.language, body="before")
+        add_plugin(placeholder, "Alias", language=self.language, alias=alias)
+        parent = add_plugin(placeholder, "TextPlugin", language=self.language, body="between")
+        add_plugin(placeholder, "Alias", language=self.language, alias=alias, target=parent, position="last-child")
+        add_plugin(placeholder, "Alias", language=self.language, alias=alias)
+        add_plugin(placeholder, "TextPlugin", language=self.language, body="after")
+
+    def test_detach_replaces_alias_plugins_like_single_detach(self):
+        alias = self._create_alias(name="alias")
+        self._add_plugin_tree(alias.get_placeholder(self.language, show_draft_content=True), depth=2)
+        placeholder = self._create_alias(name="host", position=1, published=False).get_placeholder(self.language, True)
+        expected_placeholder = self._create_alias(name="expected", position=2, published=False).get_placeholder(
+            self.language, True
+        )
+        self._add_host_plugins(placeholder, alias)
+        self._add_host_plugins(expected_placeholder, alias)
+        for plugin in AliasPlugin.objects.filter(placeholder=expected_placeholder).order_by("-position"):
+            AliasPluginClass.detach_alias_plugin(plugin, self.language)
+
+        progress = list(detach_alias(alias))
+
+        self.assertEqual(progress, [(1, 1, 3, 0)])
+        self.assertEqual(self._get_tree(placeholder), self._get_tree(expected_placeholder))
+        self.assertEqual(list(placeholder.get_plugins().values_list("position", flat=True)), list(range(1, 13)))
+        self.assertFalse(AliasModel.objects.filter(pk=alias.pk).exists())
+
+    def test_interrupted_detach_is_continued(self):
+        alias = self._create_alias(name="alias")
+        add_plugin(alias.get_placeholder(self.language, True), "TextPlugin", language=self.language, body="text")
+        placeholders = [
+            self._create_alias(name=f"host {index}", position=index + 1, published=False).get_placeholder(
+                self.language, True
+            )
+            for index in range(2)
+        ]
+        for placeholder in placeholders:
+            add_plugin(placeholder, "Alias", language=self.language, alias=alias)
+
+        self.assertEqual(next(detach_alias(alias)), (1, 2, 1, 0))
+        self.assertEqual(AliasModel.objects.get(pk=alias.pk).usage_count, 1)
+
+        self.assertEqual(list(detach_alias(alias, delete_alias=False)), [(1, 1, 1, 0)])
+        self.assertEqual(AliasModel.objects.get(pk=alias.pk).usage_count, 0)
+        for placeholder in placeholders:
+            self.assertEqual([plugin[4] for plugin in self._get_tree(placeholder)], ["text"])
+
+    @skipUnless(is_versioning_enabled(), "Test only relevant for versioning")
+    def test_detach_only_changes_unlocked_drafts(self):
+        from djangocms_versioning.models import Version
+
+        alias = self._create_alias(name="alias")
+        add_plugin(alias.get_placeholder(self.language, True), "TextPlugin", language=self.language, body="text")
+        contents = [
+            self._create_alias(name=name, position=index + 1, published=False).get_content(self.language, True)
+            for index, name in enumerate(["draft", "locked", "archived"])
+        ]
+        for content in contents:
+            add_plugin(content.placeholder, "Alias", language=self.language, alias=alias)
+        add_plugin(self.placeholder, "Alias", language=self.language, alias=alias)
+        draft, locked, archived = (Version.objects.get_for_content(content) for content in contents)
+        Version.objects.filter(pk=locked.pk).update(locked_by=self.get_staff_user_with_no_permissions())
+        archived.archive(self.superuser)
+
+        progress = list(detach_alias(alias, user=self.superuser))
+
+        self.assertEqual(progress[-1][1:], (4, 1, 3))
+        self.assertEqual(
+            set(AliasPlugin.objects.filter(alias=alias).values_list("placeholder", flat=True)),
+            {self.placeholder.pk, locked.content.placeholder.pk, archived.content.placeholder.pk},
+        )
+        self.assertTrue(AliasModel.objects.filter(pk=alias.pk).exists())
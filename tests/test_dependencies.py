@@ -0,0 +1,139 @@
+from unittest.mock import patch
+
+from cms.api import add_plugin
+from cms.utils.urlutils import add_url_parameters, admin_reverse
+
+from djangocms_alias.cms_plugins import Alias
+from djangocms_alias.dependencies import get_dependency_graph
+from djangocms_alias.forms import AliasPluginForm
+from djangocms_alias.models import AliasDependency
+from djangocms_alias.utils import is_versioning_enabled
+
+from .base import BaseAliasPluginTestCase
+
+
+class AliasDependencyTestCase(BaseAliasPluginTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alias_a = self._create_alias(name="A")
+        self.alias_b = self._create_alias(name="B")
+        self.alias_c = self._create_alias(name="C")
+
+    def _include(self, alias, included_alias):
+        return add_plugin(alias.get_placeholder(self.language), Alias, language=self.language, alias=included_alias)
+
+    def test_dependencies_follow_alias_plugins(self):
+        plugin = self._include(self.alias_a, self.alias_b)
+        add_plugin(self.placeholder, Alias, language=self.language, alias=self.alias_c)
+
+        self.assertEqual(
+            list(AliasDependency.objects.values_list("alias", "included_alias")),
+            [(self.alias_a.pk, self.alias_b.pk)],
+        )
+
+        plugin.delete()
+
+        self.assertFalse(AliasDependency.objects.exists())
+
+    def test_dependency_graph_is_transitive(self):
+        self._include(self.alias_a, self.alias_b)
+        self._include(self.alias_b, self.alias_c)
+
+        graph = get_dependency_graph()
+
+        self.assertEqual(graph.get_included_alias_ids(self.alias_a.pk), {self.alias_b.pk, self.alias_c.pk})
+        self.assertEqual(
+            graph.get_including_alias_ids([self.alias_c.pk]),
+            {self.alias_a.pk, self.alias_b.pk, self.alias_c.pk},
+        )
+        self.assertTrue(graph.would_create_cycle(self.alias_c.pk, self.alias_a.pk))
+        self.assertFalse(graph.would_create_cycle(self.alias_a.pk, self.alias_c.pk))
+
+    def test_dependency_graph_is_kept_per_process_until_changed(self):
+        self._include(self.alias_a, self.alias_b)
+        graph = get_dependency_graph()
+
+        with patch("djangocms_alias.dependencies.get_dependency_graph_cache") as get_dependency_graph_cache:
+            self.assertIs(get_dependency_graph(), graph)
+        get_dependency_graph_cache.assert_not_called()
+
+        self._include(self.alias_b, self.alias_c)
+
+        self.assertEqual(
+            get_dependency_graph().get_included_alias_ids(self.alias_a.pk), {self.alias_b.pk, self.alias_c.pk}
+        )
+
+    def test_indirect_recursion_is_detected_without_queries(self):
+        plugin = self._include(self.alias_a, self.alias_b)
+        self._include(self.alias_b, self.alias_c)
+        self.assertFalse(plugin.is_recursive())
+
+        self._include(self.alias_c, self.alias_a)
+        plugin.placeholder.source  # noqa: B018 - load the placeholder source
+
+        with self.assertNumQueries(0):
+            self.assertTrue(plugin.is_recursive())
+
+    def test_plugin_form_rejects_cycles(self):
+        self._include(self.alias_a, self.alias_b)
+        self._include(self.alias_b, self.alias_c)
+
+        form = AliasPluginForm(data={"alias": self.alias_a.pk, "template": "default"})
+        form.target_placeholder = self.alias_c.get_placeholder(self.language)
+
+        self.assertFalse(form.is_valid())
+        self.assertIn("alias", form.errors)
+
+        form = AliasPluginForm(data={"alias": self.alias_c.pk, "template": "default"})
+        form.target_placeholder = self.alias_a.get_placeholder(self.language)
+
+        self.assertTrue(form.is_valid())
+
+    def _get_draft_placeholders(self):
+        """Returns an editable page placeholder and the editable placeholder of
+        an alias included by alias A."""
+        alias = self._create_alias(name="draft", published=False)
+        self._include(self.alias_a, alias)
+        placeholder = self._get_draft_page_placeholder() if is_versioning_enabled() else self.placeholder
+        return placeholder, alias.get_placeholder(self.language, show_draft_content=True)
+
+    def test_moving_and_pasting_plugins_rejects_cycles(self):
+        placeholder, target_placeholder = self._get_draft_placeholders()
+        plugin = add_plugin(placeholder, Alias, language=self.language, alias=self.alias_a)
+        url = add_url_parameters(admin_reverse("cms_placeholder_move_plugin"), cms_path="/")
+
+        with self.login_user_context(self.superuser):
+            for move_a_copy in ("false", "true"):
+                response = self.client.post(
+                    url,
+                    {
+                        "plugin_id": plugin.pk,
+                        "placeholder_id": target_placeholder.pk,
+                        "target_language": self.language,
+                        "target_position": 1,
+                        "move_a_copy": move_a_copy,
+                    },
+                )
+                self.assertEqual(response.status_code, 403)
+
+        self.assertFalse(target_placeholder.get_plugins(self.language).exists())
+        self.assertTrue(placeholder.get_plugins(self.language).filter(pk=plugin.pk).exists())
+
+    def test_copying_placeholder_rejects_cycles(self):
+        placeholder, target_placeholder = self._get_draft_placeholders()
+        add_plugin(placeholder, Alias, language=self.language, alias=self.alias_a)
+        url = add_url_parameters(admin_reverse("cms_placeholder_copy_plugins"), cms_path="/")
+
+        with self.login_user_context(self.superuser):
+            response = self.client.post(
+                url,
+                {
+                    "source_language": self.language,
+                    "source_placeholder_id": placeholder.pk,
+                    "target_language": self.language,
+                    "target_placeholder_id": target_placeholder.pk,
+                },
+            )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(target_placeholder.get_plugins(self.language).exists())
@@ -0,0 +1,167 @@
+import importlib
+import sys
+from io import StringIO
+from types import ModuleType
+from unittest.mock import patch
+
+from cms.api import add_plugin
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from djangocms_alias.models import AliasContent
+from djangocms_alias.utils import is_versioning_enabled
+
+from .base import BaseAliasPluginTestCase
+
+
+class CharField:
+    def __init__(self, model_attr=None, **kwargs):
+        self.model_attr = model_attr
+
+    def prepare(self, obj):
+        return getattr(obj, self.model_attr) if self.model_attr else None
+
+
+class SearchIndex:
+    """The parts of haystack's SearchIndex used by AliasContentConfig."""
+
+    text = CharField()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.fields = {
+            name: value for klass in cls.__mro__ for name, value in vars(klass).items() if isinstance(value, CharField)
+        }
+
+    def index_queryset(self, using=None):
+        return self.model._default_manager.all()
+
+    def get_backend(self, using=None):
+        return backend
+
+    def full_prepare(self, obj):
+        return {
+            name: getattr(self, f"prepare_{name}")(obj) if hasattr(self, f"prepare_{name}") else field.prepare(obj)
+            for name, field in self.fields.items()
+        }
+
+
+class Backend:
+    def __init__(self):
+        self.documents = []
+
+    def update(self, index, iterable):
+        self.documents += [index.full_prepare(obj) for obj in iterable]
+
+
+backend = Backend()
+
+
+def get_request(language):
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    request.session = {}
+    request.current_page = None
+    request.LANGUAGE_CODE = language
+    return request
+
+
+def get_stub_modules() -> dict:
+    haystack = ModuleType("haystack")
+    haystack.indexes = ModuleType("haystack.indexes")
+    haystack.indexes.CharField = CharField
+    internalsearch = ModuleType("djangocms_internalsearch")
+    internalsearch.base = ModuleType("djangocms_internalsearch.base")
+    internalsearch.base.BaseSearchConfig = SearchIndex
+    internalsearch.helpers = ModuleType("djangocms_internalsearch.helpers")
+    internalsearch.helpers.get_request = get_request
+    internalsearch.helpers.get_version_object = lambda obj: None
+    return {
+        "haystack": haystack,
+        "haystack.indexes": haystack.indexes,
+        "djangocms_internalsearch": internalsearch,
+        "djangocms_internalsearch.base": internalsearch.base,
+        "djangocms_internalsearch.helpers": internalsearch.helpers,
+    }
+
+
+class AliasContentConfigTestCase(BaseAliasPluginTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = patch.dict(sys.modules, get_stub_modules())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.modules.pop("djangocms_alias.internal_search", None)
+        self.internal_search = importlib.import_module("djangocms_alias.internal_search")
+        backend.documents = []
+
+    def _create_aliases(self, count):
+        for index in range(count):
+            alias = self._create_alias([self.plugin], name=f"alias {index}", position=index)
+            add_plugin(alias.get_placeholder(self.language), "TextPlugin", language=self.language, body=f" {index}")
+
+    def _index(self, **kwargs):
+        config = self.internal_search.AliasContentConfig()
+        return list(config.update_in_batches(**kwargs))
+
+    def test_batches_are_indexed_with_a_constant_number_of_queries(self):
+        self._create_aliases(2)
+        # Content pks, contents, placeholders, plugins and text plugins
+        with self.assertNumQueries(5):
+            self._index()
+        self._create_aliases(4)
+        backend.documents = []
+
+        with self.assertNumQueries(5):
+            self._index()
+        self.assertEqual(len(backend.documents), AliasContent.objects.count())
+
+    def test_indexed_output(self):
+        self._create_aliases(3)
+
+        config = self.internal_search.AliasContentConfig()
+
+        self.assertEqual(list(config.update_in_batches(batch_size=2)), [2, 3])
+
+        documents = sorted(backend.documents, key=lambda document: document["title"])
+        self.assertEqual(
+            [(document["title"], document["text"], document["category"]) for document in documents],
+            [(f"alias {index}", f"test {index}", "test category") for index in range(3)],
+        )
+        self.assertTrue(all(document["language"] == self.language for document in documents))
+        # Loaded by index_queryset, get_version_object is not called
+        version_status = "published" if is_versioning_enabled() else None
+        self.assertTrue(all(document["version_status"] == version_status for document in documents))
+        self.assertEqual(config.texts, {})
+
+    def test_requests_are_built_once_per_language(self):
+        self._create_aliases(2)
+        config = self.internal_search.AliasContentConfig()
+
+        with patch.object(self.internal_search, "get_request", wraps=get_request) as get_request_mock:
+            list(config.update_in_batches(batch_size=1))
+            config.prepare_text(AliasContent.objects.first())
+
+        get_request_mock.assert_called_once_with(self.language)
+
+    def test_single_contents_are_rendered_on_their_own(self):
+        self._create_aliases(1)
+        config = self.internal_search.AliasContentConfig()
+        content = AliasContent.objects.get()
+
+        self.assertEqual(config.prepare_text(content), "test 0")
+        self.assertEqual(config.prepare_category(content), "test category")
+
+    def test_command_indexes_all_contents(self):
+        self._create_aliases(3)
+        stdout = StringIO()
+
+        with patch(
+            "djangocms_alias.management.commands.update_alias_content_index.AliasContentConfig",
+            self.internal_search.AliasContentConfig,
+        ):
+            call_command("update_alias_content_index", batch_size=2, stdout=stdout)
+
+        self.assertIn("3 alias contents indexed", stdout.getvalue())
+        self.assertEqual(len(backend.documents), 3)
@@ -0,0 +1,86 @@
+from cms.api import add_plugin
+from cms.utils.urlutils import admin_reverse
+from django.template.loader import get_template
+from django.test.utils import override_settings
+
+from djangocms_alias.constants import RENDER_METRICS_URL_NAME
+from djangocms_alias.metrics import AliasRender, RenderMetrics, render_metrics
+from djangocms_alias.models import AliasPlugin
+from djangocms_alias.signals import alias_rendered
+
+from .base import BaseAliasPluginTestCase
+
+
+@override_settings(DJANGOCMS_ALIAS_RENDER_METRICS=True)
+class RenderMetricsTestCase(BaseAliasPluginTestCase):
+    alias_template = """{% load djangocms_alias_tags %}{% render_alias plugin.alias %}"""
+
+    def setUp(self):
+        super().setUp()
+        render_metrics.reset()
+        self.renders = []
+        alias_rendered.connect(self._receive)
+        self.addCleanup(alias_rendered.disconnect, self._receive)
+
+    def _receive(self, render, **kwargs):
+        self.renders.append(render)
+
+    def _render_plugin(self, alias):
+        alias_plugin = add_plugin(self.placeholder, "Alias", language=self.language, alias=alias)
+        plugin = AliasPlugin.objects.select_related("alias").get(pk=alias_plugin.pk)
+        return self.render_template_obj(self.alias_template, {"plugin": plugin}, self.get_request("/"))
+
+    def test_plugin_renders_are_measured(self):
+        alias = self._create_alias([self.plugin])
+
+        self._render_plugin(alias)
+        self._render_plugin(alias)
+
+        self.assertEqual(
+            [(render.alias, render.language, render.path) for render in self.renders], [(alias.pk, "en", "plugin")] * 2
+        )
+        self.assertEqual([render.cache for render in self.renders], ["miss", "hit"])
+        self.assertGreater(self.renders[0].queries, 0)
+        self.assertEqual(self.renders[1].queries, 0)
+        metrics = render_metrics.get_values()[("plugin", str(alias.pk), "en")]
+        self.assertEqual(metrics["renders_total"], 2)
+        self.assertEqual(metrics["render_cache_hits_total"], 1)
+        self.assertEqual(metrics["render_cache_misses_total"], 1)
+        self.assertEqual(metrics["render_queries_total"], self.renders[0].queries)
+
+    def test_static_alias_renders_are_measured(self):
+        alias = self._create_alias(static_code="header")
+        add_plugin(alias.get_placeholder(self.language), "TextPlugin", language=self.language, body="header")
+
+        get_template("static_aliases/one.html").render({}, self.get_request("/"))
+
+        self.assertEqual([(render.alias, render.path) for render in self.renders], [("header", "static")])
+
+    @override_settings(DJANGOCMS_ALIAS_RENDER_METRICS=False)
+    def test_disabled_metrics_record_nothing(self):
+        self._render_plugin(self._create_alias([self.plugin]))
+
+        self.assertEqual(self.renders, [])
+        self.assertEqual(render_metrics.get_values(), {})
+
+    def test_prometheus_view(self):
+        metrics = RenderMetrics()
+        metrics.record(AliasRender('say "hi"', "en", "static", 0.5, 3, "hit"))
+        self.assertIn(
+            'djangocms_alias_render_queries_total{path="static",alias="say \\"hi\\"",language="en"} 3',
+            metrics.to_prometheus(),
+        )
+
+        render_metrics.record(AliasRender(1, "en", "plugin", 0.25, 2, None))
+        url = admin_reverse(RENDER_METRICS_URL_NAME)
+        with self.login_user_context(self.get_staff_user_with_no_permissions()):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'djangocms_alias_render_seconds_total{path="plugin",alias="1",language="en"} 0.25',
+            response.content.decode(),
+        )
+
+        self.client.logout()
+        response = self.client.get(url)
+        self.assertNotEqual(response.status_code, 200)
@@ -1,5 +1,8 @@
+from unittest.mock import patch
+
 from cms.api import add_plugin, create_page_content
-from cms.models import Placeholder
+from cms.models import CMSPlugin, Placeholder
+from cms.utils.plugins import copy_plugins_to_placeholder
 from django.contrib.sites.models import Site
 from django.core.exceptions import ValidationError
 from django.db.models import ProtectedError
@@ -8,14 +11,15 @@ from django.urls import reverse
 from djangocms_alias.cms_plugins import Alias
 from djangocms_alias.models import Alias as AliasModel
 from djangocms_alias.models import AliasContent, Category
+from djangocms_alias.models import AliasPlugin as AliasPluginModel
 from djangocms_alias.utils import is_versioning_enabled
 
 from .base import BaseAliasPluginTestCase
 
 
 class AliasModelsTestCase(BaseAliasPluginTestCase):
-    def _get_aliases_positions(self, category):
-        return dict(category.aliases.values_list("position", "pk"))
+    def _get_aliases_order(self, category):
+        return list(category.aliases.values_list("pk", flat=True))
 
     def test_alias_placeholder_slot_save_again(self):
         alias = self._create_alias(self.placeholder.get_plugins())
@@ -81,12 +85,12 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
         alias2cat1 = AliasModel.objects.create(category=category1)
 
         self.assertEqual(
-            self._get_aliases_positions(alias1cat1.category),
-            {0: alias1cat1.pk, 1: alias2cat1.pk},
+            self._get_aliases_order(alias1cat1.category),
+            [alias1cat1.pk, alias2cat1.pk],
         )
         self.assertEqual(
-            self._get_aliases_positions(alias1cat2.category),
-            {0: alias1cat2.pk, 1: alias2cat2.pk},
+            self._get_aliases_order(alias1cat2.category),
+            [alias1cat2.pk, alias2cat2.pk],
         )
 
     def test_save_and_delete_inc_dec_of_position_delete_first(self):
@@ -97,8 +101,8 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
 
         alias1.delete()
         self.assertEqual(
-            self._get_aliases_positions(alias1.category),
-            {0: alias2.pk, 1: alias3.pk, 2: alias4.pk},
+            self._get_aliases_order(alias1.category),
+            [alias2.pk, alias3.pk, alias4.pk],
         )
 
     def test_save_and_delete_inc_dec_of_position_delete_in_the_middle(self):
@@ -108,8 +112,8 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
 
         alias2.delete()
         self.assertEqual(
-            self._get_aliases_positions(alias1.category),
-            {0: alias1.pk, 1: alias3.pk},
+            self._get_aliases_order(alias1.category),
+            [alias1.pk, alias3.pk],
         )
 
     def test_save_and_delete_inc_dec_of_position_delete_last(self):
@@ -119,8 +123,8 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
 
         alias3.delete()
         self.assertEqual(
-            self._get_aliases_positions(alias1.category),
-            {0: alias1.pk, 1: alias2.pk},
+            self._get_aliases_order(alias1.category),
+            [alias1.pk, alias2.pk],
         )
 
     def test_set_position_dont_change_position_in_other_categories(self):
@@ -135,14 +139,14 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
         alias1cat2 = AliasModel.objects.create(category=category2)  # 0
         alias2cat2 = AliasModel.objects.create(category=category2)  # 1
 
-        alias1cat1._set_position(alias2cat1.position)
+        alias1cat1._set_position(1)
         self.assertEqual(
-            self._get_aliases_positions(alias1cat1.category),
-            {0: alias2cat1.pk, 1: alias1cat1.pk},
+            self._get_aliases_order(alias1cat1.category),
+            [alias2cat1.pk, alias1cat1.pk],
         )
         self.assertEqual(
-            self._get_aliases_positions(alias1cat2.category),
-            {0: alias1cat2.pk, 1: alias2cat2.pk},
+            self._get_aliases_order(alias1cat2.category),
+            [alias1cat2.pk, alias2cat2.pk],
         )
 
     def test_set_position_moving_up(self):
@@ -153,8 +157,8 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
 
         alias3._set_position(1)
         self.assertEqual(
-            self._get_aliases_positions(alias1.category),
-            {0: alias1.pk, 1: alias3.pk, 2: alias2.pk, 3: alias4.pk},
+            self._get_aliases_order(alias1.category),
+            [alias1.pk, alias3.pk, alias2.pk, alias4.pk],
         )
 
     def test_set_position_moving_down(self):
@@ -165,8 +169,8 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
 
         alias2._set_position(2)
         self.assertEqual(
-            self._get_aliases_positions(alias1.category),
-            {0: alias1.pk, 1: alias3.pk, 2: alias2.pk, 3: alias4.pk},
+            self._get_aliases_order(alias1.category),
+            [alias1.pk, alias3.pk, alias2.pk, alias4.pk],
         )
 
     def test_set_position_moving_up_from_end_to_start(self):
@@ -177,8 +181,8 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
 
         alias4._set_position(0)
         self.assertEqual(
-            self._get_aliases_positions(alias1.category),
-            {0: alias4.pk, 1: alias1.pk, 2: alias2.pk, 3: alias3.pk},
+            self._get_aliases_order(alias1.category),
+            [alias4.pk, alias1.pk, alias2.pk, alias3.pk],
         )
 
     def test_set_position_moving_down_from_start_to_end(self):
@@ -189,8 +193,8 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
 
         alias1._set_position(3)
         self.assertEqual(
-            self._get_aliases_positions(alias1.category),
-            {0: alias2.pk, 1: alias3.pk, 2: alias4.pk, 3: alias1.pk},
+            self._get_aliases_order(alias1.category),
+            [alias2.pk, alias3.pk, alias4.pk, alias1.pk],
         )
 
     def test_pages_using_alias(self):
@@ -386,6 +390,33 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
             [self.page.pk, root_alias.pk],
         )
 
+    def test_transitive_objects_using(self):
+        alias = self._create_alias()
+        root_alias = self._create_alias(name="root alias")
+        add_plugin(
+            root_alias.get_placeholder(self.language),
+            "Alias",
+            language=self.language,
+            alias=alias,
+        )
+        page = self._create_page("page using the root alias")
+        self.add_alias_plugin_to_page(page, root_alias, "en")
+        self.add_alias_plugin_to_page(self.page, alias, "en")
+
+        self.assertEqual(
+            sorted(alias.get_usage_plugins().values_list("alias", "depth")),
+            sorted([(alias.pk, 1), (alias.pk, 1), (root_alias.pk, 2)]),
+        )
+        self.assertEqual(list(alias.get_usage_plugins(transitive=False).values_list("depth", flat=True)), [1, 1])
+        self.assertEqual(
+            sorted((obj.pk, obj.usage_depth) for obj in alias.objects_using),
+            sorted([(self.page.pk, 1), (root_alias.pk, 1)]),
+        )
+        self.assertEqual(
+            sorted((type(obj).__name__, obj.pk, obj.usage_depth) for obj in alias.transitive_objects_using),
+            sorted([("Page", self.page.pk, 1), ("Alias", root_alias.pk, 1), ("Page", page.pk, 2)]),
+        )
+
     def test_delete(self):
         """Deleting an Alias MUST NOT delete plugins."""
         self.page.delete()
@@ -458,3 +489,131 @@ class AliasModelsTestCase(BaseAliasPluginTestCase):
 
         self.assertIsNotNone(placeholder)
         self.assertEqual(placeholder.slot, "static-code")
+
+    def test_placeholder_is_created_with_content(self):
+        alias = self._create_alias(name="eager")
+        content = alias.get_content(self.language, show_draft_content=True)
+
+        self.assertEqual(
+            list(content.placeholders.values_list("slot", flat=True)),
+            [content.placeholder_slotname],
+        )
+
+        content = AliasContent.admin_manager.get(pk=content.pk)
+        with self.assertNumQueries(2):
+            # Loading the alias for the slot and reading the placeholder, no writes
+            self.assertEqual(content.placeholder.slot, content.placeholder_slotname)
+
+    def test_with_placeholder_prefetches_placeholders(self):
+        for index in range(3):
+            self._create_alias(name=f"alias {index}")
+
+        with self.assertNumQueries(2):
+            contents = list(AliasContent.admin_manager.with_placeholder())
+            placeholders = [content.placeholder for content in contents]
+
+        self.assertEqual(len(placeholders), 3)
+        for content, placeholder in zip(contents, placeholders, strict=True):
+            self.assertEqual(placeholder.source, content)
+
+    def test_placeholder_is_not_created_for_contents_without_one(self):
+        alias = self._create_alias(name="legacy")
+        content = alias.get_content(self.language, show_draft_content=True)
+        content.placeholders.all().delete()
+
+        content = AliasContent.admin_manager.select_related("alias").get(pk=content.pk)
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(content.placeholder)
+        self.assertEqual(content.get_placeholders(), [])
+        self.assertEqual(content.get_placeholder_slots(), [content.placeholder_slotname])
+        self.assertFalse(content.placeholders.exists())
+        self.assertIsNone(AliasModel.objects.get(pk=alias.pk).get_placeholder(self.language, show_draft_content=True))
+
+    def test_with_display_names(self):
+        published = self._create_alias(name="published alias")
+        draft = self._create_alias(name="draft alias", published=False)
+        german = self._create_alias(name="german alias", language="de")
+        empty = AliasModel.objects.create(category=self.category)
+        aliases = [published, draft, german, empty]
+        expected = [AliasModel.objects.get(pk=alias.pk).get_name(self.language) for alias in aliases]
+
+        with self.assertNumQueries(1):
+            annotated = AliasModel.objects.filter(pk__in=[alias.pk for alias in aliases]).with_display_names(
+                self.language
+            )
+            names = {alias.pk: str(alias) for alias in annotated}
+
+        self.assertEqual([names[alias.pk] for alias in aliases], expected)
+        self.assertEqual(names[german.pk], "german alias")
+        self.assertEqual(names[empty.pk], f"Alias {empty.pk} (No content)")
+        if is_versioning_enabled():
+            self.assertEqual(names[draft.pk], "draft alias (Not published)")
+
+    def test_usage_count_follows_alias_plugins(self):
+        alias = self._create_alias(name="alias")
+        other_alias = self._create_alias(name="other alias", position=1)
+
+        def usage_counts():
+            return [AliasModel.objects.get(pk=pk).usage_count for pk in (alias.pk, other_alias.pk)]
+
+        plugin = add_plugin(self.placeholder, "Alias", language=self.language, alias=alias)
+        self.assertEqual(usage_counts(), [1, 0])
+        self.assertTrue(AliasModel.objects.get(pk=alias.pk).is_in_use)
+
+        copy_plugins_to_placeholder([plugin], self.placeholder, language=self.language)
+        self.assertEqual(usage_counts(), [2, 0])
+
+        plugin = AliasPluginModel.objects.get(pk=plugin.pk)
+        plugin.alias = other_alias
+        plugin.save()
+        plugin.save()
+        self.assertEqual(usage_counts(), [1, 1])
+
+        CMSPlugin.objects.filter(plugin_type="Alias").delete()
+        self.assertEqual(usage_counts(), [0, 0])
+        self.assertFalse(AliasModel.objects.get(pk=alias.pk).is_in_use)
+
+    def test_set_position_only_updates_moved_alias(self):
+        aliases = [AliasModel.objects.create(category=self.category) for _index in range(4)]
+        positions = dict(self.category.aliases.values_list("pk", "position"))
+
+        aliases[3]._set_position(1)
+
+        new_positions = dict(self.category.aliases.values_list("pk", "position"))
+        self.assertEqual(
+            self._get_aliases_order(self.category), [aliases[0].pk, aliases[3].pk, aliases[1].pk, aliases[2].pk]
+        )
+        self.assertEqual({pk for pk in positions if positions[pk] != new_positions[pk]}, {aliases[3].pk})
+
+    def test_set_position_rebalances_when_no_position_is_free(self):
+        aliases = [AliasModel.objects.create(category=self.category) for _index in range(3)]
+        AliasModel.objects.filter(pk=aliases[1].pk).update(position=aliases[0].position + 1)
+
+        aliases[2]._set_position(1)
+
+        self.assertEqual(self._get_aliases_order(self.category), [aliases[0].pk, aliases[2].pk, aliases[1].pk])
+        gap = AliasModel.POSITION_GAP
+        self.assertEqual(
+            sorted(self.category.aliases.values_list("position", flat=True)), [gap, gap + gap // 2, gap * 2]
+        )
+
+    def test_positions_are_assigned_with_the_category_locked(self):
+        alias = AliasModel.objects.create(category=self.category)
+
+        with patch.object(Category, "lock", autospec=True) as lock:
+            other_alias = AliasModel.objects.create(category=self.category)
+            alias._set_position(1)
+
+        self.assertEqual([call.args[0].pk for call in lock.call_args_list], [self.category.pk] * 2)
+        self.assertEqual(self._get_aliases_order(self.category), [other_alias.pk, alias.pk])
+
+    def test_reorder(self):
+        aliases = [AliasModel.objects.create(category=self.category) for _index in range(4)]
+        new_order = [aliases[2].pk, aliases[0].pk, aliases[3].pk, aliases[1].pk]
+
+        with self.assertNumQueries(1):
+            updated = self.category.aliases.reorder(new_order)
+
+        self.assertEqual(updated, 4)
+        self.assertEqual(self._get_aliases_order(self.category), new_order)
@@ -1,6 +1,16 @@
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
 from cms.api import create_page
 from cms.test_utils.testcases import CMSTestCase
 from cms.toolbar.utils import get_object_edit_url, get_object_structure_url
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from djangocms_alias import rendering
+from djangocms_alias.rendering import get_static_alias_declarations
 
 
 class StructureBoardRenderingTestCase(CMSTestCase):
@@ -23,3 +33,67 @@ class StructureBoardRenderingTestCase(CMSTestCase):
             # Static alias placeholder
             self.assertContains(response, '<div class="cms-dragbar-title" title="Template_Example_Global_Alias_Code">')
             self.assertContains(response, "cms-dragarea-static-icon")
+
+
+class StaticAliasDeclarationsTestCase(CMSTestCase):
+    def _get_static_codes(self, template):
+        return [declaration.static_code for declaration in get_static_alias_declarations(template)]
+
+    def test_declarations_are_shared_through_the_cache(self):
+        call_command("collect_static_alias_declarations", "static_aliases/many.html", stdout=StringIO())
+        rendering._declarations.clear()  # As in another process
+
+        with patch("djangocms_alias.rendering.scan_static_aliases", side_effect=AssertionError):
+            declarations = get_static_alias_declarations("static_aliases/many.html")
+
+        self.assertEqual(
+            [(declaration.static_code, declaration.site) for declaration in declarations],
+            [("header", False), ("navigation", False), ("sidebar", True), ("footer", False)],
+        )
+
+    def _write_templates(self, directory):
+        base = os.path.join(directory, "declarations_base.html")
+        with open(base, "w") as template:
+            template.write(
+                '{% load djangocms_alias_tags %}{% static_alias "header" %}{% block content %}{% endblock %}'
+            )
+        with open(os.path.join(directory, "declarations_page.html"), "w") as template:
+            template.write('{% extends "declarations_base.html" %}')
+        templates = [
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "DIRS": [directory],
+                "OPTIONS": {"loaders": ["django.template.loaders.filesystem.Loader"]},
+            }
+        ]
+        return base, templates
+
+    def _change_template(self, base):
+        with open(base, "a") as template:
+            template.write('{% static_alias "footer" %}')
+        os.utime(base, (0, 0))
+
+    def test_changed_templates_are_scanned_again_in_debug(self):
+        with tempfile.TemporaryDirectory() as directory:
+            base, templates = self._write_templates(directory)
+
+            with override_settings(DEBUG=True, TEMPLATES=templates):
+                self.assertEqual(self._get_static_codes("declarations_page.html"), ["header"])
+
+                self._change_template(base)
+
+                self.assertEqual(self._get_static_codes("declarations_page.html"), ["header", "footer"])
+
+    def test_deployed_templates_are_scanned_again_by_new_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            base, templates = self._write_templates(directory)
+
+            with override_settings(DEBUG=False, TEMPLATES=templates):
+                self.assertEqual(self._get_static_codes("declarations_page.html"), ["header"])
+
+                self._change_template(base)
+
+                # Running processes keep their declarations until restarted
+                self.assertEqual(self._get_static_codes("declarations_page.html"), ["header"])
+                rendering._declarations.clear()  # As after a restart
+                self.assertEqual(self._get_static_codes("declarations_page.html"), ["header", "footer"])
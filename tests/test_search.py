@@ -0,0 +1,104 @@
+import os
+import time
+from unittest import skipUnless
+
+from cms.utils.urlutils import admin_reverse
+from django.db import connection
+
+from djangocms_alias.models import Alias as AliasModel
+from djangocms_alias.models import AliasContent, Category, SearchToken
+from djangocms_alias.search import filter_aliases, filter_categories, tokenize
+
+from .base import BaseAliasPluginTestCase
+
+
+class SearchTokenTestCase(BaseAliasPluginTestCase):
+    def _search(self, term, language=None):
+        return list(filter_aliases(AliasModel.objects.all(), term, language or self.language))
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Café Menü-Leiste, café"), ["cafe", "menu", "leiste"])
+        self.assertEqual(tokenize(None), [])
+
+    def test_aliases_are_found_by_word_prefixes(self):
+        main_menu = self._create_alias(name="Main menu")
+        footer = self._create_alias(name="Footer (main site)")
+
+        self.assertEqual(self._search("ma"), [main_menu, footer])
+        self.assertEqual(self._search("MAIN men"), [main_menu])
+        self.assertEqual(self._search("site"), [footer])
+        self.assertEqual(self._search("ain"), [])
+        self.assertEqual(self._search("main", language="de"), [])
+
+    def test_static_codes_are_found_in_all_languages(self):
+        alias = self._create_alias(name="Header", static_code="page_header")
+
+        self.assertEqual(self._search("page_header", language="de"), [alias])
+
+    def test_tokens_follow_content_changes(self):
+        alias = self._create_alias(name="Old name")
+        content = alias.get_content(self.language, show_draft_content=True)
+        content.name = "New name"
+        content.save()
+
+        self.assertEqual(self._search("old"), [])
+        self.assertEqual(self._search("new"), [alias])
+
+        alias_id = alias.pk
+        alias.cms_plugins.all().delete()
+        alias.delete()
+
+        self.assertFalse(SearchToken.objects.filter(alias=alias_id).exists())
+
+    def test_categories_are_found_by_word_prefixes(self):
+        category = Category.objects.create(name="Navigation menus")
+        category.set_current_language("de")
+        category.name = "Navigationsmenüs"
+        category.save()
+
+        def search(term, language):
+            return set(filter_categories(Category.objects.all(), term, language).values_list("pk", flat=True))
+
+        self.assertEqual(search("menu", self.language), {category.pk})
+        self.assertEqual(search("navigationsmenu", "de"), {category.pk})
+        self.assertEqual(search("menu", "de"), set())
+
+    def test_admin_changelist_search(self):
+        alias = self._create_alias(name="Main menu")
+        self._create_alias(name="Footer")
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(admin_reverse("djangocms_alias_alias_changelist"), data={"q": "menu"})
+
+        self.assertEqual(list(response.context["cl"].queryset), [alias])
+
+    @skipUnless(os.environ.get("DJANGOCMS_ALIAS_BENCHMARK"), "Set DJANGOCMS_ALIAS_BENCHMARK=1 to run benchmarks")
+    def test_search_benchmark(self):
+        """Word prefix lookups among 100k aliases take less than 50 ms"""
+        words = ["header", "footer", "navigation", "sidebar", "teaser", "banner", "contact", "newsletter"]
+        aliases = AliasModel.objects.bulk_create(
+            AliasModel(category=self.category, position=index) for index in range(100_000)
+        )
+        contents = AliasContent.admin_manager.bulk_create(
+            AliasContent(alias=alias, language=self.language, name=f"{words[index % 8]} {index}")
+            for index, alias in enumerate(aliases)
+        )
+        SearchToken.objects.bulk_create(
+            (
+                SearchToken(alias_id=content.alias_id, language=self.language, token=token)
+                for content in contents
+                for token in tokenize(content.name)
+            ),
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        for term in ("newsl", "navigation 4711", "9999"):
+            start = time.perf_counter()
+            results = list(
+                filter_aliases(AliasModel.objects.all(), term, self.language).values_list("pk", flat=True)[:30]
+            )
+            duration = time.perf_counter() - start
+            self.assertTrue(results)
+            self.assertLess(duration, 0.05, f"Searching {term!r} took {duration * 1000:.1f} ms")
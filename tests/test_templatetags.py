@@ -1,9 +1,17 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import skipUnless
 
 from cms.api import add_plugin, create_page, create_page_content
+from cms.toolbar.toolbar import CMSToolbar
 from cms.toolbar.utils import get_object_edit_url, get_object_preview_url
+from django.contrib.auth import get_user_model
 from django.contrib.sites.models import Site
-from django.test.utils import override_settings
+from django.db import connection
+from django.template import engines
+from django.template.loader import get_template
+from django.test import RequestFactory, TransactionTestCase
+from django.test.utils import CaptureQueriesContext, override_settings
 
 from djangocms_alias.cms_plugins import Alias
 from djangocms_alias.constants import DEFAULT_STATIC_ALIAS_CATEGORY_NAME
@@ -408,3 +416,90 @@ class AliasTemplateTagAliasPlaceholderTestCase(BaseAliasPluginTestCase):
         )
 
         self.assertEqual(output, "Content Alias 1234")
+
+    @override_settings(
+        CMS_PLACEHOLDER_CACHE=False,
+        DJANGOCMS_ALIAS_DIRECTORY_CACHE_ENABLED=False,
+        DJANGOCMS_ALIAS_PLUGIN_SNAPSHOTS_ENABLED=False,
+    )
+    def test_static_aliases_declared_in_template_are_resolved_in_bulk(self):
+        """The number of queries does not grow with the number of static aliases in a template"""
+        site = Site.objects.get(pk=1)
+        for static_code in ("header", "navigation", "sidebar", "footer"):
+            alias = self._create_alias(static_code=static_code, site=site if static_code == "sidebar" else None)
+            add_plugin(
+                alias.get_placeholder(self.language),
+                "TextPlugin",
+                language=self.language,
+                body=f"Content {static_code}",
+            )
+
+        # Warm up session and content type caches
+        get_template("static_aliases/one.html").render({}, self.get_request("/"))
+
+        with CaptureQueriesContext(connection) as one_alias:
+            output = get_template("static_aliases/one.html").render({}, self.get_request("/"))
+        self.assertIn("Content header", output)
+
+        with CaptureQueriesContext(connection) as many_aliases:
+            output = get_template("static_aliases/many.html").render({}, self.get_request("/"))
+        for static_code in ("header", "navigation", "sidebar", "footer"):
+            self.assertIn(f"Content {static_code}", output)
+
+        self.assertEqual(len(one_alias), len(many_aliases))
+
+
+class StaticAliasThreadSafetyTestCase(TransactionTestCase):
+    # Rendering threads only see committed data: use a transaction test case
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser("admin", "admin@example.com", "admin")
+        alias = AliasModel.objects.create(category=Category.objects.create(name="threads"), static_code="shared")
+        for language in ("en", "de"):
+            content = AliasContent.objects.with_user(self.user).create(alias=alias, name="shared", language=language)
+            add_plugin(content.placeholder, "TextPlugin", language=language, body=f"Content {language}")
+            if is_versioning_enabled():
+                from djangocms_versioning.models import Version
+
+                Version.objects.get_for_content(content).publish(self.user)
+
+    def _get_request(self, language, edit_mode):
+        request = RequestFactory().get(f"/{language}/", {"language": language})
+        request.user = self.user
+        request.session = {}
+        request.LANGUAGE_CODE = language
+        request.current_page = None
+        request.toolbar = CMSToolbar(request)
+        # Set the toolbar mode without resolving an edit endpoint
+        request.toolbar.edit_mode_active = edit_mode
+        request.toolbar.preview_mode_active = False
+        return request
+
+    def test_concurrent_renders_keep_their_language_and_mode(self):
+        template = engines["django"].from_string('{% load djangocms_alias_tags %}{% static_alias "shared" %}')
+        cases = [(language, edit_mode) for language in ("en", "de") for edit_mode in (False, True)]
+        expected = {case: template.render({}, self._get_request(*case)) for case in cases}
+        self.assertEqual(len(set(expected.values())), len(cases))
+        jobs = [(case, [self._get_request(*case) for _index in range(5)]) for case in cases * 4]
+        barrier = threading.Barrier(len(jobs))
+        database_lock = threading.Lock()
+
+        def serialize_queries(execute, *args):
+            # SQLite's shared in-memory test database does not support
+            # concurrent queries - threads switch while waiting for the lock
+            with database_lock:
+                return execute(*args)
+
+        def render(job):
+            case, requests = job
+            try:
+                with connection.execute_wrapper(serialize_queries):
+                    barrier.wait()
+                    return case, [template.render({}, request) for request in requests]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            results = list(executor.map(render, jobs))
+
+        for case, outputs in results:
+            self.assertEqual(outputs, [expected[case]] * 5, case)
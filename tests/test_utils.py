@@ -0,0 +1,100 @@
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test.utils import override_settings
+
+from djangocms_alias.models import AliasContent, Category, ContentEvent
+from djangocms_alias.utils import emit_content_change, emit_content_delete
+
+from .base import BaseAliasPluginTestCase
+
+
+class ContentEventsTestCase(BaseAliasPluginTestCase):
+    def setUp(self):
+        super().setUp()
+        self.emitters = {ContentEvent.CHANGE: Mock(), ContentEvent.DELETE: Mock()}
+        patcher = patch("djangocms_alias.utils.get_content_event_emitters", return_value=self.emitters)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_sent(self, action):
+        return [(obj, call.kwargs["sender"]) for call in self.emitters[action].call_args_list for obj in call.args[0]]
+
+    def test_events_are_sent_once_per_object_on_commit(self):
+        content = self._create_alias(name="alias").get_content(self.language, show_draft_content=True)
+        other_content = self._create_alias(name="other", position=1).get_content(self.language, True)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            emit_content_change([content, other_content], sender=Category)
+            emit_content_change(AliasContent.admin_manager.filter(pk=content.pk))
+            emit_content_delete([other_content])
+
+            self.assertEqual(self._get_sent(ContentEvent.CHANGE), [])
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self._get_sent(ContentEvent.CHANGE), [(content, None)])
+        self.assertEqual(self._get_sent(ContentEvent.DELETE), [(other_content, None)])
+
+    def test_events_of_nested_blocks_are_sent_together(self):
+        content = self._create_alias(name="alias").get_content(self.language, show_draft_content=True)
+        other_content = self._create_alias(name="other", position=1).get_content(self.language, True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            emit_content_change([content])
+            with transaction.atomic():
+                emit_content_change([content, other_content])
+
+        self.assertEqual(self.emitters[ContentEvent.CHANGE].call_count, 1)
+        self.assertEqual(self._get_sent(ContentEvent.CHANGE), [(content, None), (other_content, None)])
+
+    def test_events_of_rolled_back_transactions_are_dropped(self):
+        content = self._create_alias(name="alias").get_content(self.language, show_draft_content=True)
+        other_content = self._create_alias(name="other", position=1).get_content(self.language, True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    emit_content_change([content])
+                    raise ValueError
+            except ValueError:
+                pass
+            emit_content_change([other_content])
+
+        self.assertEqual(self._get_sent(ContentEvent.CHANGE), [(other_content, None)])
+
+    @override_settings(DJANGOCMS_ALIAS_CONTENT_EVENTS="outbox")
+    def test_outbox_events_are_sent_by_command(self):
+        content = self._create_alias(name="alias").get_content(self.language, show_draft_content=True)
+        other_content = self._create_alias(name="other", position=1).get_content(self.language, True)
+
+        emit_content_change([content, other_content], sender=Category)
+        emit_content_delete([other_content])
+
+        self.assertEqual(
+            list(ContentEvent.objects.order_by("pk").values_list("object_id", "action", "sender")),
+            [(content.pk, "change", "djangocms_alias.category"), (other_content.pk, "delete", "")],
+        )
+        self.assertEqual(self._get_sent(ContentEvent.CHANGE), [])
+
+        call_command("send_content_events", batch_size=1, stdout=StringIO())
+
+        self.assertEqual(self._get_sent(ContentEvent.CHANGE), [(content, Category)])
+        self.assertEqual(self._get_sent(ContentEvent.DELETE), [(other_content, None)])
+        self.assertFalse(ContentEvent.objects.exists())
+
+    @override_settings(DJANGOCMS_ALIAS_CONTENT_EVENTS="outbox")
+    def test_outbox_chunks_are_sent_in_one_call(self):
+        contents = [
+            self._create_alias(name=f"alias {index}", position=index).get_content(self.language, True)
+            for index in range(3)
+        ]
+        emit_content_change(contents)
+
+        call_command("send_content_events", batch_size=2, stdout=StringIO())
+
+        self.assertEqual(
+            [call.args[0] for call in self.emitters[ContentEvent.CHANGE].call_args_list],
+            [contents[:2], contents[2:]],
+        )
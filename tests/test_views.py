@@ -1,5 +1,6 @@
 import re
 from unittest import skip, skipIf, skipUnless
+from unittest.mock import patch
 
 from cms.api import add_plugin
 from cms.models import Placeholder
@@ -8,20 +9,30 @@ from cms.utils import get_current_site
 from cms.utils.i18n import force_language
 from cms.utils.plugins import downcast_plugins
 from cms.utils.urlutils import add_url_parameters, admin_reverse
+from django.contrib.auth import get_permission_codename
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
-from django.test.utils import override_settings
+from django.db import connection
+from django.http import Http404
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils.http import parse_http_date
 
+from djangocms_alias.cache import get_select2_cache_key
 from djangocms_alias.constants import (
+    ALIAS_FRAGMENT_URL_NAME,
     CATEGORY_SELECT2_URL_NAME,
     DELETE_ALIAS_URL_NAME,
     LIST_ALIAS_URL_NAME,
     SELECT2_ALIAS_URL_NAME,
+    STATIC_ALIAS_FRAGMENT_URL_NAME,
     USAGE_ALIAS_URL_NAME,
 )
 from djangocms_alias.models import Alias, AliasContent, Category
+from djangocms_alias.templatetags.djangocms_alias_tags import render_esi_include
 from djangocms_alias.utils import is_versioning_enabled
+from djangocms_alias.views import AliasSelect2View, alias_fragment_view
 
 from .base import BaseAliasPluginTestCase
 
@@ -622,6 +633,27 @@ class AliasViewsTestCase(BaseAliasPluginTestCase):
             alias1.name,
         )
 
+    @override_settings(DJANGOCMS_ALIAS_SELECT2_CACHE_TIMEOUT=0)
+    def test_select2_view_labels_do_not_add_queries(self):
+        url = admin_reverse(SELECT2_ALIAS_URL_NAME)
+        self._create_alias(name="alias 0")
+
+        with self.login_user_context(self.superuser):
+            self.client.get(url)  # Warm up session and content type caches
+            with CaptureQueriesContext(connection) as one_alias:
+                self.client.get(url)
+
+            for position in range(1, 5):
+                self._create_alias(name=f"alias {position}", position=position, published=position % 2 == 0)
+            with CaptureQueriesContext(connection) as many_aliases:
+                response = self.client.get(url)
+
+        self.assertEqual(
+            [result["text"] for result in response.json()["results"]],
+            [str(alias) for alias in Alias.objects.order_by("position")],
+        )
+        self.assertEqual(len(one_alias), len(many_aliases))
+
     def test_select2_view_term(self):
         alias1 = self._create_alias(name="test 2")
         self._create_alias(name="foo", position=1)
@@ -750,6 +782,104 @@ class AliasViewsTestCase(BaseAliasPluginTestCase):
             [alias1.pk],
         )
 
+    def test_select2_view_cursor_pagination(self):
+        category2 = Category.objects.create(name="foo")
+        aliases = [
+            self._create_alias(name="bar", category=category2),
+            self._create_alias(name="baz", category=category2, position=1),
+            self._create_alias(name="test 1"),
+            self._create_alias(name="test 2", position=1),
+            self._create_alias(name="test 3", position=1),
+        ]
+        url = admin_reverse(SELECT2_ALIAS_URL_NAME)
+        pages = []
+
+        with self.login_user_context(self.superuser):
+            data = {"limit": 2}
+            while True:
+                content = self.client.get(url, data=data).json()
+                pages.append([result["id"] for result in content["results"]])
+                if not content["more"]:
+                    break
+                data["cursor"] = content["cursor"]
+            # Clients not sending a cursor still page by number
+            by_number = self.client.get(url, data={"limit": 2, "page": 2}).json()
+            invalid = self.client.get(url, data={"cursor": "invalid"})
+
+        self.assertEqual(
+            pages, [[alias.pk for alias in aliases[:2]], [alias.pk for alias in aliases[2:4]], [aliases[4].pk]]
+        )
+        self.assertEqual([result["id"] for result in by_number["results"]], pages[1])
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_select2_view_limit_is_capped(self):
+        for position in range(3):
+            self._create_alias(name=f"alias {position}", position=position)
+
+        with self.login_user_context(self.superuser), patch.object(AliasSelect2View, "max_page_size", 2):
+            content = self.client.get(admin_reverse(SELECT2_ALIAS_URL_NAME), data={"limit": 1000}).json()
+
+        self.assertEqual(len(content["results"]), 2)
+        self.assertTrue(content["more"])
+
+    def test_select2_view_responses_are_cached(self):
+        alias = self._create_alias(name="foo")
+        url = admin_reverse(SELECT2_ALIAS_URL_NAME)
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(url)
+            with CaptureQueriesContext(connection) as queries:
+                cached_response = self.client.get(url)
+                not_modified = self.client.get(url, headers={"if-none-match": response["ETag"]})
+
+            content = alias.get_content(self.language, show_draft_content=True)
+            content.name = "bar"
+            content.save()
+            changed_response = self.client.get(url, headers={"if-none-match": response["ETag"]})
+
+        # Cached responses do not query aliases or categories
+        self.assertFalse([query for query in queries if "djangocms_alias" in query["sql"]])
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(changed_response.status_code, 200)
+        self.assertNotEqual(changed_response["ETag"], response["ETag"])
+        self.assertIn("bar", changed_response.json()["results"][0]["text"])
+
+    def test_select2_view_cache_is_scoped_by_site_and_permissions(self):
+        self._create_alias(name="foo")
+        staff_user = self.get_staff_user_with_alias_permissions()
+        url = admin_reverse(SELECT2_ALIAS_URL_NAME)
+
+        with patch("djangocms_alias.views.get_select2_cache_key", wraps=get_select2_cache_key) as cache_key:
+            for user in (self.superuser, staff_user, staff_user):
+                with self.login_user_context(user):
+                    self.client.get(url)
+            self.add_permission(staff_user, get_permission_codename("change", Category._meta))
+            with self.login_user_context(staff_user):
+                self.client.get(url)
+
+        superuser_scope, staff_scope, same_staff_scope, changed_scope = (
+            call.args[0] for call in cache_key.call_args_list
+        )
+        self.assertEqual(superuser_scope, [1, True, []])
+        self.assertEqual(staff_scope[:2], [1, False])
+        self.assertEqual(staff_scope, same_staff_scope)
+        self.assertNotEqual(staff_scope, changed_scope)
+
+    def test_select2_view_cache_is_invalidated_by_reorder(self):
+        alias = self._create_alias(name="foo")
+        other_alias = self._create_alias(name="bar", position=1)
+        url = admin_reverse(SELECT2_ALIAS_URL_NAME)
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(url)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.category.aliases.reorder([other_alias.pk, alias.pk])
+            reordered_response = self.client.get(url)
+
+        self.assertEqual([result["id"] for result in response.json()["results"]], [alias.pk, other_alias.pk])
+        self.assertEqual([result["id"] for result in reordered_response.json()["results"]], [other_alias.pk, alias.pk])
+
     @skip(
         "It is not currently possible to add an alias from the django admin changelist issue "
         "#https://github.com/django-cms/djangocms-alias/issues/97#97"
@@ -908,6 +1038,25 @@ class AliasViewsTestCase(BaseAliasPluginTestCase):
             ),
         )
 
+    def test_alias_usage_view_shows_nested_usages(self):
+        alias = self._create_alias()
+        root_alias = self._create_alias()
+        add_plugin(
+            root_alias.get_placeholder(self.language),
+            "Alias",
+            language=self.language,
+            alias=alias,
+        )
+        self.add_alias_plugin_to_page(self.page, root_alias)
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(admin_reverse(USAGE_ALIAS_URL_NAME, args=[alias.pk]))
+
+        self.assertContains(response, '<td class="field-type">Page</td>')
+        self.assertContains(response, '<td class="field-type">Alias</td>')
+        self.assertContains(response, '<td class="field-depth">direct</td>')
+        self.assertContains(response, '<td class="field-depth">2</td>')
+
     def test_alias_usage_view_shows_hidden_usages(self):
         alias = self._create_alias()
         # A plugin on a placeholder without a source, like the clipboard,
@@ -1160,6 +1309,167 @@ class AliasViewsTestCase(BaseAliasPluginTestCase):
         self.assertContains(response, "Another alias plugin")
 
 
+class AliasFragmentViewTestCase(BaseAliasPluginTestCase):
+    def setUp(self):
+        super().setUp()
+        self.alias = self._create_alias(static_code="footer")
+        add_plugin(
+            self.alias.get_placeholder(self.language),
+            "TextPlugin",
+            language=self.language,
+            body="Fragment content",
+        )
+
+    def get_fragment_url(self, template="static", **kwargs):
+        kwargs.setdefault("pk", self.alias.pk)
+        return reverse(
+            ALIAS_FRAGMENT_URL_NAME, kwargs={"site_id": 1, "language": "en", "template": template, **kwargs}
+        )
+
+    def test_fragment_view_renders_published_content_with_cache_headers(self):
+        response = self.client.get(self.get_fragment_url())
+
+        self.assertContains(response, "Fragment content")
+        self.assertIn("max-age=", response["Cache-Control"])
+        self.assertTrue(response.has_header("Expires"))
+
+        # Served from the fragment cache
+        response = self.client.get(self.get_fragment_url())
+
+        self.assertContains(response, "Fragment content")
+        self.assertIn("max-age=", response["Cache-Control"])
+
+    def test_fragment_view_by_static_code(self):
+        response = self.client.get(
+            reverse(
+                STATIC_ALIAS_FRAGMENT_URL_NAME,
+                kwargs={"site_id": 1, "language": "en", "static_code": "footer", "template": "plugin-default"},
+            )
+        )
+
+        self.assertContains(response, "Fragment content")
+
+    def test_fragment_view_rejects_unknown_parameters(self):
+        request = self.get_request("/")
+        for kwargs in (
+            {"site_id": 1, "language": "en", "pk": self.alias.pk, "template": "unknown"},
+            {"site_id": 1, "language": "xx", "pk": self.alias.pk, "template": "static"},
+            {"site_id": 2, "language": "en", "pk": self.alias.pk, "template": "static"},
+            {"site_id": 1, "language": "en", "pk": self.alias.pk + 100, "template": "static"},
+            {"site_id": 1, "language": "en", "static_code": "unknown", "template": "static"},
+        ):
+            with self.subTest(**kwargs), self.assertRaises(Http404):
+                alias_fragment_view(request, **kwargs)
+
+    @skipUnless(is_versioning_enabled(), "Test only relevant for versioning")
+    def test_fragment_view_does_not_render_drafts(self):
+        alias = self._create_alias(name="draft", published=False)
+        add_plugin(
+            alias.get_placeholder(self.language, show_draft_content=True),
+            "TextPlugin",
+            language=self.language,
+            body="Draft content",
+        )
+
+        response = self.client.get(self.get_fragment_url(pk=alias.pk))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Draft content")
+
+    def test_fragment_view_answers_conditional_requests(self):
+        response = self.client.get(self.get_fragment_url())
+        etag = response["ETag"]
+
+        self.assertTrue(etag.startswith('"'))
+        last_modified = response["Last-Modified"]
+
+        with self.assertNumQueries(3):
+            # Alias, published contents and plugin tree - nothing is rendered
+            response = self.client.get(self.get_fragment_url(), headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.get_fragment_url(), headers={"if-modified-since": last_modified})
+        self.assertEqual(response.status_code, 304)
+
+    def test_fragment_view_changes_when_older_plugin_is_deleted(self):
+        placeholder = self.alias.get_placeholder(self.language)
+        add_plugin(placeholder, "TextPlugin", language=self.language, body="Newer content")
+        response = self.client.get(self.get_fragment_url())
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+        self.assertContains(response, "Fragment content")
+
+        # Within the same second, the remaining plugins are older
+        placeholder.delete_plugin(placeholder.get_plugins(self.language).get(position=1))
+
+        response = self.client.get(self.get_fragment_url(), headers={"if-modified-since": last_modified})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Fragment content")
+        self.assertContains(response, "Newer content")
+        self.assertGreater(parse_http_date(response["Last-Modified"]), parse_http_date(last_modified))
+
+        response = self.client.get(self.get_fragment_url(), headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_fragment_view_etag_changes_when_plugins_are_reordered(self):
+        placeholder = self.alias.get_placeholder(self.language)
+        add_plugin(placeholder, "TextPlugin", language=self.language, body="Second content")
+        etag = self.client.get(self.get_fragment_url())["ETag"]
+        first, second = placeholder.get_plugins(self.language).order_by("position")
+
+        # Moves update the positions with queryset updates, see cms.utils.plugins.reorder_plugins
+        placeholder.move_plugin(second, target_position=first.position)
+        response = self.client.get(self.get_fragment_url(), headers={"if-none-match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            list(placeholder.get_plugins(self.language).order_by("position").values_list("pk", flat=True)),
+            [second.pk, first.pk],
+        )
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_fragment_view_etag_changes_with_nested_alias(self):
+        nested_alias = self._create_alias(name="nested")
+        add_plugin(self.alias.get_placeholder(self.language), "Alias", language=self.language, alias=nested_alias)
+        etag = self.client.get(self.get_fragment_url())["ETag"]
+
+        self.assertEqual(self.client.get(self.get_fragment_url())["ETag"], etag)
+
+        add_plugin(nested_alias.get_placeholder(self.language), "TextPlugin", language=self.language, body="Nested")
+        response = self.client.get(self.get_fragment_url(), headers={"if-none-match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Nested")
+        self.assertNotEqual(response["ETag"], etag)
+
+    @override_settings(DJANGOCMS_ALIAS_ESI_ENABLED=True)
+    def test_alias_plugin_renders_esi_include(self):
+        add_plugin(self.placeholder, "Alias", language=self.language, alias=self.alias)
+
+        response = self.client.get(self.page.get_absolute_url(self.language))
+
+        self.assertContains(response, f'<esi:include src="{self.get_fragment_url(template="plugin-default")}" />')
+        self.assertNotContains(response, "Fragment content")
+
+    @override_settings(DJANGOCMS_ALIAS_TEMPLATES=[("djangocms_alias/alias.html", "Not a slug")])
+    def test_esi_include_of_template_name_with_path(self):
+        template = "plugin-djangocms_alias/alias.html"
+
+        output = render_esi_include(self.alias, self.language, 1, template)
+
+        self.assertEqual(output, f'<esi:include src="{self.get_fragment_url(template=template)}" />')
+        response = self.client.get(self.get_fragment_url(template=template))
+        self.assertContains(response, "Fragment content")
+
+    def test_static_alias_renders_esi_include(self):
+        output = self.render_template_obj(
+            """{% load djangocms_alias_tags %}{% static_alias "footer" esi %}""", {}, self.get_request("/")
+        )
+
+        self.assertEqual(output, f'<esi:include src="{self.get_fragment_url()}" />')
+
+
 class AliasCategorySelect2ViewTestCase(BaseAliasPluginTestCase):
     def test_select2_view_no_permission(self):
         """
@@ -1271,16 +1581,18 @@ class AliasCategorySelect2ViewTestCase(BaseAliasPluginTestCase):
     def test_select2_view_term(self):
         """
         Given a term, the response should return only
-        categories that match the term.
+        categories with a word starting with the term.
         """
         category_1 = Category.objects.create(name="ategory 1")
         category_2 = Category.objects.create(name="Category 2")
         category_3 = Category.objects.create(name="tegory 3")
         category_4 = Category.objects.create(name="tegory 4")
+        category_5 = Category.objects.create(name="Other ätegory 5")
         self._create_alias(category=category_1)
         self._create_alias(category=category_2)
         self._create_alias(category=category_3)
         self._create_alias(category=category_4)
+        self._create_alias(category=category_5)
 
         with self.login_user_context(self.superuser):
             response = self.client.get(
@@ -1293,7 +1605,7 @@ class AliasCategorySelect2ViewTestCase(BaseAliasPluginTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
             [a["id"] for a in response.json()["results"]],
-            [category_2.pk, category_1.pk],
+            [category_5.pk, category_1.pk],
         )
 
     def test_select2_view_pk(self):
@@ -11,6 +11,7 @@ admin.autodiscover()
 urlpatterns = [
     re_path(r"^media/(?P<path>.*)$", serve, {"document_root": settings.MEDIA_ROOT, "show_indexes": True}),  # NOQA
     re_path(r"^jsi18n/(?P<packages>\S+?)/$", JavaScriptCatalog.as_view()),  # NOQA
+    path("alias-fragments/", include("djangocms_alias.urls")),
 ]
 i18n_urls = [
     re_path(r"^admin/", admin.site.urls),